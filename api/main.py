@@ -1,13 +1,16 @@
 import logging
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
-from api.routes import crud, face_search, ingest, search
+from api.routes import face_search, ingest, search
+from src import query_log, warmup
 from src.config import settings
+from src.metrics import HTTP_REQUEST_SECONDS, render_latest
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +30,14 @@ def _setup_opensearch():
 
 def _setup_milvus():
     from src.milvus_client import get_embedding_fn, get_milvus_client
-    from src.milvus_manager import ensure_collection
+    from src.milvus_manager import SchemaMigrationError, ensure_collection
 
     client = get_milvus_client()
-    ensure_collection(client)
+    try:
+        ensure_collection(client)
+    except SchemaMigrationError as e:
+        # Every write would be rejected: refuse to start instead of retrying on first request
+        raise SystemExit(str(e)) from e
     get_embedding_fn()  # pre-load model
     logger.info("Milvus collection and embedding model ready.")
 
@@ -44,7 +51,12 @@ async def lifespan(app: FastAPI):
             _setup_opensearch()
     except Exception as e:
         logger.warning(f"Backend setup skipped (will retry on first request): {e}")
+    # Model, query cache and index segments are warmed in the background; /ready waits for it
+    warmup.start()
     yield
+    warmup.stop()
+    ingest.shutdown_job_queue()
+    query_log.shutdown()
 
 
 app = FastAPI(
@@ -53,9 +65,23 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Route template (e.g. /v1/ingest/jobs/{job_id}) keeps label cardinality bounded
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    HTTP_REQUEST_SECONDS.labels(request.method, route, str(response.status_code)).observe(
+        time.perf_counter() - start
+    )
+    return response
+
+
 app.include_router(ingest.router)
 app.include_router(search.router)
 app.include_router(face_search.router)
+# from api.routes import crud  # disabled; importing it loads pymongo and the sync stack
 # app.include_router(crud.router)
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
@@ -65,6 +91,34 @@ def index():
     return FileResponse(STATIC_DIR / "index.html")
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    data, content_type = render_latest()
+    return Response(content=data, media_type=content_type)
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready(response: Response):
+    """Readiness for load balancers: 503 until warmed up and the backend is loaded and reachable."""
+    from src.health import readiness
+
+    is_ready, report = readiness()
+    if not is_ready:
+        response.status_code = 503
+    return report
+
+
+@app.get("/health/deep")
+def health_deep(response: Response):
+    """Backend reachability, collection state, row counts, model and watcher status."""
+    from src.health import deep_health
+
+    report = deep_health()
+    if report["status"] == "down":
+        response.status_code = 503
+    return report
@@ -67,3 +67,29 @@ class ContentIngestRequest(BaseModel):
 class IngestResponse(BaseModel):
     indexed: int
     errors: list[str] = []
+
+
+class ChunkResult(BaseModel):
+    chunk: int
+    items: int
+    indexed: int
+    errors: list[str] = []
+
+
+class StreamIngestResponse(BaseModel):
+    indexed: int
+    chunks: list[ChunkResult] = []
+    errors: list[str] = []  # per-line parse / validation errors
+
+
+class IngestJobResponse(BaseModel):
+    job_id: str
+    kind: str  # "scenes" | "contents"
+    status: str  # "queued" | "running" | "completed" | "failed"
+    total: int
+    processed: int = 0
+    indexed: int = 0
+    errors: list[str] = []
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
@@ -48,16 +48,61 @@ class Facets(BaseModel):
     content_type_id: list[FacetItem] = []
 
 
+# ---------------------------------------------------------------------------
+# Profiling (profile=true)
+# ---------------------------------------------------------------------------
+
+class MilvusCallProfile(BaseModel):
+    operation: str  # search | hybrid_search | query
+    collection: str
+    ms: float
+    params: dict  # anns_field / limit / filter / search_params, sub-requests and ranker for hybrid
+    candidates: list[int]  # hits returned per query
+
+
+class SearchProfile(BaseModel):
+    total_ms: float
+    stages: dict[str, float]  # stage -> ms, see src/metrics.py
+    milvus_calls: list[MilvusCallProfile] = []
+    dump_path: str | None = None  # cProfile dump for sampled requests
+
+
 class SearchResponse(BaseModel):
     total: int
     hits: list[SceneHit]
     facets: Facets | None = None
+    profile: SearchProfile | None = None
+
+
+class SceneSegment(BaseModel):
+    score: float
+    max_score: float
+    total_score: float
+    content_id: str
+    video_title: str = ""
+    video_name: str = ""
+    start_time_sec: float
+    end_time_sec: float
+    scene_count: int
+    scene_ids: list[str]
+
+
+class SegmentSearchResponse(BaseModel):
+    total: int
+    segments: list[SceneSegment]
 
 
 # ---------------------------------------------------------------------------
 # Content-level models
 # ---------------------------------------------------------------------------
 
+class ContentChunkMatch(BaseModel):
+    chunk_index: int
+    start_char: int  # offsets into the content description
+    end_char: int
+    score: float
+
+
 class ContentHit(BaseModel):
     score: float
     content_id: str
@@ -75,6 +120,7 @@ class ContentHit(BaseModel):
     program_id: str = ""
     broadcast_date: str = ""
     content_type_id: str = ""
+    matched_chunks: list[ContentChunkMatch] = []  # only with chunk_pooling
 
 
 class ContentFacetItem(BaseModel):
@@ -95,3 +141,18 @@ class ContentSearchResponse(BaseModel):
     total: int
     hits: list[ContentHit]
     facets: ContentFacets | None = None
+    profile: SearchProfile | None = None
+
+
+# ---------------------------------------------------------------------------
+# Joint content + scene models
+# ---------------------------------------------------------------------------
+
+class JointContentHit(ContentHit):
+    scenes: list[SceneHit] = []
+
+
+class JointSearchResponse(BaseModel):
+    total: int
+    hits: list[JointContentHit]
+    facets: ContentFacets | None = None
@@ -9,11 +9,13 @@ Endpoints:
 import json
 import logging
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
 from pydantic import BaseModel, Field
 
 from api.models.search import Facets, SceneHit, SearchResponse
+from api.routes.search import post_request, run_logged
 from src.config import settings
+from src.metrics import observe_stage
 
 logger = logging.getLogger(__name__)
 
@@ -117,7 +119,7 @@ def _search_scenes_by_face(
 ) -> SearchResponse:
     """Query Milvus scenes whose *faces* field contains the given names."""
     from src.milvus_client import get_milvus_client
-    from src.milvus_queries import SCENE_OUTPUT_FIELDS, build_scene_facets
+    from src.milvus_queries import SCENE_OUTPUT_FIELDS, build_scene_facets, milvus_query
 
     client = get_milvus_client()
 
@@ -125,7 +127,8 @@ def _search_scenes_by_face(
     combined = _combine_filters(face_filter, extra_filter)
 
     try:
-        results = client.query(
+        results = milvus_query(
+            client,
             collection_name=settings.milvus_collection_name,
             filter=combined,
             output_fields=SCENE_OUTPUT_FIELDS,
@@ -134,11 +137,13 @@ def _search_scenes_by_face(
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
 
-    hits = [_parse_entity(r) for r in results]
-    scene_hits = [SceneHit(**h) for h in hits]
-    facets = Facets(**build_scene_facets(hits))
+    with observe_stage("parse_hits"):
+        hits = [_parse_entity(r) for r in results]
+    facets = build_scene_facets(hits)
 
-    return SearchResponse(total=len(scene_hits), hits=scene_hits, facets=facets)
+    with observe_stage("serialize"):
+        scene_hits = [SceneHit(**h) for h in hits]
+        return SearchResponse(total=len(scene_hits), hits=scene_hits, facets=Facets(**facets))
 
 
 # ---------------------------------------------------------------------------
@@ -173,6 +178,7 @@ async def face_search(
     images: list[UploadFile] = File(default=[], description="Face images to search for"),
     face_names: list[str] = Form(default=[], description="Face names to search for"),
     k: int = Form(default=10, ge=1, le=100, description="Max results"),
+    profile: bool = Query(default=False, description="Return a per-stage timing breakdown"),
 ):
     """
     Search scenes that contain specific faces.
@@ -201,7 +207,10 @@ async def face_search(
             detail="Provide at least one face image or face_names.",
         )
 
-    return _search_scenes_by_face(names, k)
+    # Replays with the detected names; "images" only records how many were uploaded
+    request = {"method": "POST", "path": "/v1/face_search", "form": {"face_names": names, "k": k},
+               "images": len(real_images)}
+    return run_logged(request, profile, _search_scenes_by_face, names, k)
 
 
 # ---- Filter (post-search refinement) ----
@@ -214,19 +223,32 @@ class FaceFilterRequest(BaseModel):
     broadcast_date: list[str] | None = None
     program_id: list[str] | None = None
     content_type_id: list[str] | None = None
+    # Inclusive date ranges (ISO 8601 or YYYY-MM-DD), matched on indexed epoch fields
+    created_date_from: str | None = None
+    created_date_to: str | None = None
+    broadcast_date_from: str | None = None
+    broadcast_date_to: str | None = None
+    video_created_at_from: str | None = None
+    video_created_at_to: str | None = None
     k: int = Field(default=10, ge=1, le=100)
 
 
 @router.post("/filter", response_model=SearchResponse, summary="Filter face search results")
-def face_filter_search(req: FaceFilterRequest):
+def face_filter_search(
+    req: FaceFilterRequest,
+    profile: bool = Query(default=False, description="Return a per-stage timing breakdown"),
+):
     """
     Refine face-search results with additional facet filters
-    (category, author, broadcast_date, program_id, content_type_id).
+    (category, author, broadcast_date, program_id, content_type_id)
+    and inclusive date ranges (created_date, broadcast_date, video_created_at).
     """
     if settings.backend != "milvus":
         raise HTTPException(status_code=501, detail="Face search only supports Milvus backend")
 
-    extra_filter = _build_facet_filter(
+    from src.milvus_queries import build_range_filter
+
+    facet_filter = _build_facet_filter(
         {
             "category": req.category,
             "author": req.author,
@@ -236,5 +258,17 @@ def face_filter_search(req: FaceFilterRequest):
             "content_type_id": req.content_type_id,
         }
     )
+    try:
+        range_filter = build_range_filter(
+            {
+                "created_date_ts": (req.created_date_from, req.created_date_to),
+                "broadcast_date_ts": (req.broadcast_date_from, req.broadcast_date_to),
+                "video_created_at_ts": (req.video_created_at_from, req.video_created_at_to),
+            }
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
-    return _search_scenes_by_face(req.face_names, req.k, extra_filter)
+    extra_filter = _combine_filters(facet_filter, range_filter)
+    request = post_request("/v1/face_search/filter", req)
+    return run_logged(request, profile, _search_scenes_by_face, req.face_names, req.k, extra_filter)
@@ -1,14 +1,36 @@
 import json
+from collections.abc import AsyncIterator, Callable
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
 
-from api.models.scene import ContentIngestRequest, IngestRequest, IngestResponse
+from api.models.scene import (
+    ChunkResult,
+    ContentIngestItem,
+    ContentIngestRequest,
+    IngestJobResponse,
+    IngestRequest,
+    IngestResponse,
+    SceneIngestItem,
+    StreamIngestResponse,
+)
 from src.config import settings
+from src.embedding import embed_rows
+from src.metrics import record_flush, record_ingest_batch
+from src.sync_utils import add_scene_modality_vectors, parse_date_to_epoch
+from src.text_analysis import prepare_bm25_text
 
 router = APIRouter(prefix="/v1", tags=["ingest"])
 
 
 def _ingest_opensearch(req: IngestRequest) -> IngestResponse:
+    success_count, errors = _bulk_opensearch(req.scenes)
+    return IngestResponse(indexed=success_count, errors=[str(err) for err in errors])
+
+
+def _bulk_opensearch(scenes: list[SceneIngestItem]) -> tuple[int, list[dict]]:
+    """Bulk index scenes; returns (indexed, raw per-item bulk errors)."""
     from opensearchpy.helpers import bulk
 
     from src.opensearch_client import get_client
@@ -16,7 +38,7 @@ def _ingest_opensearch(req: IngestRequest) -> IngestResponse:
     client = get_client()
 
     actions = []
-    for scene in req.scenes:
+    for scene in scenes:
         faces_data = [{"face_id": f.face_id, "name": f.name} for f in scene.faces]
         doc = {
             "_index": settings.index_name,
@@ -52,12 +74,11 @@ def _ingest_opensearch(req: IngestRequest) -> IngestResponse:
         success_count, errors = bulk(client, actions, raise_on_error=False)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"OpenSearch bulk error: {e}")
-
-    error_messages = [str(err) for err in errors] if errors else []
-    return IngestResponse(indexed=success_count, errors=error_messages)
+    return success_count, errors or []
 
 
-def _ingest_milvus(req: IngestRequest) -> IngestResponse:
+def _upsert_milvus_scenes(scenes: list[SceneIngestItem], flush: bool = True) -> int:
+    """Embed and upsert scenes into Milvus. Returns the upsert count; raises on failure."""
     from src.milvus_client import get_embedding_fn, get_milvus_client
 
     client = get_milvus_client()
@@ -66,11 +87,16 @@ def _ingest_milvus(req: IngestRequest) -> IngestResponse:
     # Build combined texts for embedding (same logic as OpenSearch ingest pipeline)
     combined_texts = []
     docs = []
-    for scene in req.scenes:
+    for scene in scenes:
         combined_text = f"{scene.scene_description} {scene.video.video_title}".strip()
         combined_texts.append(combined_text)
 
         faces_data = [{"face_id": f.face_id, "name": f.name} for f in scene.faces]
+        video_created_at = (
+            scene.video.video_created_at.isoformat()
+            if scene.video.video_created_at
+            else ""
+        )
 
         docs.append({
             "scene_id": scene.scene_id,
@@ -87,33 +113,39 @@ def _ingest_milvus(req: IngestRequest) -> IngestResponse:
             "video_summary": scene.video.video_summary,
             "video_tags": json.dumps(scene.video.video_tags),
             "video_duration_sec": scene.video.video_duration_sec or 0.0,
-            "video_created_at": (
-                scene.video.video_created_at.isoformat()
-                if scene.video.video_created_at
-                else ""
-            ),
+            "video_created_at": video_created_at,
+            "video_created_at_ts": parse_date_to_epoch(video_created_at) or 0,
             "resolution": scene.video.resolution,
             "fps": scene.video.fps or 0.0,
             "program_id": scene.video.program_id,
             "broadcast_date": scene.video.broadcast_date,
+            "broadcast_date_ts": parse_date_to_epoch(scene.video.broadcast_date) or 0,
             "content_type_id": scene.video.content_type_id,
             "category": scene.category,
             "created_date": scene.created_date,
+            "created_date_ts": parse_date_to_epoch(scene.created_date) or 0,
             "author": scene.author,
-            "bm25_text": combined_text,
+            "bm25_text": prepare_bm25_text(combined_text),
         })
 
-    try:
-        vectors = embedding_fn.encode_documents(combined_texts)
-        for i, doc in enumerate(docs):
-            doc["embedding"] = vectors[i]
+    embed_rows(embedding_fn, docs, combined_texts)
+    if settings.scene_multi_vector_enabled:
+        add_scene_modality_vectors(embedding_fn, docs)
 
-        res = client.upsert(
-            collection_name=settings.milvus_collection_name,
-            data=docs,
-        )
+    res = client.upsert(
+        collection_name=settings.milvus_collection_name,
+        data=docs,
+    )
+    record_ingest_batch(settings.milvus_collection_name, len(docs))
+    if flush:
         client.flush(collection_name=settings.milvus_collection_name)
-        return IngestResponse(indexed=res["upsert_count"])
+        record_flush(settings.milvus_collection_name)
+    return res["upsert_count"]
+
+
+def _ingest_milvus(req: IngestRequest) -> IngestResponse:
+    try:
+        return IngestResponse(indexed=_upsert_milvus_scenes(req.scenes))
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Milvus ingest error: {e}")
 
@@ -125,7 +157,8 @@ def ingest_scenes(req: IngestRequest):
     return _ingest_opensearch(req)
 
 
-def _ingest_milvus_content(req: ContentIngestRequest) -> IngestResponse:
+def _upsert_milvus_contents(contents: list[ContentIngestItem], flush: bool = True) -> int:
+    """Embed and upsert contents into Milvus. Returns the upsert count; raises on failure."""
     from src.milvus_client import get_embedding_fn, get_milvus_client
 
     client = get_milvus_client()
@@ -133,7 +166,7 @@ def _ingest_milvus_content(req: ContentIngestRequest) -> IngestResponse:
 
     combined_texts = []
     docs = []
-    for item in req.contents:
+    for item in contents:
         tags_text = " ".join(item.tags)
         combined_text = f"{item.title} {item.description} {tags_text}".strip()
         combined_texts.append(combined_text)
@@ -146,6 +179,7 @@ def _ingest_milvus_content(req: ContentIngestRequest) -> IngestResponse:
             "tags": json.dumps(item.tags),
             "duration_sec": item.duration_sec,
             "created_at": item.created_at,
+            "created_at_ts": parse_date_to_epoch(item.created_at) or 0,
             "category": item.category,
             "author": item.author,
             "video_name": item.video_name,
@@ -153,21 +187,31 @@ def _ingest_milvus_content(req: ContentIngestRequest) -> IngestResponse:
             "fps": item.fps,
             "program_id": item.program_id,
             "broadcast_date": item.broadcast_date,
+            "broadcast_date_ts": parse_date_to_epoch(item.broadcast_date) or 0,
             "content_type_id": item.content_type_id,
-            "bm25_text": combined_text,
+            "bm25_text": prepare_bm25_text(combined_text),
         })
 
-    try:
-        vectors = embedding_fn.encode_documents(combined_texts)
-        for i, doc in enumerate(docs):
-            doc["embedding"] = vectors[i]
+    embed_rows(embedding_fn, docs, combined_texts)
 
-        res = client.upsert(
-            collection_name=settings.milvus_content_collection_name,
-            data=docs,
-        )
+    res = client.upsert(
+        collection_name=settings.milvus_content_collection_name,
+        data=docs,
+    )
+    record_ingest_batch(settings.milvus_content_collection_name, len(docs))
+    if settings.content_chunks_enabled:
+        from src.content_chunks import upsert_content_chunks
+
+        upsert_content_chunks(client, embedding_fn, docs, flush=flush)
+    if flush:
         client.flush(collection_name=settings.milvus_content_collection_name)
-        return IngestResponse(indexed=res["upsert_count"])
+        record_flush(settings.milvus_content_collection_name)
+    return res["upsert_count"]
+
+
+def _ingest_milvus_content(req: ContentIngestRequest) -> IngestResponse:
+    try:
+        return IngestResponse(indexed=_upsert_milvus_contents(req.contents))
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Milvus content ingest error: {e}")
 
@@ -177,3 +221,219 @@ def ingest_contents(req: ContentIngestRequest):
     if settings.backend != "milvus":
         raise HTTPException(status_code=501, detail="Content ingest only supports Milvus backend")
     return _ingest_milvus_content(req)
+
+
+# ---------------------------------------------------------------------------
+# Streaming NDJSON ingest
+# ---------------------------------------------------------------------------
+
+async def _iter_ndjson_lines(request: Request) -> AsyncIterator[tuple[int, bytes]]:
+    """Yield (line_number, line) from the request body without buffering all of it."""
+    buffer = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if buffer.strip():
+        yield line_no + 1, buffer
+
+
+async def _stream_ingest(
+    request: Request,
+    item_model: type[BaseModel],
+    upsert_chunk: Callable[[list], IngestResponse],
+    finish: Callable[[], None],
+    chunk_size: int,
+) -> StreamIngestResponse:
+    """
+    Parse NDJSON items incrementally and ingest them chunk by chunk.
+
+    Only one chunk of items is held in memory at a time.  Invalid lines,
+    failed chunks and per-item errors of partially indexed chunks are reported
+    without aborting the rest of the stream.
+    """
+    chunks: list[ChunkResult] = []
+    line_errors: list[str] = []
+    buffer: list = []
+
+    async def run_chunk() -> None:
+        result = ChunkResult(chunk=len(chunks) + 1, items=len(buffer), indexed=0)
+        try:
+            outcome = await run_in_threadpool(upsert_chunk, list(buffer))
+            result.indexed, result.errors = outcome.indexed, list(outcome.errors)
+        except Exception as e:
+            result.errors.append(str(e))
+        chunks.append(result)
+        buffer.clear()
+
+    async for line_no, line in _iter_ndjson_lines(request):
+        try:
+            buffer.append(item_model.model_validate_json(line))
+        except ValidationError as e:
+            line_errors.append(f"line {line_no}: {e.errors(include_url=False)}")
+            continue
+        if len(buffer) >= chunk_size:
+            await run_chunk()
+    if buffer:
+        await run_chunk()
+
+    if any(c.indexed for c in chunks):
+        try:
+            await run_in_threadpool(finish)
+        except Exception as e:
+            line_errors.append(f"flush: {e}")
+
+    return StreamIngestResponse(
+        indexed=sum(c.indexed for c in chunks),
+        chunks=chunks,
+        errors=line_errors,
+    )
+
+
+def _flush_milvus(collection_name: str) -> None:
+    from src.milvus_client import get_milvus_client
+
+    get_milvus_client().flush(collection_name=collection_name)
+    record_flush(collection_name)
+
+
+def _flush_contents() -> None:
+    _flush_milvus(settings.milvus_content_collection_name)
+    if settings.content_chunks_enabled:
+        _flush_milvus(settings.milvus_content_chunk_collection_name)
+
+
+def _upsert_opensearch_scenes(scenes: list[SceneIngestItem]) -> IngestResponse:
+    """Bulk index scenes; per-item bulk errors are returned, not raised (the rest is indexed)."""
+    return _ingest_opensearch(IngestRequest(scenes=scenes))
+
+
+@router.post("/scenes/ingest/stream", response_model=StreamIngestResponse)
+async def ingest_scenes_stream(
+    request: Request,
+    chunk_size: int = Query(default=100, ge=1, le=1000),
+):
+    """
+    Ingest scenes from an NDJSON body (one SceneIngestItem per line).
+
+    Items are embedded and upserted in chunks of *chunk_size* as the body
+    arrives; the response reports the result of every chunk.
+    """
+    if settings.backend == "milvus":
+        return await _stream_ingest(
+            request,
+            SceneIngestItem,
+            lambda chunk: IngestResponse(indexed=_upsert_milvus_scenes(chunk, flush=False)),
+            lambda: _flush_milvus(settings.milvus_collection_name),
+            chunk_size,
+        )
+    return await _stream_ingest(request, SceneIngestItem, _upsert_opensearch_scenes, lambda: None, chunk_size)
+
+
+@router.post("/contents/ingest/stream", response_model=StreamIngestResponse)
+async def ingest_contents_stream(
+    request: Request,
+    chunk_size: int = Query(default=100, ge=1, le=1000),
+):
+    """Ingest contents from an NDJSON body (one ContentIngestItem per line)."""
+    if settings.backend != "milvus":
+        raise HTTPException(status_code=501, detail="Content ingest only supports Milvus backend")
+    return await _stream_ingest(
+        request,
+        ContentIngestItem,
+        lambda chunk: IngestResponse(indexed=_upsert_milvus_contents(chunk, flush=False)),
+        _flush_contents,
+        chunk_size,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Asynchronous ingest jobs
+# ---------------------------------------------------------------------------
+
+_job_queue = None
+
+
+def _upsert_scene_batch(scenes: list[SceneIngestItem]):
+    """Job handler: upsert count (Milvus) or a BatchResult with the failed items (OpenSearch)."""
+    if settings.backend == "milvus":
+        return _upsert_milvus_scenes(scenes, flush=False)
+    from src.job_queue import BatchResult
+
+    indexed, errors = _bulk_opensearch(scenes)
+    positions: dict[str, list[int]] = {}
+    for i, scene in enumerate(scenes):
+        positions.setdefault(scene.scene_id, []).append(i)
+    failed = {}
+    for err in errors:
+        # {"index": {"_id": ..., "status": ..., "error": ...}}
+        item = next(iter(err.values()), {}) if isinstance(err, dict) else {}
+        for i in positions.get(item.get("_id"), []):
+            failed[i] = f"{item.get('_id')}: {item.get('error', err)}"
+    return BatchResult(indexed, failed)
+
+
+def _flush_scenes() -> None:
+    if settings.backend == "milvus":
+        _flush_milvus(settings.milvus_collection_name)
+
+
+def get_job_queue():
+    """Singleton job queue; worker threads start on the first submitted job."""
+    global _job_queue
+    if _job_queue is None:
+        from src.job_queue import JobQueue
+
+        _job_queue = JobQueue(
+            handlers={
+                "scenes": _upsert_scene_batch,
+                "contents": lambda contents: _upsert_milvus_contents(contents, flush=False),
+            },
+            finalizers={
+                "scenes": _flush_scenes,
+                "contents": _flush_contents,
+            },
+            workers=settings.ingest_job_workers,
+            batch_size=settings.ingest_job_batch_size,
+            retention=settings.ingest_job_retention,
+        )
+    return _job_queue
+
+
+def shutdown_job_queue() -> None:
+    """Drain queued jobs before exiting, up to MS_INGEST_JOB_SHUTDOWN_TIMEOUT_SEC."""
+    if _job_queue is not None:
+        _job_queue.shutdown(timeout=settings.ingest_job_shutdown_timeout_sec)
+
+
+@router.post("/scenes/ingest/jobs", response_model=IngestJobResponse, status_code=202)
+def submit_scene_ingest_job(req: IngestRequest):
+    """
+    Queue scenes for background ingest and return immediately with a job id.
+
+    Poll GET /v1/ingest/jobs/{job_id} for progress.
+    """
+    job = get_job_queue().submit("scenes", req.scenes)
+    return IngestJobResponse(**get_job_queue().get(job.job_id))
+
+
+@router.post("/contents/ingest/jobs", response_model=IngestJobResponse, status_code=202)
+def submit_content_ingest_job(req: ContentIngestRequest):
+    """Queue contents for background ingest and return immediately with a job id."""
+    if settings.backend != "milvus":
+        raise HTTPException(status_code=501, detail="Content ingest only supports Milvus backend")
+    job = get_job_queue().submit("contents", req.contents)
+    return IngestJobResponse(**get_job_queue().get(job.job_id))
+
+
+@router.get("/ingest/jobs/{job_id}", response_model=IngestJobResponse)
+def get_ingest_job(job_id: str):
+    """Return status, progress and errors of an ingest job."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return IngestJobResponse(**job)
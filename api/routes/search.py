@@ -1,3 +1,7 @@
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
@@ -6,13 +10,23 @@ from api.models.search import (
     ContentHit,
     ContentSearchResponse,
     Facets,
+    JointContentHit,
+    JointSearchResponse,
     SceneHit,
+    SceneSegment,
+    SearchProfile,
     SearchResponse,
+    SegmentSearchResponse,
 )
 from src.config import settings
+from src.metrics import observe_stage
+from src.profiling import profiling
+from src.query_log import log_search
 
 router = APIRouter(prefix="/v1/search", tags=["search"])
 
+R = TypeVar("R", SearchResponse, ContentSearchResponse)
+
 
 # ---- OpenSearch helpers (scene only) ----
 
@@ -120,65 +134,174 @@ def _build_filter_expr(field_values: dict[str, list[str] | None]) -> str | None:
         return None
     return " and ".join(conditions)
 
-def _milvus_scene_semantic(query_text: str, k: int, filter_expr: str | None = None) -> SearchResponse:
+
+def _build_range_expr(field_ranges: dict[str, tuple[str | None, str | None]]) -> str | None:
+    from src.milvus_queries import build_range_filter
+
+    try:
+        return build_range_filter(field_ranges)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def _join_filter_exprs(*exprs: str | None) -> str | None:
+    parts = [e for e in exprs if e]
+    return " and ".join(parts) if parts else None
+
+
+def run_profiled(enabled: bool, search: Callable[..., R], *args) -> R:
+    """Run *search* (returning a response model); with *enabled* attach its SearchProfile."""
+    with profiling(enabled) as profile:
+        response = search(*args)
+    if profile is not None:
+        response.profile = SearchProfile(**profile.to_dict())
+    return response
+
+
+def get_request(path: str, **params) -> dict:
+    """Query log form of a GET search request (None params left out)."""
+    return {"method": "GET", "path": path, "params": {k: v for k, v in params.items() if v is not None}}
+
+
+def post_request(path: str, body: BaseModel) -> dict:
+    """Query log form of a POST search request."""
+    return {"method": "POST", "path": path, "json": body.model_dump(exclude_none=True)}
+
+
+def run_logged(request: dict, profile: bool, search: Callable[..., R], *args) -> R:
+    """run_profiled, then hand *request*, status, latency and hit ids to the query log (sampled)."""
+    if not settings.query_log_enabled:
+        return run_profiled(profile, search, *args)
+    start = time.perf_counter()
+    response, status = None, 200
+    try:
+        response = run_profiled(profile, search, *args)
+        return response
+    except Exception as e:
+        status = getattr(e, "status_code", 500)
+        raise
+    finally:
+        hit_ids = [getattr(h, "scene_id", None) or h.content_id for h in response.hits] if response else []
+        log_search(request, status, time.perf_counter() - start, hit_ids)
+
+
+def _scene_response(result: dict) -> SearchResponse:
+    with observe_stage("serialize"):
+        hits = [SceneHit(**h) for h in result["hits"]]
+        facets = Facets(**result["facets"])
+        return SearchResponse(total=result["total"], hits=hits, facets=facets)
+
+
+def _content_response(result: dict) -> ContentSearchResponse:
+    with observe_stage("serialize"):
+        hits = [ContentHit(**h) for h in result["hits"]]
+        facets = ContentFacets(**result["facets"])
+        return ContentSearchResponse(total=result["total"], hits=hits, facets=facets)
+
+
+def _milvus_scene_semantic(
+    query_text: str,
+    k: int,
+    filter_expr: str | None = None,
+    group_size: int | None = None,
+) -> SearchResponse:
     from src.milvus_client import get_embedding_fn, get_milvus_client
     from src.milvus_queries import search_scene_semantic
 
     client = get_milvus_client()
     embedding_fn = get_embedding_fn()
     try:
-        result = search_scene_semantic(client, embedding_fn, query_text, k, filter_expr)
+        result = search_scene_semantic(client, embedding_fn, query_text, k, filter_expr, group_size)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
-    hits = [SceneHit(**h) for h in result["hits"]]
-    facets = Facets(**result["facets"])
-    return SearchResponse(total=result["total"], hits=hits, facets=facets)
+    return _scene_response(result)
 
 
-def _milvus_scene_fulltext(query_text: str, k: int, filter_expr: str | None = None) -> SearchResponse:
+def _parse_vector_weights(spec) -> dict[str, float] | None:
+    if not spec:
+        return None
+    from src.milvus_queries import parse_vector_weights
+
+    try:
+        return parse_vector_weights(spec)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def _milvus_scene_weighted(
+    query_text: str,
+    k: int,
+    vector_weights: dict[str, float],
+    filter_expr: str | None = None,
+    group_size: int | None = None,
+) -> SearchResponse:
+    from src.milvus_client import get_embedding_fn, get_milvus_client
+    from src.milvus_queries import search_scene_weighted
+
+    client = get_milvus_client()
+    embedding_fn = get_embedding_fn()
+    try:
+        result = search_scene_weighted(client, embedding_fn, query_text, k, vector_weights, filter_expr, group_size)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
+    return _scene_response(result)
+
+
+def _milvus_scene_fulltext(
+    query_text: str,
+    k: int,
+    filter_expr: str | None = None,
+    group_size: int | None = None,
+) -> SearchResponse:
     from src.milvus_client import get_milvus_client
     from src.milvus_queries import search_scene_fulltext
 
     client = get_milvus_client()
     try:
-        result = search_scene_fulltext(client, query_text, k, filter_expr)
+        result = search_scene_fulltext(client, query_text, k, filter_expr, group_size)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
-    hits = [SceneHit(**h) for h in result["hits"]]
-    facets = Facets(**result["facets"])
-    return SearchResponse(total=result["total"], hits=hits, facets=facets)
+    return _scene_response(result)
 
 
-def _milvus_scene_hybrid(query_text: str, k: int, filter_expr: str | None = None) -> SearchResponse:
+def _milvus_scene_hybrid(
+    query_text: str,
+    k: int,
+    filter_expr: str | None = None,
+    group_size: int | None = None,
+) -> SearchResponse:
     from src.milvus_client import get_embedding_fn, get_milvus_client
     from src.milvus_queries import search_scene_hybrid
 
     client = get_milvus_client()
     embedding_fn = get_embedding_fn()
     try:
-        result = search_scene_hybrid(client, embedding_fn, query_text, k, filter_expr)
+        result = search_scene_hybrid(client, embedding_fn, query_text, k, filter_expr, group_size)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
-    hits = [SceneHit(**h) for h in result["hits"]]
-    facets = Facets(**result["facets"])
-    return SearchResponse(total=result["total"], hits=hits, facets=facets)
+    return _scene_response(result)
 
 
 # ---- Milvus content helpers ----
 
-def _milvus_content_semantic(query_text: str, k: int, filter_expr: str | None = None) -> ContentSearchResponse:
+def _check_chunk_pooling(chunk_pooling: str | None) -> None:
+    if chunk_pooling and not settings.content_chunks_enabled:
+        raise HTTPException(status_code=501, detail="chunk_pooling requires MS_CONTENT_CHUNKS_ENABLED=true")
+
+
+def _milvus_content_semantic(
+    query_text: str, k: int, filter_expr: str | None = None, chunk_pooling: str | None = None,
+) -> ContentSearchResponse:
     from src.milvus_client import get_embedding_fn, get_milvus_client
     from src.milvus_queries import search_content_semantic
 
     client = get_milvus_client()
     embedding_fn = get_embedding_fn()
     try:
-        result = search_content_semantic(client, embedding_fn, query_text, k, filter_expr)
+        result = search_content_semantic(client, embedding_fn, query_text, k, filter_expr, chunk_pooling)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
-    hits = [ContentHit(**h) for h in result["hits"]]
-    facets = ContentFacets(**result["facets"])
-    return ContentSearchResponse(total=result["total"], hits=hits, facets=facets)
+    return _content_response(result)
 
 
 def _milvus_content_fulltext(query_text: str, k: int, filter_expr: str | None = None) -> ContentSearchResponse:
@@ -190,24 +313,22 @@ def _milvus_content_fulltext(query_text: str, k: int, filter_expr: str | None =
         result = search_content_fulltext(client, query_text, k, filter_expr)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
-    hits = [ContentHit(**h) for h in result["hits"]]
-    facets = ContentFacets(**result["facets"])
-    return ContentSearchResponse(total=result["total"], hits=hits, facets=facets)
+    return _content_response(result)
 
 
-def _milvus_content_hybrid(query_text: str, k: int, filter_expr: str | None = None) -> ContentSearchResponse:
+def _milvus_content_hybrid(
+    query_text: str, k: int, filter_expr: str | None = None, chunk_pooling: str | None = None,
+) -> ContentSearchResponse:
     from src.milvus_client import get_embedding_fn, get_milvus_client
     from src.milvus_queries import search_content_hybrid
 
     client = get_milvus_client()
     embedding_fn = get_embedding_fn()
     try:
-        result = search_content_hybrid(client, embedding_fn, query_text, k, filter_expr)
+        result = search_content_hybrid(client, embedding_fn, query_text, k, filter_expr, chunk_pooling)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
-    hits = [ContentHit(**h) for h in result["hits"]]
-    facets = ContentFacets(**result["facets"])
-    return ContentSearchResponse(total=result["total"], hits=hits, facets=facets)
+    return _content_response(result)
 
 
 # ---- Scene search (unified) ----
@@ -217,23 +338,89 @@ def scene_search(
     query_text: str = Query(..., min_length=1),
     k: int = Query(default=10, ge=1, le=100),
     search_type: str = Query(default="hybrid", pattern="^(semantic|fulltext|hybrid)$"),
+    group_by: str | None = Query(
+        default=None, pattern="^video_id$",
+        description="Group hits by video; k then counts videos",
+    ),
+    group_size: int = Query(default=1, ge=1, le=20, description="Max scenes per video when grouping"),
+    vectors: str | None = Query(
+        default=None,
+        description="Weighted vector fields, e.g. 'text:1,visual:0.5,bm25:0.3' (text|visual|audio|bm25|sparse); "
+                    "overrides search_type",
+    ),
+    profile: bool = Query(default=False, description="Return a per-stage timing breakdown (Milvus only)"),
 ):
+    request = get_request(
+        "/v1/search/scene", query_text=query_text, k=k, search_type=search_type, group_by=group_by,
+        group_size=group_size if group_by else None, vectors=vectors,
+    )
+    return run_logged(request, profile, _scene_search, query_text, k, search_type, group_by, group_size, vectors)
+
+
+def _scene_search(
+    query_text: str,
+    k: int,
+    search_type: str,
+    group_by: str | None,
+    group_size: int,
+    vectors: str | None,
+) -> SearchResponse:
+    group = group_size if group_by else None
+    if group and settings.backend != "milvus":
+        raise HTTPException(status_code=501, detail="Grouped search only supports Milvus backend")
+
+    if vectors:
+        if settings.backend != "milvus":
+            raise HTTPException(status_code=501, detail="Weighted vector search only supports Milvus backend")
+        return _milvus_scene_weighted(query_text, k, _parse_vector_weights(vectors), group_size=group)
+
     if search_type == "fulltext":
         if settings.backend != "milvus":
             raise HTTPException(status_code=501, detail="Full-text search only supports Milvus backend")
-        return _milvus_scene_fulltext(query_text, k)
+        return _milvus_scene_fulltext(query_text, k, group_size=group)
 
     if search_type == "semantic":
         if settings.backend == "milvus":
-            return _milvus_scene_semantic(query_text, k)
+            return _milvus_scene_semantic(query_text, k, group_size=group)
         return _opensearch_semantic(query_text, k)
 
     # hybrid (default)
     if settings.backend == "milvus":
-        return _milvus_scene_hybrid(query_text, k)
+        return _milvus_scene_hybrid(query_text, k, group_size=group)
     return _opensearch_hybrid(query_text, k)
 
 
+# ---- Scene segments (time-window search) ----
+
+@router.get("/scene/segments", response_model=SegmentSearchResponse)
+def scene_segment_search(
+    query_text: str = Query(..., min_length=1),
+    k: int = Query(default=10, ge=1, le=100, description="Max number of videos"),
+    group_size: int = Query(default=10, ge=1, le=50, description="Max matching scenes per video"),
+    gap_sec: float = Query(default=1.0, ge=0.0, description="Merge scenes separated by at most this gap"),
+    search_type: str = Query(default="hybrid", pattern="^(semantic|fulltext|hybrid)$"),
+    score_mode: str = Query(default="max", pattern="^(max|sum)$"),
+):
+    """Return contiguous runs of matching scenes per video, ranked by aggregated score."""
+    if settings.backend != "milvus":
+        raise HTTPException(status_code=501, detail="Segment search only supports Milvus backend")
+
+    from src.milvus_client import get_embedding_fn, get_milvus_client
+    from src.milvus_queries import search_scene_segments
+
+    try:
+        client = get_milvus_client()
+        embedding_fn = get_embedding_fn() if search_type != "fulltext" else None
+        result = search_scene_segments(
+            client, embedding_fn, query_text, k, group_size,
+            gap_sec=gap_sec, search_type=search_type, score_mode=score_mode,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
+    segments = [SceneSegment(**s) for s in result["segments"]]
+    return SegmentSearchResponse(total=result["total"], segments=segments)
+
+
 # ---- Content search (unified) ----
 
 @router.get("/content", response_model=ContentSearchResponse)
@@ -241,15 +428,56 @@ def content_search(
     query_text: str = Query(..., min_length=1),
     k: int = Query(default=10, ge=1, le=100),
     search_type: str = Query(default="hybrid", pattern="^(semantic|fulltext|hybrid)$"),
+    chunk_pooling: str | None = Query(
+        default=None, pattern="^(max|sum)$",
+        description="Rank by transcript chunks pooled per content (ignored for fulltext)",
+    ),
+    profile: bool = Query(default=False, description="Return a per-stage timing breakdown (Milvus only)"),
 ):
+    request = get_request(
+        "/v1/search/content", query_text=query_text, k=k, search_type=search_type, chunk_pooling=chunk_pooling,
+    )
+    return run_logged(request, profile, _content_search, query_text, k, search_type, chunk_pooling)
+
+
+def _content_search(query_text: str, k: int, search_type: str, chunk_pooling: str | None) -> ContentSearchResponse:
     if settings.backend != "milvus":
         raise HTTPException(status_code=501, detail="Content search only supports Milvus backend")
+    _check_chunk_pooling(chunk_pooling)
 
     if search_type == "fulltext":
         return _milvus_content_fulltext(query_text, k)
     if search_type == "semantic":
-        return _milvus_content_semantic(query_text, k)
-    return _milvus_content_hybrid(query_text, k)
+        return _milvus_content_semantic(query_text, k, chunk_pooling=chunk_pooling)
+    return _milvus_content_hybrid(query_text, k, chunk_pooling=chunk_pooling)
+
+
+# ---- Joint content + scene search ----
+
+@router.get("/joint", response_model=JointSearchResponse)
+def joint_search(
+    query_text: str = Query(..., min_length=1),
+    k: int = Query(default=10, ge=1, le=100, description="Max number of contents"),
+    scenes_per_content: int = Query(default=3, ge=1, le=20),
+    search_type: str = Query(default="hybrid", pattern="^(semantic|fulltext|hybrid)$"),
+):
+    """Content search with each hit annotated by its best-matching scenes (one query embedding)."""
+    if settings.backend != "milvus":
+        raise HTTPException(status_code=501, detail="Joint search only supports Milvus backend")
+
+    from src.milvus_client import get_embedding_fn, get_milvus_client
+    from src.milvus_queries import search_joint
+
+    try:
+        client = get_milvus_client()
+        embedding_fn = get_embedding_fn() if search_type != "fulltext" else None
+        result = search_joint(client, embedding_fn, query_text, k, scenes_per_content, search_type)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
+    with observe_stage("serialize"):
+        hits = [JointContentHit(**h) for h in result["hits"]]
+        facets = ContentFacets(**result["facets"])
+        return JointSearchResponse(total=result["total"], hits=hits, facets=facets)
 
 
 # ---- Scene filter ----
@@ -262,30 +490,67 @@ class SceneFilterRequest(BaseModel):
     broadcast_date: list[str] | None = None
     program_id: list[str] | None = None
     content_type_id: list[str] | None = None
+    # Inclusive date ranges (ISO 8601 or YYYY-MM-DD), matched on indexed epoch fields
+    created_date_from: str | None = None
+    created_date_to: str | None = None
+    broadcast_date_from: str | None = None
+    broadcast_date_to: str | None = None
+    video_created_at_from: str | None = None
+    video_created_at_to: str | None = None
     k: int = Field(default=10, ge=1, le=100)
     search_type: str = Field(default="semantic", pattern="^(semantic|fulltext|hybrid)$")
+    # Group hits by video (k then counts videos), at most group_size scenes each
+    group_by: str | None = Field(default=None, pattern="^video_id$")
+    group_size: int = Field(default=1, ge=1, le=20)
+    # Weighted vector fields (text | visual | audio | bm25 | sparse), e.g. {"visual": 1.0, "bm25": 0.5};
+    # all sub-searches run in one hybrid_search and override search_type
+    vector_weights: dict[str, float] | None = None
+
+
+def _scene_filter_expr(req: SceneFilterRequest) -> str | None:
+    return _join_filter_exprs(
+        _build_filter_expr(
+            {
+                "category": req.category,
+                "author": req.author,
+                "created_date": req.created_date,
+                "broadcast_date": req.broadcast_date,
+                "program_id": req.program_id,
+                "content_type_id": req.content_type_id,
+            }
+        ),
+        _build_range_expr(
+            {
+                "created_date_ts": (req.created_date_from, req.created_date_to),
+                "broadcast_date_ts": (req.broadcast_date_from, req.broadcast_date_to),
+                "video_created_at_ts": (req.video_created_at_from, req.video_created_at_to),
+            }
+        ),
+    )
 
 
 @router.post("/scene/filter", response_model=SearchResponse)
-def scene_filter_search(req: SceneFilterRequest):
+def scene_filter_search(
+    req: SceneFilterRequest,
+    profile: bool = Query(default=False, description="Return a per-stage timing breakdown (Milvus only)"),
+):
+    return run_logged(post_request("/v1/search/scene/filter", req), profile, _scene_filter_search, req)
+
+
+def _scene_filter_search(req: SceneFilterRequest) -> SearchResponse:
     if settings.backend != "milvus":
         raise HTTPException(status_code=501, detail="Filter API only supports Milvus backend")
-    filter_expr = _build_filter_expr(
-        {
-            "category": req.category,
-            "author": req.author,
-            "created_date": req.created_date,
-            "broadcast_date": req.broadcast_date,
-            "program_id": req.program_id,
-            "content_type_id": req.content_type_id,
-        }
-    )
+    filter_expr = _scene_filter_expr(req)
+    group_size = req.group_size if req.group_by else None
 
+    if req.vector_weights:
+        vector_weights = _parse_vector_weights(req.vector_weights)
+        return _milvus_scene_weighted(req.query_text, req.k, vector_weights, filter_expr, group_size)
     if req.search_type == "hybrid":
-        return _milvus_scene_hybrid(req.query_text, req.k, filter_expr)
+        return _milvus_scene_hybrid(req.query_text, req.k, filter_expr, group_size)
     if req.search_type == "fulltext":
-        return _milvus_scene_fulltext(req.query_text, req.k, filter_expr)
-    return _milvus_scene_semantic(req.query_text, req.k, filter_expr)
+        return _milvus_scene_fulltext(req.query_text, req.k, filter_expr, group_size)
+    return _milvus_scene_semantic(req.query_text, req.k, filter_expr, group_size)
 
 
 # ---- Content filter ----
@@ -297,29 +562,142 @@ class ContentFilterRequest(BaseModel):
     broadcast_date: list[str] | None = None
     program_id: list[str] | None = None
     content_type_id: list[str] | None = None
+    # Inclusive date ranges (ISO 8601 or YYYY-MM-DD), matched on indexed epoch fields
+    created_at_from: str | None = None
+    created_at_to: str | None = None
+    broadcast_date_from: str | None = None
+    broadcast_date_to: str | None = None
     k: int = Field(default=10, ge=1, le=100)
     search_type: str = Field(default="semantic", pattern="^(semantic|fulltext|hybrid)$")
+    # Pool transcript chunk hits per content: "max" or "sum" (needs content chunks enabled)
+    chunk_pooling: str | None = Field(default=None, pattern="^(max|sum)$")
+
+
+def _content_filter_expr(req: ContentFilterRequest) -> str | None:
+    return _join_filter_exprs(
+        _build_filter_expr(
+            {
+                "category": req.category,
+                "author": req.author,
+                "broadcast_date": req.broadcast_date,
+                "program_id": req.program_id,
+                "content_type_id": req.content_type_id,
+            }
+        ),
+        _build_range_expr(
+            {
+                "created_at_ts": (req.created_at_from, req.created_at_to),
+                "broadcast_date_ts": (req.broadcast_date_from, req.broadcast_date_to),
+            }
+        ),
+    )
 
 
 @router.post("/content/filter", response_model=ContentSearchResponse)
-def content_filter_search(req: ContentFilterRequest):
+def content_filter_search(
+    req: ContentFilterRequest,
+    profile: bool = Query(default=False, description="Return a per-stage timing breakdown (Milvus only)"),
+):
+    return run_logged(post_request("/v1/search/content/filter", req), profile, _content_filter_search, req)
+
+
+def _content_filter_search(req: ContentFilterRequest) -> ContentSearchResponse:
     if settings.backend != "milvus":
         raise HTTPException(status_code=501, detail="Filter API only supports Milvus backend")
-    filter_expr = _build_filter_expr(
-        {
-            "category": req.category,
-            "author": req.author,
-            "broadcast_date": req.broadcast_date,
-            "program_id": req.program_id,
-            "content_type_id": req.content_type_id,
-        }
-    )
+    _check_chunk_pooling(req.chunk_pooling)
+    filter_expr = _content_filter_expr(req)
 
     if req.search_type == "hybrid":
-        return _milvus_content_hybrid(req.query_text, req.k, filter_expr)
+        return _milvus_content_hybrid(req.query_text, req.k, filter_expr, req.chunk_pooling)
     if req.search_type == "fulltext":
         return _milvus_content_fulltext(req.query_text, req.k, filter_expr)
-    return _milvus_content_semantic(req.query_text, req.k, filter_expr)
+    return _milvus_content_semantic(req.query_text, req.k, filter_expr, req.chunk_pooling)
+
+
+# ---- Batch search ----
+
+MAX_BATCH_QUERIES = 256
+
+
+class SceneBatchSearchRequest(BaseModel):
+    queries: list[SceneFilterRequest] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
+
+
+class ContentBatchSearchRequest(BaseModel):
+    queries: list[ContentFilterRequest] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
+
+
+class BatchSearchResponse(BaseModel):
+    results: list[SearchResponse]
+
+
+class ContentBatchSearchResponse(BaseModel):
+    results: list[ContentSearchResponse]
+
+
+@router.post("/scene/batch", response_model=BatchSearchResponse)
+def scene_batch_search(req: SceneBatchSearchRequest):
+    """Run many scene searches (each with its own filters) with one embedding call."""
+    if settings.backend != "milvus":
+        raise HTTPException(status_code=501, detail="Batch search only supports Milvus backend")
+
+    from src.milvus_client import get_embedding_fn, get_milvus_client
+    from src.milvus_queries import search_scene_batch
+
+    queries = [
+        {
+            "query_text": q.query_text,
+            "k": q.k,
+            "search_type": q.search_type,
+            "filter_expr": _scene_filter_expr(q),
+            "group_size": q.group_size if q.group_by else None,
+            "vector_weights": (
+                tuple(sorted(_parse_vector_weights(q.vector_weights).items())) if q.vector_weights else None
+            ),
+        }
+        for q in req.queries
+    ]
+    needs_embedding = any(
+        q["search_type"] != "fulltext" or q["vector_weights"] for q in queries
+    )
+    try:
+        client = get_milvus_client()
+        embedding_fn = get_embedding_fn() if needs_embedding else None
+        results = search_scene_batch(client, embedding_fn, queries)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
+    return BatchSearchResponse(results=[_scene_response(r) for r in results])
+
+
+@router.post("/content/batch", response_model=ContentBatchSearchResponse)
+def content_batch_search(req: ContentBatchSearchRequest):
+    """Run many content searches (each with its own filters) with one embedding call."""
+    if settings.backend != "milvus":
+        raise HTTPException(status_code=501, detail="Batch search only supports Milvus backend")
+
+    from src.milvus_client import get_embedding_fn, get_milvus_client
+    from src.milvus_queries import search_content_batch
+
+    for q in req.queries:
+        _check_chunk_pooling(q.chunk_pooling)
+    queries = [
+        {
+            "query_text": q.query_text,
+            "k": q.k,
+            "search_type": q.search_type,
+            "filter_expr": _content_filter_expr(q),
+            "chunk_pooling": q.chunk_pooling,
+        }
+        for q in req.queries
+    ]
+    needs_embedding = any(q["search_type"] != "fulltext" for q in queries)
+    try:
+        client = get_milvus_client()
+        embedding_fn = get_embedding_fn() if needs_embedding else None
+        results = search_content_batch(client, embedding_fn, queries)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Milvus error: {e}")
+    return ContentBatchSearchResponse(results=[_content_response(r) for r in results])
 
 
 # ---- List endpoints (unchanged) ----
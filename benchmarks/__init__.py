@@ -0,0 +1,9 @@
+"""
+Benchmark harness for the search and ingest hot paths.
+
+Runs the real src/ code against local stand-ins: Milvus Lite when installed
+(``pip install milvus-lite``), otherwise an in-memory client, a hashed
+embedding function instead of the model, and synthetic video_queue documents
+built from example_data/.  See ``python -m benchmarks.run --help`` and
+``python -m benchmarks.compare --help``.
+"""
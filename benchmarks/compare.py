@@ -0,0 +1,78 @@
+"""
+Compare two benchmark reports (e.g. the base and head commit of a change).
+
+Usage:
+    python -m benchmarks.compare base.json head.json
+    python -m benchmarks.compare base.json head.json --stat p95 --threshold 0.15 --fail-on-regression
+
+Latencies are compared on --stat (default p50, lower is better), throughputs
+on their value (higher is better).  A change beyond --threshold in the wrong
+direction is flagged as a regression.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _value(result: dict, stat: str) -> float:
+    return result[stat] if result["unit"] == "ms" else result["value"]
+
+
+def compare(base: dict, head: dict, stat: str = "p50", threshold: float = 0.1) -> list[dict]:
+    """One row per benchmark present in both reports."""
+    rows = []
+    for name, head_result in head["results"].items():
+        base_result = base["results"].get(name)
+        if base_result is None or base_result["unit"] != head_result["unit"]:
+            continue
+        before, after = _value(base_result, stat), _value(head_result, stat)
+        change = (after - before) / before if before else 0.0
+        lower_is_better = head_result["unit"] == "ms"
+        regression = change > threshold if lower_is_better else change < -threshold
+        rows.append({
+            "name": name,
+            "unit": head_result["unit"],
+            "base": before,
+            "head": after,
+            "change": change,
+            "regression": regression,
+        })
+    return rows
+
+
+def _mismatched_meta(base: dict, head: dict) -> list[str]:
+    keys = ("client", "embedding", "params", "settings")
+    return [key for key in keys if base["meta"].get(key) != head["meta"].get(key)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("base", type=Path)
+    parser.add_argument("head", type=Path)
+    parser.add_argument("--stat", choices=["mean", "p50", "p95", "p99"], default="p50")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change flagged as regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when a regression is found")
+    args = parser.parse_args(argv)
+
+    base = json.loads(args.base.read_text(encoding="utf-8"))
+    head = json.loads(args.head.read_text(encoding="utf-8"))
+    print(f"base {base['meta']['commit'][:10]}  head {head['meta']['commit'][:10]}")
+    mismatched = _mismatched_meta(base, head)
+    if mismatched:
+        print(f"WARNING: reports differ in {', '.join(mismatched)}; numbers are not like for like")
+
+    rows = compare(base, head, args.stat, args.threshold)
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<40} {row['base']:12.3f} -> {row['head']:12.3f} {row['unit']:<8} "
+              f"{row['change']:+7.1%}{flag}")
+
+    regressions = sum(row["regression"] for row in rows)
+    print(f"\n{len(rows)} benchmarks compared, {regressions} regression(s)")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
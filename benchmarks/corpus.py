@@ -0,0 +1,145 @@
+"""
+Synthetic video_queue documents in the example_data format.
+
+Captions, audio summaries, transcription sentences, authors, categories and
+face names are sampled from example_data/Face_Recognition_DB.videos_queue.json,
+so text lengths and vocabulary look like production data.  Generation is
+deterministic for a given seed.
+"""
+
+import json
+import random
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+
+EXAMPLE_DATA = Path(__file__).resolve().parent.parent / "example_data" / "Face_Recognition_DB.videos_queue.json"
+
+PROGRAMS = ["TT1", "TT2", "TS", "VNEWS", "THDT"]
+CONTENT_TYPES = ["news", "report", "interview", "documentary"]
+
+
+@dataclass
+class Vocabulary:
+    captions: list[str] = field(default_factory=list)
+    summaries: list[str] = field(default_factory=list)
+    sentences: list[str] = field(default_factory=list)
+    authors: list[str] = field(default_factory=list)
+    categories: list[str] = field(default_factory=list)
+    face_names: list[str] = field(default_factory=list)
+    resolutions: list[str] = field(default_factory=list)
+
+
+def _unique(values) -> list[str]:
+    return sorted({v.strip() for v in values if v and v.strip()})
+
+
+def load_vocabulary(path: Path = EXAMPLE_DATA) -> Vocabulary:
+    docs = json.loads(Path(path).read_text(encoding="utf-8"))
+    captions, summaries, sentences, authors, categories, names, resolutions = [], [], [], [], [], [], []
+    for doc in docs:
+        enriched = doc.get("enriched_data", {})
+        audio = enriched.get("audio", {})
+        resolutions.append(enriched.get("video_info", {}).get("resolution", ""))
+        summaries.extend(audio.get("scene_summaries", {}).values())
+        transcription = audio.get("metadata", {}).get("transcription", "")
+        sentences.extend(re.split(r"(?<=[.!?])\s+", transcription))
+        names.extend(f.get("name", "") for f in enriched.get("faces", []))
+        for scene in enriched.get("scene_list", []):
+            captions.extend(scene.get("scene_captioning", "").splitlines())
+            authors.append(scene.get("author", ""))
+            categories.append(scene.get("video_type", ""))
+            names.extend(f.get("name", "") for f in scene.get("faces", []))
+    return Vocabulary(
+        captions=_unique(captions),
+        summaries=_unique(summaries),
+        sentences=_unique(sentences) or _unique(summaries),
+        authors=_unique(authors),
+        categories=_unique(categories),
+        face_names=[n for n in _unique(names) if n != "unknown"] or ["unknown"],
+        resolutions=_unique(resolutions),
+    )
+
+
+def _timecode(seconds: float) -> str:
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return f"{int(h):02d}:{int(m):02d}:{s:06.3f}"
+
+
+def _scene(rng: random.Random, vocab: Vocabulary, start: float, end: float, author: str, category: str) -> dict:
+    faces = [
+        {"face_id": str(uuid.UUID(int=rng.getrandbits(128))), "name": rng.choice(vocab.face_names)}
+        for _ in range(rng.randint(0, 3))
+    ]
+    return {
+        "scene_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "start": _timecode(start),
+        "end": _timecode(end),
+        "scene_captioning": "\n".join(rng.sample(vocab.captions, min(len(vocab.captions), rng.randint(2, 5)))),
+        "faces": faces,
+        "created_date": (date(2024, 1, 1) + timedelta(days=rng.randrange(730))).isoformat(),
+        "author": author,
+        "video_type": category,
+    }
+
+
+def generate_video(rng: random.Random, vocab: Vocabulary, index: int, scenes_per_video: int) -> dict:
+    """One completed video_queue document with *scenes_per_video* scenes."""
+    program = rng.choice(PROGRAMS)
+    author = rng.choice(vocab.authors)
+    category = rng.choice(vocab.categories)
+    broadcast = date(2025, 1, 1) + timedelta(days=rng.randrange(365))
+
+    scenes, start = [], 0.0
+    for _ in range(scenes_per_video):
+        end = start + rng.uniform(3.0, 60.0)
+        scenes.append(_scene(rng, vocab, start, end, author, category))
+        start = end
+
+    summaries = rng.sample(vocab.summaries, min(len(vocab.summaries), scenes_per_video))
+    transcription = " ".join(rng.choice(vocab.sentences) for _ in range(rng.randint(5, 40)))
+    return {
+        "_id": f"{rng.getrandbits(96):024x}",
+        "unique_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "status": "completed",
+        "title": rng.choice(vocab.summaries or vocab.captions)[:120],
+        "video_name": f"{program}_{broadcast:%Y%m%d}_{index:05d}.mp4",
+        "video_tags": rng.sample(vocab.categories, min(len(vocab.categories), 2)),
+        "video_created_at": f"{broadcast.isoformat()}T{rng.randrange(24):02d}:00:00",
+        "program_id": program,
+        "broadcast_date": broadcast.isoformat(),
+        "content_type_id": rng.choice(CONTENT_TYPES),
+        "resolution": rng.choice(vocab.resolutions),
+        "fps": 30,
+        "enriched_data": {
+            "video_info": {"resolution": rng.choice(vocab.resolutions), "duration": _timecode(start), "fps": 30},
+            "audio": {
+                "metadata": {"transcription": transcription},
+                "scene_summaries": {str(i): s for i, s in enumerate(summaries)},
+            },
+            "scene_list": scenes,
+        },
+    }
+
+
+def generate_corpus(videos: int, scenes_per_video: int, seed: int = 0, vocab: Vocabulary | None = None) -> list[dict]:
+    rng = random.Random(seed)
+    vocab = vocab or load_vocabulary()
+    return [generate_video(rng, vocab, i, scenes_per_video) for i in range(videos)]
+
+
+def generate_queries(count: int, seed: int = 0, vocab: Vocabulary | None = None) -> list[str]:
+    """Short queries: a few consecutive words of a caption or summary."""
+    rng = random.Random(seed + 1)
+    vocab = vocab or load_vocabulary()
+    sources = vocab.captions + vocab.summaries
+    queries = []
+    for _ in range(count):
+        words = rng.choice(sources).split()
+        length = min(len(words), rng.randint(2, 6))
+        start = rng.randrange(len(words) - length + 1)
+        queries.append(" ".join(words[start:start + length]))
+    return queries
@@ -0,0 +1,377 @@
+"""
+Run the benchmarks and write a JSON report.
+
+Usage:
+    python -m benchmarks.run                                   # all benchmarks, default corpus
+    python -m benchmarks.run --videos 1000 --scenes-per-video 12
+    python -m benchmarks.run --only search facets --k 10 100 --search-types hybrid
+    python -m benchmarks.run --embedding local                 # real model for encode / ingest
+    python -m benchmarks.compare benchmarks/results/a.json benchmarks/results/b.json
+
+Results are keyed by benchmark name, e.g.:
+    transform.scenes / transform.contents   docs/s (plus scenes/s)
+    encode_queries                          ms per single-query encode (cache off)
+    encode_queries.cached                   same with the query embedding cache
+    ingest.scenes / ingest.contents         rows/s through the ingest route's upsert
+    full_sync                               docs/s through scripts.mongo_watcher.full_sync
+    search.<scene|content>.<type>.k<k>      ms per search_* call (incl. facets)
+    facets.<scene|content>.k<k>             ms per build_*_facets call
+
+The report also records the commit, the corpus parameters and the settings
+that change the hot paths, so two reports are only compared like for like.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+# Ensure project root is on sys.path when running directly
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from benchmarks.corpus import generate_corpus, generate_queries, load_vocabulary
+from benchmarks.stand_ins import (
+    FakeMongoCollection,
+    HashEmbeddingFunction,
+    InMemoryMilvusClient,
+    milvus_lite_available,
+    open_milvus_lite,
+)
+from src import milvus_client
+from src.config import settings
+
+BENCHMARKS = ("transform", "encode", "ingest", "full_sync", "search", "facets")
+SEARCH_TYPES = ("semantic", "fulltext", "hybrid")
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------------
+
+def latency_stats(samples: list[float]) -> dict:
+    """Summary of per-call durations (seconds) in milliseconds."""
+    ms = np.asarray(samples, dtype=np.float64) * 1000
+    return {
+        "unit": "ms",
+        "n": int(ms.size),
+        "mean": float(ms.mean()),
+        "p50": float(np.percentile(ms, 50)),
+        "p95": float(np.percentile(ms, 95)),
+        "p99": float(np.percentile(ms, 99)),
+        "min": float(ms.min()),
+        "max": float(ms.max()),
+    }
+
+
+def throughput(count: int, seconds: float, unit: str) -> dict:
+    return {"unit": f"{unit}/s", "value": count / seconds if seconds else 0.0, "count": count, "seconds": seconds}
+
+
+def _time_calls(fn, args_list: list) -> list[float]:
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+# ---------------------------------------------------------------------------
+# Context
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BenchContext:
+    args: argparse.Namespace
+    workdir: str
+    corpus: list[dict]
+    queries: list[str]
+    embedding_fn: object
+    client_kind: str
+    results: dict = field(default_factory=dict)
+    synced_client: object = None
+    _clients: int = 0
+
+    def new_client(self):
+        """An empty vector DB, installed as the process-wide client used by src/."""
+        self._clients += 1
+        if self.client_kind == "milvus_lite":
+            client = open_milvus_lite(os.path.join(self.workdir, f"bench_{self._clients}.db"))
+        else:
+            client = InMemoryMilvusClient()
+        self.install(client)
+        return client
+
+    def install(self, client) -> None:
+        milvus_client._client = client
+        milvus_client._embedding_fn = self.embedding_fn
+
+    def populated_client(self):
+        """Client holding the whole corpus (the one full_sync filled, or a fresh sync)."""
+        if self.synced_client is None:
+            self.synced_client = self.new_client()
+            _run_full_sync(self.corpus)
+        self.install(self.synced_client)
+        return self.synced_client
+
+
+def _run_full_sync(corpus: list[dict]) -> None:
+    from scripts import mongo_watcher
+
+    with mock.patch.object(mongo_watcher, "get_collection", return_value=FakeMongoCollection(corpus)):
+        mongo_watcher.full_sync()
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def bench_transform(ctx: BenchContext) -> None:
+    from src.sync_utils import transform_mongo_doc, transform_mongo_doc_to_content
+
+    docs = ctx.corpus * ctx.args.repeat
+    start = time.perf_counter()
+    scenes = sum(len(transform_mongo_doc(doc)) for doc in docs)
+    seconds = time.perf_counter() - start
+    ctx.results["transform.scenes"] = {
+        **throughput(len(docs), seconds, "docs"),
+        "scenes_per_s": scenes / seconds if seconds else 0.0,
+    }
+
+    start = time.perf_counter()
+    for doc in docs:
+        transform_mongo_doc_to_content(doc)
+    ctx.results["transform.contents"] = throughput(len(docs), time.perf_counter() - start, "docs")
+
+
+def bench_encode(ctx: BenchContext) -> None:
+    from src.milvus_queries import _encode_queries
+
+    _encode_queries(ctx.embedding_fn, ctx.queries[:1])  # warm-up
+    calls = [(q,) for q in ctx.queries * ctx.args.repeat]
+    with mock.patch.object(settings, "query_embedding_cache_size", 0):
+        samples = _time_calls(lambda q: _encode_queries(ctx.embedding_fn, [q]), calls)
+    ctx.results["encode_queries"] = latency_stats(samples)
+    # With the query embedding cache: repeated queries are hits after the first pass
+    if settings.query_embedding_cache_size > 0:
+        samples = _time_calls(lambda q: _encode_queries(ctx.embedding_fn, [q]), calls)
+        ctx.results["encode_queries.cached"] = latency_stats(samples)
+
+
+def bench_ingest(ctx: BenchContext) -> None:
+    from api.models.scene import ContentIngestItem, SceneIngestItem
+    from api.routes.ingest import _upsert_milvus_contents, _upsert_milvus_scenes
+    from src.sync_utils import transform_mongo_doc, transform_mongo_doc_to_content
+
+    scenes = [SceneIngestItem(**s) for doc in ctx.corpus for s in transform_mongo_doc(doc)]
+    contents = []
+    for doc in ctx.corpus:
+        content = transform_mongo_doc_to_content(doc)
+        contents.append(ContentIngestItem(**{**content, "tags": json.loads(content["tags"])}))
+
+    batch_size = ctx.args.batch_size
+    for name, items, upsert, collection in (
+        ("ingest.scenes", scenes, _upsert_milvus_scenes, settings.milvus_collection_name),
+        ("ingest.contents", contents, _upsert_milvus_contents, settings.milvus_content_collection_name),
+    ):
+        client = ctx.new_client()
+        start = time.perf_counter()
+        for i in range(0, len(items), batch_size):
+            upsert(items[i:i + batch_size], flush=False)
+        client.flush(collection_name=collection)
+        ctx.results[name] = {
+            **throughput(len(items), time.perf_counter() - start, "rows"),
+            "batch_size": batch_size,
+        }
+
+
+def bench_full_sync(ctx: BenchContext) -> None:
+    ctx.synced_client = ctx.new_client()
+    start = time.perf_counter()
+    _run_full_sync(ctx.corpus)
+    ctx.results["full_sync"] = throughput(len(ctx.corpus), time.perf_counter() - start, "docs")
+
+
+def _search_functions(client, embedding_fn) -> dict:
+    from src import milvus_queries as mq
+
+    return {
+        ("scene", "semantic"): lambda q, k: mq.search_scene_semantic(client, embedding_fn, q, k),
+        ("scene", "fulltext"): lambda q, k: mq.search_scene_fulltext(client, q, k),
+        ("scene", "hybrid"): lambda q, k: mq.search_scene_hybrid(client, embedding_fn, q, k),
+        ("content", "semantic"): lambda q, k: mq.search_content_semantic(client, embedding_fn, q, k),
+        ("content", "fulltext"): lambda q, k: mq.search_content_fulltext(client, q, k),
+        ("content", "hybrid"): lambda q, k: mq.search_content_hybrid(client, embedding_fn, q, k),
+    }
+
+
+def bench_search(ctx: BenchContext) -> None:
+    functions = _search_functions(ctx.populated_client(), ctx.embedding_fn)
+    for (target, search_type), search in functions.items():
+        if search_type not in ctx.args.search_types:
+            continue
+        for k in ctx.args.k:
+            search(ctx.queries[0], k)  # warm-up
+            samples = _time_calls(search, [(q, k) for q in ctx.queries * ctx.args.repeat])
+            ctx.results[f"search.{target}.{search_type}.k{k}"] = latency_stats(samples)
+
+
+def bench_facets(ctx: BenchContext) -> None:
+    from src import milvus_queries as mq
+
+    client = ctx.populated_client()
+    targets = (
+        ("scene", settings.milvus_collection_name, mq.SCENE_OUTPUT_FIELDS, mq._parse_scene_hit,
+         mq.build_scene_facets),
+        ("content", settings.milvus_content_collection_name, mq.CONTENT_OUTPUT_FIELDS, mq._parse_content_hit,
+         mq.build_content_facets),
+    )
+    iterations = len(ctx.queries) * ctx.args.repeat
+    for target, collection, output_fields, parse_hit, build_facets in targets:
+        for k in ctx.args.k:
+            rows = client.query(collection_name=collection, filter="", output_fields=output_fields, limit=k)
+            hits = [parse_hit({"distance": 0.0, "entity": row}) for row in rows]
+            samples = _time_calls(build_facets, [(hits,)] * iterations)
+            ctx.results[f"facets.{target}.k{k}"] = {**latency_stats(samples), "hits": len(hits)}
+
+
+_RUNNERS = {
+    "transform": bench_transform,
+    "encode": bench_encode,
+    "ingest": bench_ingest,
+    "full_sync": bench_full_sync,
+    "search": bench_search,
+    "facets": bench_facets,
+}
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=_project_root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def build_meta(args: argparse.Namespace, client_kind: str) -> dict:
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "client": client_kind,
+        "embedding": args.embedding,
+        "params": {
+            "videos": args.videos,
+            "scenes_per_video": args.scenes_per_video,
+            "queries": args.queries,
+            "repeat": args.repeat,
+            "k": args.k,
+            "search_types": args.search_types,
+            "batch_size": args.batch_size,
+            "seed": args.seed,
+        },
+        "settings": {
+            "embedding_dimension": settings.embedding_dimension,
+            "embedding_backend": settings.embedding_backend,
+            "scene_multi_vector_enabled": settings.scene_multi_vector_enabled,
+            "learned_sparse_enabled": settings.learned_sparse_enabled,
+            "content_chunks_enabled": settings.content_chunks_enabled,
+            "bm25_word_segmenter": settings.bm25_word_segmenter,
+            "query_embedding_cache_size": settings.query_embedding_cache_size,
+        },
+    }
+
+
+def _summary_line(name: str, result: dict) -> str:
+    if result["unit"] == "ms":
+        return f"{name:<40} p50 {result['p50']:9.3f} ms  p95 {result['p95']:9.3f} ms  p99 {result['p99']:9.3f} ms"
+    return f"{name:<40} {result['value']:12.1f} {result['unit']}"
+
+
+def run(args: argparse.Namespace) -> dict:
+    client_kind = args.client
+    if client_kind == "auto":
+        client_kind = "milvus_lite" if milvus_lite_available() else "memory"
+    settings.backend = "milvus"
+
+    if args.embedding == "local":
+        embedding_fn = milvus_client.load_local_embedding_fn()
+    else:
+        embedding_fn = HashEmbeddingFunction(settings.embedding_dimension)
+
+    vocab = load_vocabulary()
+    with tempfile.TemporaryDirectory(prefix="ms-bench-") as workdir:
+        ctx = BenchContext(
+            args=args,
+            workdir=workdir,
+            corpus=generate_corpus(args.videos, args.scenes_per_video, args.seed, vocab),
+            queries=generate_queries(args.queries, args.seed, vocab),
+            embedding_fn=embedding_fn,
+            client_kind=client_kind,
+        )
+        for name in BENCHMARKS:
+            if name in args.only:
+                _RUNNERS[name](ctx)
+        return {"meta": build_meta(args, client_kind), "results": ctx.results}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the search and ingest hot paths")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--videos", type=int, default=200, help="Synthetic video_queue documents")
+    parser.add_argument("--scenes-per-video", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=50, help="Distinct search queries")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the queries / corpus")
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--search-types", nargs="+", choices=SEARCH_TYPES, default=list(SEARCH_TYPES))
+    parser.add_argument("--batch-size", type=int, default=64, help="Rows per ingest upsert")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--client", choices=["auto", "memory", "milvus_lite"], default="auto",
+                        help="auto = Milvus Lite when installed, else the in-memory client")
+    parser.add_argument("--embedding", choices=["hash", "local"], default="hash",
+                        help="hash = HashEmbeddingFunction, local = the configured model")
+    parser.add_argument("--output", type=Path, help=f"Report path (default: {RESULTS_DIR}/<commit>-<time>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.disable(logging.INFO)  # per-batch upsert logs would dominate the output
+    report = run(args)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{report['meta']['commit'][:10] or 'nogit'}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    for name, result in report["results"].items():
+        print(_summary_line(name, result))
+    print(f"\nReport written to {output}")
+
+
+if __name__ == "__main__":
+    main()
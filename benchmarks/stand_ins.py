@@ -0,0 +1,331 @@
+"""
+Local stand-ins for the external services used by the benchmarks.
+
+- HashEmbeddingFunction: deterministic hashed bag-of-words vectors, so the
+  benchmarks measure our code around the model, not the model itself (pass
+  ``--embedding local`` to the runner to load the configured model instead).
+- InMemoryMilvusClient: the subset of MilvusClient used by src/ (upsert,
+  search, hybrid_search, query, query_iterator, delete, flush,
+  describe_collection) over plain Python dicts.
+  Dense fields are scored with numpy, bm25_text with a small BM25 inverted
+  index.  Filters support ``field == "v"`` / ``field in [...]`` terms joined
+  by ``and``, which covers the id lookups the sync and search code issue.
+- FakeMongoCollection: ``find({"status": ...})`` and ``{"_id": {"$in": [...]}}``
+  over a list of documents (projections are ignored).
+- open_milvus_lite: a MilvusClient on a local .db file when milvus-lite is
+  installed, with the collections created by ensure_collection.
+"""
+
+import math
+import re
+import zlib
+from collections import Counter, defaultdict
+
+import numpy as np
+from pymilvus import WeightedRanker
+
+_PRIMARY_KEYS = ("chunk_id", "scene_id", "content_id")
+_TOKEN_RE = re.compile(r"\w+")
+_TERM_RE = re.compile(r'^\s*(\w+)\s*(==|in)\s*(.+?)\s*$')
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+# ---------------------------------------------------------------------------
+# Embedding
+# ---------------------------------------------------------------------------
+
+class HashEmbeddingFunction:
+    """Feature-hashed token counts, L2-normalised (no model, no tokenizer)."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def _bucket(self, token: str) -> int:
+        return zlib.crc32(token.encode("utf-8")) % self.dim
+
+    def _encode(self, texts: list[str]) -> list[np.ndarray]:
+        vectors = []
+        for text in texts:
+            vector = np.zeros(self.dim, dtype=np.float32)
+            for token in _tokens(text):
+                vector[self._bucket(token)] += 1.0
+            norm = np.linalg.norm(vector)
+            vectors.append(vector / norm if norm else vector)
+        return vectors
+
+    def _sparse(self, texts: list[str]) -> list[dict[int, float]]:
+        return [
+            {self._bucket(token): float(count) for token, count in Counter(_tokens(text)).items()}
+            for text in texts
+        ]
+
+    def encode_documents(self, documents: list[str]) -> list[np.ndarray]:
+        return self._encode(documents)
+
+    def encode_queries(self, queries: list[str]) -> list[np.ndarray]:
+        return self._encode(queries)
+
+    def encode_documents_with_sparse(self, documents: list[str]) -> tuple[list, list[dict[int, float]]]:
+        return self._encode(documents), self._sparse(documents)
+
+    def encode_queries_with_sparse(self, queries: list[str]) -> tuple[list, list[dict[int, float]]]:
+        return self._encode(queries), self._sparse(queries)
+
+
+# ---------------------------------------------------------------------------
+# Milvus
+# ---------------------------------------------------------------------------
+
+def _parse_filter(expr: str | None) -> list[tuple[str, set]]:
+    """``a == "x" and b in ["y", "z"]`` -> [("a", {"x"}), ("b", {"y", "z"})]."""
+    if not expr:
+        return []
+    terms = []
+    for term in re.split(r"\s+and\s+", expr.strip()):
+        match = _TERM_RE.match(term)
+        if match is None:
+            raise ValueError(f"Filter not supported by the in-memory client: {term!r}")
+        field, op, value = match.groups()
+        values = value.strip("[]") if op == "in" else value
+        terms.append((field, {v.strip().strip("\"'") for v in values.split(",") if v.strip()}))
+    return terms
+
+
+def _matches(row: dict, terms: list[tuple[str, set]]) -> bool:
+    return all(str(row.get(field)) in values for field, values in terms)
+
+
+class _Collection:
+    def __init__(self):
+        self.rows: dict[str, dict] = {}
+        self._dense: dict[str, tuple[list[str], np.ndarray]] = {}
+        self._bm25: tuple[dict[str, dict[str, int]], dict[str, int], float] | None = None
+
+    def invalidate(self) -> None:
+        self._dense.clear()
+        self._bm25 = None
+
+    def dense_matrix(self, field: str) -> tuple[list[str], np.ndarray]:
+        if field not in self._dense:
+            keys = [k for k, row in self.rows.items() if field in row]
+            matrix = np.array([np.asarray(self.rows[k][field], dtype=np.float32) for k in keys], dtype=np.float32)
+            if len(keys):
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                matrix = matrix / np.where(norms == 0, 1.0, norms)
+            self._dense[field] = (keys, matrix)
+        return self._dense[field]
+
+    def bm25_index(self) -> tuple[dict[str, dict[str, int]], dict[str, int], float]:
+        if self._bm25 is None:
+            postings: dict[str, dict[str, int]] = defaultdict(dict)
+            lengths = {}
+            for key, row in self.rows.items():
+                tokens = _tokens(row.get("bm25_text", ""))
+                lengths[key] = len(tokens)
+                for token, count in Counter(tokens).items():
+                    postings[token][key] = count
+            avg_length = sum(lengths.values()) / len(lengths) if lengths else 0.0
+            self._bm25 = (postings, lengths, avg_length)
+        return self._bm25
+
+
+class _QueryIterator:
+    def __init__(self, rows: list[dict], batch_size: int):
+        self._rows = rows
+        self._batch_size = batch_size
+
+    def next(self) -> list[dict]:
+        batch, self._rows = self._rows[:self._batch_size], self._rows[self._batch_size:]
+        return batch
+
+    def close(self) -> None:
+        self._rows = []
+
+
+class InMemoryMilvusClient:
+    def __init__(self, fields: set[str] | None = None):
+        self._collections: dict[str, _Collection] = defaultdict(_Collection)
+        # Schema fields reported by describe_collection besides those seen in rows
+        self._fields = set(fields or ())
+
+    # ---- Writes ----
+
+    def upsert(self, collection_name: str, data: list[dict], **kwargs) -> dict:
+        collection = self._collections[collection_name]
+        for row in data:
+            key = next(row[k] for k in _PRIMARY_KEYS if k in row)
+            collection.rows[key] = dict(row)
+        collection.invalidate()
+        return {"upsert_count": len(data)}
+
+    insert = upsert
+
+    def delete(self, collection_name: str, filter: str = "", ids: list | None = None, **kwargs) -> dict:
+        collection = self._collections[collection_name]
+        terms = _parse_filter(filter)
+        if ids:
+            keys = [k for k in ids if k in collection.rows]
+        else:
+            keys = [k for k, row in collection.rows.items() if _matches(row, terms)]
+        for key in keys:
+            del collection.rows[key]
+        collection.invalidate()
+        return {"delete_count": len(keys)}
+
+    def flush(self, collection_name: str, **kwargs) -> None:
+        pass
+
+    def get_collection_stats(self, collection_name: str, **kwargs) -> dict:
+        return {"row_count": len(self._collections[collection_name].rows)}
+
+    def describe_collection(self, collection_name: str, **kwargs) -> dict:
+        names = set(self._fields)
+        for row in self._collections[collection_name].rows.values():
+            names.update(row)
+        return {"collection_name": collection_name, "fields": [{"name": name} for name in sorted(names)]}
+
+    # ---- Reads ----
+
+    def query(
+        self, collection_name: str, filter: str = "", output_fields: list[str] | None = None,
+        limit: int | None = None, **kwargs,
+    ) -> list[dict]:
+        collection = self._collections[collection_name]
+        terms = _parse_filter(filter)
+        rows = [row for row in collection.rows.values() if _matches(row, terms)]
+        return [self._entity(row, output_fields) for row in rows[:limit]]
+
+    def query_iterator(
+        self, collection_name: str, batch_size: int = 1000, filter: str = "",
+        output_fields: list[str] | None = None, **kwargs,
+    ) -> _QueryIterator:
+        return _QueryIterator(self.query(collection_name, filter=filter, output_fields=output_fields), batch_size)
+
+    def search(
+        self, collection_name: str, data: list, anns_field: str, limit: int = 10,
+        output_fields: list[str] | None = None, filter: str = "", group_by_field: str | None = None,
+        group_size: int | None = None, **kwargs,
+    ) -> list[list[dict]]:
+        collection = self._collections[collection_name]
+        terms = _parse_filter(filter)
+        results = []
+        for query in data:
+            scored = self._score(collection, anns_field, query, terms)
+            results.append(self._hits(collection, scored, limit, output_fields, group_by_field, group_size))
+        return results
+
+    def hybrid_search(
+        self, collection_name: str, reqs: list, ranker, limit: int = 10, output_fields: list[str] | None = None,
+        filter: str = "", group_by_field: str | None = None, group_size: int | None = None, **kwargs,
+    ) -> list[list[dict]]:
+        collection = self._collections[collection_name]
+        terms = _parse_filter(filter)
+        weights = getattr(ranker, "_weights", None) if isinstance(ranker, WeightedRanker) else None
+        rrf_k = getattr(ranker, "_k", 60)
+        results = []
+        for i in range(len(reqs[0].data)):
+            fused: dict[str, float] = defaultdict(float)
+            for r, req in enumerate(reqs):
+                scored = self._score(collection, req.anns_field, req.data[i], terms)[:req.limit]
+                for rank, (key, score) in enumerate(scored):
+                    fused[key] += weights[r] * score if weights else 1.0 / (rrf_k + rank + 1)
+            ranked = sorted(fused.items(), key=lambda x: -x[1])
+            results.append(self._hits(collection, ranked, limit, output_fields, group_by_field, group_size))
+        return results
+
+    # ---- Scoring ----
+
+    def _score(self, collection: _Collection, field: str, query, terms) -> list[tuple[str, float]]:
+        if isinstance(query, str):
+            scored = self._bm25(collection, query)
+        elif isinstance(query, dict):
+            scored = [
+                (key, sum(weight * row[field].get(token, 0.0) for token, weight in query.items()))
+                for key, row in collection.rows.items() if field in row
+            ]
+        else:
+            keys, matrix = collection.dense_matrix(field)
+            if not keys:
+                return []
+            vector = np.asarray(query, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            scores = matrix @ (vector / norm if norm else vector)
+            scored = list(zip(keys, scores.tolist()))
+        if terms:
+            scored = [(k, s) for k, s in scored if _matches(collection.rows[k], terms)]
+        return sorted(scored, key=lambda x: -x[1])
+
+    @staticmethod
+    def _bm25(collection: _Collection, text: str, k1: float = 1.2, b: float = 0.75) -> list[tuple[str, float]]:
+        postings, lengths, avg_length = collection.bm25_index()
+        scores: dict[str, float] = defaultdict(float)
+        for token in set(_tokens(text)):
+            docs = postings.get(token, {})
+            idf = math.log(1 + (len(lengths) - len(docs) + 0.5) / (len(docs) + 0.5))
+            for key, tf in docs.items():
+                scores[key] += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[key] / avg_length))
+        return list(scores.items())
+
+    @staticmethod
+    def _entity(row: dict, output_fields: list[str] | None) -> dict:
+        if not output_fields:
+            return dict(row)
+        return {field: row[field] for field in output_fields if field in row}
+
+    def _hits(self, collection, scored, limit, output_fields, group_by_field, group_size) -> list[dict]:
+        hits = []
+        group_counts: dict = {}
+        for key, score in scored:
+            row = collection.rows[key]
+            if group_by_field:
+                group = row.get(group_by_field)
+                if group not in group_counts and len(group_counts) == limit:
+                    continue
+                if group_counts.get(group, 0) == (group_size or 1):
+                    continue
+                group_counts[group] = group_counts.get(group, 0) + 1
+            elif len(hits) == limit:
+                break
+            hits.append({"id": key, "distance": score, "entity": self._entity(row, output_fields)})
+        return hits
+
+
+def milvus_lite_available() -> bool:
+    try:
+        import milvus_lite  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def open_milvus_lite(db_path: str):
+    """MilvusClient on a local Milvus Lite file with the collections of ensure_collection."""
+    from pymilvus import MilvusClient
+
+    from src.milvus_manager import ensure_collection
+
+    client = MilvusClient(db_path)
+    ensure_collection(client)
+    return client
+
+
+# ---------------------------------------------------------------------------
+# MongoDB
+# ---------------------------------------------------------------------------
+
+class FakeMongoCollection:
+    def __init__(self, docs: list[dict]):
+        self.docs = docs
+
+    def find(self, query: dict | None = None, projection: dict | None = None, **kwargs):
+        query = query or {}
+        return (doc for doc in self.docs if all(self._match(doc.get(k), v) for k, v in query.items()))
+
+    @staticmethod
+    def _match(value, condition) -> bool:
+        if isinstance(condition, dict) and "$in" in condition:
+            return value in condition["$in"]
+        return value == condition
@@ -4,6 +4,7 @@ Usage:
     python -m scripts.drop_collection                       # drop all and recreate
     python -m scripts.drop_collection --collection scenes   # drop scenes only
     python -m scripts.drop_collection --collection contents # drop contents only
+    python -m scripts.drop_collection --collection content_chunks
     python -m scripts.drop_collection --drop-only           # drop without recreating
 """
 
@@ -16,18 +17,20 @@ if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
 from src.config import settings
-from src.milvus_client import get_milvus_client
-from src.milvus_manager import ensure_collection
 
 
 def main():
     parser = argparse.ArgumentParser(description="Drop Milvus collection(s)")
     parser.add_argument("--drop-only", action="store_true",
                         help="Drop without recreating")
-    parser.add_argument("--collection", choices=["scenes", "contents", "all"],
+    parser.add_argument("--collection", choices=["scenes", "contents", "content_chunks", "all"],
                         default="all", help="Which collection(s) to drop (default: all)")
     args = parser.parse_args()
 
+    # pymilvus loads after argument parsing so --help stays instant
+    from src.milvus_client import get_milvus_client
+    from src.milvus_manager import ensure_collection
+
     client = get_milvus_client()
 
     collections = []
@@ -35,6 +38,8 @@ def main():
         collections.append(settings.milvus_collection_name)
     if args.collection in ("contents", "all"):
         collections.append(settings.milvus_content_collection_name)
+    if args.collection in ("content_chunks", "all"):
+        collections.append(settings.milvus_content_chunk_collection_name)
 
     for name in collections:
         if not client.has_collection(collection_name=name):
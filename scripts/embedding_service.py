@@ -0,0 +1,66 @@
+"""Run the shared embedding service: one model copy for all API workers and watchers.
+
+Clients connect when MS_EMBEDDING_SERVICE_ADDRESS is set to the same address.
+
+Trust model: the service exchanges pickled messages, so whoever passes the
+handshake can execute code in the service (and the service in its clients).
+MS_EMBEDDING_SERVICE_AUTHKEY must be set to the same secret for the service
+and every client; nothing starts without it.  The service only listens on a
+Unix socket (protect it with file permissions), a named pipe or a loopback
+address.  Listening on another interface needs
+MS_EMBEDDING_SERVICE_ALLOW_REMOTE=true and a trusted private network: the
+secret authenticates peers but the traffic is not encrypted.
+
+Usage:
+    python -m scripts.embedding_service                                # address from settings
+    python -m scripts.embedding_service --address /tmp/embedding.sock
+    python -m scripts.embedding_service --address 127.0.0.1:7010 --max-batch 128
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from src.config import settings
+from src.embedding_service import EmbeddingServer, is_local_address, parse_address
+from src.milvus_client import load_local_embedding_fn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared embedding service")
+    parser.add_argument("--address", default=settings.embedding_service_address or "/tmp/metadata_search_embedding.sock",
+                        help="Unix socket path, named pipe or host:port")
+    parser.add_argument("--max-batch", type=int, default=settings.embedding_service_max_batch,
+                        help="Max texts per model call")
+    parser.add_argument("--max-wait-ms", type=float, default=settings.embedding_service_max_wait_ms,
+                        help="How long to wait for more requests before encoding a partial batch")
+    args = parser.parse_args()
+
+    # Fail before loading the model; EmbeddingServer checks the same again
+    if not settings.embedding_service_authkey:
+        parser.error("set MS_EMBEDDING_SERVICE_AUTHKEY to a shared secret for the service and its clients")
+    if not settings.embedding_service_allow_remote and not is_local_address(parse_address(args.address)):
+        parser.error(f"{args.address} is not a local address; set MS_EMBEDDING_SERVICE_ALLOW_REMOTE=true "
+                     "to listen on a trusted network")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    embedding_fn = load_local_embedding_fn()
+    server = EmbeddingServer(
+        embedding_fn,
+        address=args.address,
+        authkey=settings.embedding_service_authkey.encode(),
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        allow_remote=settings.embedding_service_allow_remote,
+    )
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Export the embedding model to a local safetensors artifact for MS_EMBEDDING_MODEL_PATH.
+
+Downloads the model snapshot once (tokenizer, sentence-transformers config and
+the bge-m3 sparse / colbert heads included), converts pickled
+pytorch_model.bin weights to model.safetensors (no pickle is loaded at run
+time), and writes artifact.json with the model name and revision.  Needs network
+access and torch + transformers at export time only; copy the directory to
+the production hosts and set MS_EMBEDDING_MODEL_PATH there.
+
+Usage:
+    python -m scripts.export_model                                  # -> settings.embedding_model_path or models/<name>
+    python -m scripts.export_model --output models/bge-m3 --revision <commit>
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from src.config import settings
+from src.model_artifact import MANIFEST_FILE, has_weights
+
+# ONNX / TF / Flax copies of the weights are not needed by the torch backends
+_IGNORE_PATTERNS = ["onnx/*", "*.onnx", "*.onnx_data", "*.h5", "*.msgpack", "imgs/*"]
+
+
+def export(model_name: str, output: Path, revision: str | None = None) -> Path:
+    from huggingface_hub import snapshot_download
+
+    output.mkdir(parents=True, exist_ok=True)
+    snapshot_download(model_name, revision=revision, local_dir=output, ignore_patterns=_IGNORE_PATTERNS)
+
+    if not has_weights(output):
+        from transformers import AutoModel
+
+        AutoModel.from_pretrained(output).save_pretrained(output)  # writes model.safetensors
+    for pickled in output.glob("pytorch_model*.bin*"):
+        pickled.unlink()
+
+    manifest = {
+        "model_name": model_name,
+        "revision": revision,
+        "exported_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "files": {
+            p.relative_to(output).as_posix(): p.stat().st_size
+            for p in sorted(output.rglob("*"))
+            # .cache holds snapshot_download bookkeeping
+            if p.is_file() and p.name != MANIFEST_FILE and ".cache" not in p.relative_to(output).parts
+        },
+    }
+    (output / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return output
+
+
+def main():
+    default_output = settings.embedding_model_path or f"models/{settings.embedding_model_name.split('/')[-1]}"
+    parser = argparse.ArgumentParser(description="Export the embedding model to a local safetensors artifact")
+    parser.add_argument("--model", default=settings.embedding_model_name, help="HF model name")
+    parser.add_argument("--revision", default=None, help="Hub revision (branch, tag or commit) to pin")
+    parser.add_argument("--output", default=default_output, help="Output directory")
+    args = parser.parse_args()
+
+    output = export(args.model, Path(args.output), args.revision)
+    print(f"Exported {args.model} to {output}; set MS_EMBEDDING_MODEL_PATH={output}")
+
+
+if __name__ == "__main__":
+    main()
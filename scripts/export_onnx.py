@@ -0,0 +1,78 @@
+"""Export the embedding model to ONNX for MS_EMBEDDING_BACKEND=onnx.
+
+Writes model.onnx (fp32) and, with --quantize, model_int8.onnx (dynamic int8
+weights) plus the tokenizer files into the output directory.  Needs torch and
+transformers at export time only; serving needs onnxruntime + transformers.
+
+Usage:
+    python -m scripts.export_onnx                                  # -> settings.embedding_onnx_path
+    python -m scripts.export_onnx --output models/bge-m3-onnx --quantize
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from src.config import settings
+from src.onnx_embedding import ONNX_MODEL_FILE, ONNX_QUANTIZED_MODEL_FILE
+
+
+def export(model_name: str, output: Path, opset: int) -> Path:
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    output.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+    tokenizer.save_pretrained(output)
+
+    sample = tokenizer(["xin chào", "metadata search"], padding=True, return_tensors="pt")
+    model_path = output / ONNX_MODEL_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            str(model_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+    return model_path
+
+
+def quantize(model_path: Path) -> Path:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_path = model_path.with_name(ONNX_QUANTIZED_MODEL_FILE)
+    # bge-m3 is > 2 GB in fp32, so weights live in external data files
+    quantize_dynamic(str(model_path), str(quantized_path), weight_type=QuantType.QInt8,
+                     use_external_data_format=True)
+    return quantized_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX")
+    parser.add_argument("--model", default=settings.embedding_model_name, help="HF model name or local path")
+    parser.add_argument("--output", default=settings.embedding_onnx_path, help="Output directory")
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--quantize", action="store_true", help="Also write a dynamic int8 model")
+    args = parser.parse_args()
+
+    model_path = export(args.model, Path(args.output), args.opset)
+    print(f"Exported {model_path}")
+    if args.quantize:
+        print(f"Quantized {quantize(model_path)}")
+
+
+if __name__ == "__main__":
+    main()
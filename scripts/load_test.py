@@ -0,0 +1,324 @@
+"""
+Load generator for the search API (capacity planning).
+
+Two request sources:
+  - replay: a JSONL log with one request per line, e.g. the query log
+    (src/query_log.py) or a hand-written file:
+        {"method": "GET", "path": "/v1/search/scene", "params": {"query_text": "bão", "k": 10}}
+        {"method": "POST", "path": "/v1/search/content/filter", "json": {"query_text": "lũ", "k": 20}}
+        {"method": "POST", "path": "/v1/face_search", "form": {"face_names": ["Tô Lâm"], "k": 10}}
+  - zipf: a synthetic mix where query popularity follows a Zipf law over a
+    query pool (--queries-file, or queries sampled from example_data).
+
+Requests are sent open-loop at --qps by --concurrency workers.  Latency is
+measured from the scheduled send time, so queueing when the API (or the
+worker pool) falls behind shows up in the percentiles; "service" is the
+time of the HTTP call alone.  --qps 0 sends as fast as the workers allow.
+
+Usage:
+    python scripts/load_test.py --mode zipf --qps 20 --concurrency 8 --duration 60
+    python scripts/load_test.py --mode replay --log logs/query_log.jsonl --qps 50 --concurrency 16
+    python scripts/load_test.py --mode zipf --endpoints scene:3 content:1 scene_filter:1 --capture-metrics \\
+        --output reports/load_20qps.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import accumulate, cycle, islice
+from pathlib import Path
+
+import numpy as np
+import requests
+
+# Ensure project root is on sys.path when running directly
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+DEFAULT_API = "http://localhost:8003"
+
+# Synthetic endpoint name -> (method, path)
+SYNTHETIC_ENDPOINTS = {
+    "scene": ("GET", "/v1/search/scene"),
+    "content": ("GET", "/v1/search/content"),
+    "joint": ("GET", "/v1/search/joint"),
+    "segments": ("GET", "/v1/search/scene/segments"),
+    "scene_filter": ("POST", "/v1/search/scene/filter"),
+    "content_filter": ("POST", "/v1/search/content/filter"),
+}
+
+
+# ---------------------------------------------------------------------------
+# Request sources
+# ---------------------------------------------------------------------------
+
+def load_replay_log(path: Path) -> list[dict]:
+    """Requests of a JSONL log; lines without a path are skipped."""
+    entries = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        if not entry.get("path"):
+            continue
+        has_body = "json" in entry or "form" in entry
+        entries.append({
+            "method": entry.get("method") or ("POST" if has_body else "GET"),
+            "path": entry["path"],
+            "params": entry.get("params"),
+            "json": entry.get("json"),
+            "form": entry.get("form"),
+        })
+    return entries
+
+
+def load_query_pool(queries_file: Path | None, size: int, seed: int) -> list[str]:
+    if queries_file:
+        return [q.strip() for q in queries_file.read_text(encoding="utf-8").splitlines() if q.strip()]
+    from benchmarks.corpus import generate_queries
+
+    return list(dict.fromkeys(generate_queries(size, seed)))
+
+
+def parse_endpoint_mix(specs: list[str]) -> dict[str, float]:
+    """["scene:3", "content"] -> {"scene": 3.0, "content": 1.0}"""
+    mix = {}
+    for spec in specs:
+        name, _, weight = spec.partition(":")
+        if name not in SYNTHETIC_ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}', expected one of {', '.join(SYNTHETIC_ENDPOINTS)}")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def zipf_requests(
+    queries: list[str], mix: dict[str, float], count: int, s: float, k: int, search_type: str, seed: int,
+) -> list[dict]:
+    """*count* requests; the query of rank r is drawn with probability ~ 1 / r**s."""
+    rng = random.Random(seed)
+    query_weights = list(accumulate(1.0 / rank ** s for rank in range(1, len(queries) + 1)))
+    names = list(mix)
+    endpoint_weights = list(accumulate(mix.values()))
+    out = []
+    for query, name in zip(
+        rng.choices(queries, cum_weights=query_weights, k=count),
+        rng.choices(names, cum_weights=endpoint_weights, k=count),
+    ):
+        method, path = SYNTHETIC_ENDPOINTS[name]
+        payload = {"query_text": query, "k": k, "search_type": search_type}
+        if name in ("joint", "segments"):
+            del payload["search_type"]
+        if method == "GET":
+            out.append({"method": method, "path": path, "params": payload, "json": None, "form": None})
+        else:
+            out.append({"method": method, "path": path, "params": None, "json": payload, "form": None})
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+class LoadRunner:
+    def __init__(self, api: str, concurrency: int, timeout: float):
+        self.api = api.rstrip("/")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.samples: list[tuple[str, str, float, float]] = []  # path, status, latency, service
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _send(self, request: dict, scheduled: float | None) -> None:
+        start = time.perf_counter()
+        try:
+            response = self._session().request(
+                request["method"], self.api + request["path"],
+                params=request["params"], json=request["json"], data=request["form"], timeout=self.timeout,
+            )
+            status = str(response.status_code)
+        except requests.RequestException as e:
+            status = type(e).__name__
+        end = time.perf_counter()
+        with self._lock:
+            self.samples.append((request["path"], status, end - (scheduled or start), end - start))
+
+    def run(self, request_list: list[dict], qps: float) -> float:
+        """Send every request (open loop at *qps*, or as fast as possible); returns elapsed seconds."""
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for i, request in enumerate(request_list):
+                scheduled = None
+                if qps > 0:
+                    scheduled = start + i / qps
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                pool.submit(self._send, request, scheduled)
+        return time.perf_counter() - start
+
+
+def _percentiles(seconds: list[float]) -> dict:
+    ms = np.asarray(seconds) * 1000
+    return {
+        "p50": float(np.percentile(ms, 50)),
+        "p95": float(np.percentile(ms, 95)),
+        "p99": float(np.percentile(ms, 99)),
+        "mean": float(ms.mean()),
+        "max": float(ms.max()),
+    }
+
+
+def summarize(samples: list[tuple[str, str, float, float]], elapsed: float) -> dict:
+    """Per-endpoint and overall stats; any non-2xx status or transport error counts as an error."""
+    groups = defaultdict(list)
+    for sample in samples:
+        groups[sample[0]].append(sample)
+    groups["total"] = samples
+
+    stats = {}
+    for path, group in groups.items():
+        if not group:
+            continue
+        statuses = Counter(s[1] for s in group)
+        errors = sum(n for status, n in statuses.items() if not status.startswith("2"))
+        stats[path] = {
+            "requests": len(group),
+            "errors": errors,
+            "error_rate": errors / len(group),
+            "throughput_rps": len(group) / elapsed if elapsed else 0.0,
+            "latency_ms": _percentiles([s[2] for s in group]),
+            "service_ms": _percentiles([s[3] for s in group]),
+            "status": dict(statuses),
+        }
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# /metrics snapshots
+# ---------------------------------------------------------------------------
+
+def fetch_metrics(api: str, timeout: float) -> str:
+    response = requests.get(api.rstrip("/") + "/metrics", timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def _counter_samples(text: str) -> dict[str, float]:
+    """Cumulative samples (counters, histogram / summary _count and _sum) keyed by name{labels}."""
+    from prometheus_client.parser import text_string_to_metric_families
+
+    samples = {}
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if sample.name.endswith(("_total", "_count", "_sum")):
+                labels = ",".join(f'{k}="{v}"' for k, v in sorted(sample.labels.items()))
+                samples[f"{sample.name}{{{labels}}}"] = sample.value
+    return samples
+
+
+def metrics_delta(before: str, after: str) -> dict[str, float]:
+    """Non-zero increases of cumulative samples between two /metrics snapshots."""
+    old, new = _counter_samples(before), _counter_samples(after)
+    return {key: value - old.get(key, 0.0) for key, value in sorted(new.items()) if value != old.get(key, 0.0)}
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def build_requests(args: argparse.Namespace) -> list[dict]:
+    target = args.requests or (int(args.duration * args.qps) if args.duration and args.qps > 0 else 0)
+    if args.mode == "replay":
+        entries = load_replay_log(args.log)
+        if not entries:
+            raise SystemExit(f"No replayable requests in {args.log}")
+        # Replay the log once unless a request count / duration asks for more (or fewer)
+        return list(islice(cycle(entries), target or len(entries)))
+    queries = load_query_pool(args.queries_file, args.pool_size, args.seed)
+    mix = parse_endpoint_mix(args.endpoints)
+    return zipf_requests(queries, mix, target or 1000, args.zipf_s, args.k, args.search_type, args.seed)
+
+
+def _print_report(stats: dict) -> None:
+    print(f"{'endpoint':<32} {'req':>7} {'err%':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for path, s in stats.items():
+        lat = s["latency_ms"]
+        print(f"{path:<32} {s['requests']:>7} {s['error_rate']:>6.1%} {s['throughput_rps']:>8.1f} "
+              f"{lat['p50']:>9.1f} {lat['p95']:>9.1f} {lat['p99']:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the search API")
+    parser.add_argument("--api", default=DEFAULT_API, help=f"API base URL (default: {DEFAULT_API})")
+    parser.add_argument("--mode", choices=["replay", "zipf"], default="zipf")
+    parser.add_argument("--log", type=Path, help="JSONL request / query log to replay (--mode replay)")
+    parser.add_argument("--qps", type=float, default=10.0, help="Target requests per second, 0 = unthrottled")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent workers (HTTP connections)")
+    parser.add_argument("--duration", type=float, default=0.0, help="Seconds to run (requests = duration × qps)")
+    parser.add_argument("--requests", type=int, default=0, help="Number of requests (overrides --duration)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--endpoints", nargs="+", default=["scene", "content"],
+                        help=f"Zipf mix as name[:weight], names: {', '.join(SYNTHETIC_ENDPOINTS)}")
+    parser.add_argument("--queries-file", type=Path, help="Query pool, one per line (default: from example_data)")
+    parser.add_argument("--pool-size", type=int, default=500, help="Generated query pool size")
+    parser.add_argument("--zipf-s", type=float, default=1.1, help="Zipf exponent (higher = more repeated queries)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--search-type", choices=["semantic", "fulltext", "hybrid"], default="hybrid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--capture-metrics", action="store_true", help="Snapshot GET /metrics before and after")
+    parser.add_argument("--output", type=Path, help="Write the JSON report (and /metrics snapshots) here")
+    args = parser.parse_args()
+    if args.mode == "replay" and not args.log:
+        parser.error("--mode replay needs --log")
+
+    request_list = build_requests(args)
+    before = fetch_metrics(args.api, args.timeout) if args.capture_metrics else None
+
+    runner = LoadRunner(args.api, args.concurrency, args.timeout)
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    elapsed = runner.run(request_list, args.qps)
+    stats = summarize(runner.samples, elapsed)
+
+    report = {
+        "meta": {
+            "api": args.api,
+            "mode": args.mode,
+            "log": str(args.log) if args.log else None,
+            "endpoints": args.endpoints if args.mode == "zipf" else None,
+            "qps": args.qps,
+            "concurrency": args.concurrency,
+            "requests": len(request_list),
+            "started_at": started_at,
+            "elapsed_s": elapsed,
+        },
+        "endpoints": stats,
+    }
+    if before is not None:
+        after = fetch_metrics(args.api, args.timeout)
+        report["metrics_delta"] = metrics_delta(before, after)
+        if args.output:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.with_suffix(".metrics.before.txt").write_text(before, encoding="utf-8")
+            args.output.with_suffix(".metrics.after.txt").write_text(after, encoding="utf-8")
+
+    _print_report(stats)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
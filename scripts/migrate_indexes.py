@@ -0,0 +1,61 @@
+"""Add missing scalar indexes on filter/facet fields to existing Milvus collections.
+
+Collections created before scalar indexes were introduced only index the
+dense and sparse vectors, so every filtered search scans the filter fields.
+This builds the missing indexes in place — no drop / re-sync needed.
+
+Usage:
+    python -m scripts.migrate_indexes                       # all collections
+    python -m scripts.migrate_indexes --collection scenes   # scenes only
+    python -m scripts.migrate_indexes --collection contents # contents only
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from src.config import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create missing scalar indexes on Milvus collection(s)")
+    parser.add_argument("--collection", choices=["scenes", "contents", "content_chunks", "all"],
+                        default="all", help="Which collection(s) to migrate (default: all)")
+    args = parser.parse_args()
+
+    # pymilvus loads after argument parsing so --help stays instant
+    from src.milvus_client import get_milvus_client
+    from src.milvus_manager import (
+        CONTENT_CHUNK_SCALAR_INDEXES,
+        CONTENT_SCALAR_INDEXES,
+        SCENE_SCALAR_INDEXES,
+        ensure_scalar_indexes,
+    )
+
+    client = get_milvus_client()
+
+    targets = []
+    if args.collection in ("scenes", "all"):
+        targets.append((settings.milvus_collection_name, SCENE_SCALAR_INDEXES))
+    if args.collection in ("contents", "all"):
+        targets.append((settings.milvus_content_collection_name, CONTENT_SCALAR_INDEXES))
+    if args.collection in ("content_chunks", "all"):
+        targets.append((settings.milvus_content_chunk_collection_name, CONTENT_CHUNK_SCALAR_INDEXES))
+
+    for name, scalar_indexes in targets:
+        if not client.has_collection(collection_name=name):
+            print(f"Collection '{name}' does not exist.")
+            continue
+        created = ensure_scalar_indexes(client, name, scalar_indexes)
+        if created:
+            print(f"Collection '{name}': created indexes on {', '.join(created)}.")
+        else:
+            print(f"Collection '{name}': all scalar indexes already exist.")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,9 @@ Reliability features:
   - Exponential backoff on connection errors → auto-reconnects
   - Graceful shutdown on SIGINT / SIGTERM
   - Structured logging
+  - Prometheus exporter (events, event lag) on MS_WATCHER_METRICS_PORT
+  - Status file (state, last event, heartbeat) at MS_WATCHER_STATUS_PATH,
+    reported by the API on /health/deep
 
 Usage:
     python -m scripts.mongo_watcher                  # foreground
@@ -25,8 +28,10 @@ Can be installed as a Windows service via nssm:
 import argparse
 import json
 import logging
+import os
 import signal
 import sys
+import threading
 import time
 from pathlib import Path
 
@@ -38,6 +43,13 @@ if str(_project_root) not in sys.path:
 from pymongo.errors import PyMongoError
 
 from src.config import settings
+from src.health import write_watcher_status
+from src.metrics import (
+    WATCHER_EVENT_LAG_SECONDS,
+    WATCHER_EVENTS,
+    WATCHER_LAST_EVENT_TIMESTAMP,
+    start_exporter,
+)
 from src.mongo_client import get_collection, get_mongo_client
 from src.sync_utils import (
     get_scene_ids_from_doc,
@@ -199,17 +211,69 @@ def _handle_change(change: dict) -> None:
         else:
             # Without pre-image we cannot recover scene_ids or content_id.
             # The CRUD API delete path should remove scenes/contents before
-            # deleting the Mongo doc. Use /v1/videos/sync-all to reconcile.
+            # deleting the Mongo doc; scripts/reconcile.py deletes the orphans.
             logger.warning(
                 "Delete detected for _id=%s but no pre-image available. "
-                "Scene/content cleanup is handled by the CRUD API; use "
-                "POST /v1/videos/sync-all to reconcile if documents were "
-                "deleted directly in MongoDB.", doc_id)
+                "Scene/content cleanup is handled by the CRUD API; run "
+                "python -m scripts.reconcile to remove orphans if documents "
+                "were deleted directly in MongoDB.", doc_id)
 
     else:
         logger.debug("Ignoring operationType=%s", op)
 
 
+def _record_event(change: dict, status: str) -> None:
+    """
+    Update the watcher metrics and in-memory status for one processed change event.
+
+    The status file is only rewritten by the heartbeat and on state changes, not
+    once per event.
+    """
+    WATCHER_EVENTS.labels(change.get("operationType", "unknown"), status).inc()
+    cluster_time = change.get("clusterTime")  # bson Timestamp of the write
+    if cluster_time is not None:
+        WATCHER_EVENT_LAG_SECONDS.observe(max(0.0, time.time() - cluster_time.time))
+        WATCHER_LAST_EVENT_TIMESTAMP.set(cluster_time.time)
+
+    with _status_lock:
+        _status[f"events_{status}"] = _status.get(f"events_{status}", 0) + 1
+        _status["last_event_processed_at"] = time.time()
+        _status["last_event_cluster_time"] = cluster_time.time if cluster_time is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Status file (read by the API's /health/deep)
+# ---------------------------------------------------------------------------
+
+_status: dict = {
+    "state": "starting",  # starting | full_sync | watching | reconnecting | stopped
+    "pid": None,
+    "started_at": None,
+    "events_ok": 0,
+    "events_error": 0,
+    "last_event_cluster_time": None,
+    "last_event_processed_at": None,
+}
+_status_lock = threading.Lock()
+
+
+def _publish_status(**changes) -> None:
+    with _status_lock:
+        _status.update(changes)
+        snapshot = dict(_status)
+    try:
+        write_watcher_status(snapshot)
+    except OSError as e:
+        logger.warning("Cannot write watcher status %s: %s", settings.watcher_status_path, e)
+
+
+def _heartbeat() -> None:
+    """Rewrite the status file periodically so a hung watcher shows up as stale."""
+    while _running:
+        time.sleep(settings.watcher_status_interval_sec)
+        _publish_status()
+
+
 # ---------------------------------------------------------------------------
 # Watch loop with reconnection
 # ---------------------------------------------------------------------------
@@ -251,6 +315,7 @@ def watch_loop() -> None:
                 logger.info("Watching collection %s.%s …",
                             settings.mongo_db, settings.mongo_collection)
                 backoff = 1  # reset on successful connection
+                _publish_status(state="watching")
 
                 for change in stream:
                     if not _running:
@@ -258,8 +323,10 @@ def watch_loop() -> None:
 
                     try:
                         _handle_change(change)
+                        _record_event(change, "ok")
                     except Exception:
                         logger.exception("Error handling change event:")
+                        _record_event(change, "error")
 
                     # Persist resume token after every event
                     token = stream.resume_token
@@ -269,6 +336,7 @@ def watch_loop() -> None:
         except PyMongoError as e:
             if not _running:
                 break
+            _publish_status(state="reconnecting")
             logger.error("MongoDB connection error: %s", e)
             logger.info("Reconnecting in %ds …", backoff)
             time.sleep(backoff)
@@ -277,10 +345,12 @@ def watch_loop() -> None:
         except Exception:
             if not _running:
                 break
+            _publish_status(state="reconnecting")
             logger.exception("Unexpected error in watch loop:")
             time.sleep(backoff)
             backoff = min(backoff * 2, max_backoff)
 
+    _publish_status(state="stopped")
     logger.info("Watcher stopped.")
 
 
@@ -305,6 +375,13 @@ def main():
     if args.reset_token:
         _clear_token()
 
+    if settings.watcher_metrics_port:
+        start_exporter(settings.watcher_metrics_port)
+        logger.info("Metrics exporter on port %d", settings.watcher_metrics_port)
+
+    _publish_status(state="starting", pid=os.getpid(), started_at=time.time())
+    threading.Thread(target=_heartbeat, name="watcher-heartbeat", daemon=True).start()
+
     # Test MongoDB connection
     try:
         client = get_mongo_client()
@@ -322,8 +399,10 @@ def main():
         sys.exit(1)
 
     if args.full_sync or args.full_sync_only:
+        _publish_status(state="full_sync")
         full_sync()
         if args.full_sync_only:
+            _publish_status(state="stopped")
             return
 
     watch_loop()
@@ -0,0 +1,232 @@
+"""Reconcile the Milvus collections with MongoDB.
+
+The watcher cannot clean up documents deleted without a pre-image, and missed
+events leave rows stale or missing.  Instead of re-embedding the whole corpus
+(POST /v1/videos/sync-all), this job diffs both sides and repairs only the
+drift:
+
+  MongoDB  completed documents, fetched with SOURCE_PROJECTION only, are
+           transformed and digested (src.sync_utils.source_digest);
+  Milvus   query_iterator over the primary key and source_digest.
+
+  missing  in MongoDB, not in Milvus                   -> re-synced
+  changed  digest differs, or was never stored         -> re-synced
+  orphans  in Milvus with a digest, not in MongoDB     -> deleted
+
+Rows without a digest that are not in MongoDB ("unsourced") were ingested
+through the API or written before digests existed; they are only reported
+unless --delete-unsourced is given.  Collections without the source_digest
+field (Milvus < 2.6, see ensure_source_digest_field) are compared by id only.
+Documents whose status is no longer "completed" count as absent, as in a full
+sync.
+
+Usage:
+    python -m scripts.reconcile --dry-run                   # report only
+    python -m scripts.reconcile                             # repair scenes and contents
+    python -m scripts.reconcile --collection contents --delete-unsourced
+"""
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from src.config import settings
+from src.sync_utils import (
+    SOURCE_DIGEST_FIELD,
+    SOURCE_PROJECTION,
+    source_digest,
+    sync_delete_contents,
+    sync_delete_scenes,
+    sync_upsert_contents,
+    sync_upsert_scenes,
+    transform_mongo_doc,
+    transform_mongo_doc_to_content,
+)
+
+logger = logging.getLogger("reconcile")
+
+RESYNC_DOCS_PER_BATCH = 100
+
+
+@dataclass
+class Diff:
+    missing: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    orphans: list[str] = field(default_factory=list)
+    unsourced_orphans: list[str] = field(default_factory=list)
+
+    def summary(self, sample: int) -> dict:
+        return {
+            name: {"count": len(ids), "sample": sorted(ids)[:sample]}
+            for name, ids in vars(self).items()
+        }
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ---------------------------------------------------------------------------
+# Both sides: id -> digest
+# ---------------------------------------------------------------------------
+
+def mongo_state(col, batch_size: int = 1000) -> tuple[dict[str, tuple], dict[str, tuple]]:
+    """{scene_id: (digest, doc _id)} and {content_id: (digest, doc _id)} of completed documents."""
+    scenes, contents = {}, {}
+    for doc in col.find({"status": "completed"}, SOURCE_PROJECTION, batch_size=batch_size):
+        for scene in transform_mongo_doc(doc):
+            scenes[scene["scene_id"]] = (source_digest(scene), doc["_id"])
+        content = transform_mongo_doc_to_content(doc)
+        if content:
+            contents[content["content_id"]] = (source_digest(content), doc["_id"])
+    return scenes, contents
+
+
+def milvus_state(
+    client, collection_name: str, primary_key: str, with_digest: bool, batch_size: int = 1000,
+) -> dict[str, str | None]:
+    """{primary key: source_digest or None} of every row, streamed page by page."""
+    output_fields = [primary_key, SOURCE_DIGEST_FIELD] if with_digest else [primary_key]
+    iterator = client.query_iterator(
+        collection_name=collection_name, batch_size=batch_size, output_fields=output_fields,
+    )
+    rows = {}
+    try:
+        while batch := iterator.next():
+            for row in batch:
+                rows[row[primary_key]] = row.get(SOURCE_DIGEST_FIELD)
+    finally:
+        iterator.close()
+    return rows
+
+
+def diff(source: dict[str, tuple], target: dict[str, str | None], compare_digests: bool = True) -> Diff:
+    result = Diff()
+    for key, (digest, _) in source.items():
+        if key not in target:
+            result.missing.append(key)
+        elif compare_digests and target[key] != digest:
+            result.changed.append(key)
+    for key, digest in target.items():
+        if key not in source:
+            (result.orphans if digest else result.unsourced_orphans).append(key)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Repair
+# ---------------------------------------------------------------------------
+
+def delete_orphans(kind: str, ids: list[str], batch_size: int = 1000) -> int:
+    deleted = 0
+    for chunk in _chunks(ids, batch_size):
+        if kind == "scenes":
+            deleted += sync_delete_scenes(chunk)
+        else:
+            deleted += sync_delete_contents(chunk)
+    return deleted
+
+
+def resync(col, scene_ids: dict[str, tuple], content_ids: dict[str, tuple]) -> tuple[int, int]:
+    """
+    Re-sync the given {id: (digest, doc _id)} items from their MongoDB documents.
+
+    Only the listed scenes of each document are embedded and upserted, one
+    batch of scenes and one of contents per RESYNC_DOCS_PER_BATCH documents.
+    Returns (scenes, contents) synced.
+    """
+    doc_ids = list({doc_id for _, doc_id in scene_ids.values()} | {doc_id for _, doc_id in content_ids.values()})
+    synced_scenes = synced_contents = 0
+    for chunk in _chunks(doc_ids, RESYNC_DOCS_PER_BATCH):
+        scenes, contents = [], []
+        for doc in col.find({"_id": {"$in": chunk}}, SOURCE_PROJECTION):
+            scenes += [s for s in transform_mongo_doc(doc) if s["scene_id"] in scene_ids]
+            content = transform_mongo_doc_to_content(doc)
+            if content and content["content_id"] in content_ids:
+                contents.append(content)
+        synced_scenes += sync_upsert_scenes(scenes)
+        synced_contents += sync_upsert_contents(contents)
+    return synced_scenes, synced_contents
+
+
+def reconcile(
+    col,
+    client,
+    kinds: list[str],
+    dry_run: bool = False,
+    delete_unsourced: bool = False,
+    batch_size: int = 1000,
+    sample: int = 20,
+) -> dict:
+    """Diff MongoDB against the Milvus collections in *kinds* and repair unless *dry_run*."""
+    from src.milvus_manager import has_source_digest
+
+    scene_source, content_source = mongo_state(col, batch_size)
+    targets = {
+        "scenes": (settings.milvus_collection_name, "scene_id", scene_source),
+        "contents": (settings.milvus_content_collection_name, "content_id", content_source),
+    }
+
+    report, to_sync = {}, {"scenes": {}, "contents": {}}
+    for kind in kinds:
+        collection_name, primary_key, source = targets[kind]
+        with_digest = has_source_digest(client, collection_name)
+        target = milvus_state(client, collection_name, primary_key, with_digest, batch_size)
+        result = diff(source, target, compare_digests=with_digest)
+        report[kind] = {
+            "collection": collection_name,
+            "mongo": len(source),
+            "milvus": len(target),
+            "digests": with_digest,
+            **result.summary(sample),
+        }
+        logger.info("%s: %d missing, %d changed, %d orphans, %d unsourced orphans", collection_name,
+                    len(result.missing), len(result.changed), len(result.orphans), len(result.unsourced_orphans))
+        if dry_run:
+            continue
+
+        orphans = result.orphans + (result.unsourced_orphans if delete_unsourced else [])
+        report[kind]["deleted"] = delete_orphans(kind, orphans, batch_size)
+        to_sync[kind] = {key: source[key] for key in result.missing + result.changed}
+
+    if not dry_run:
+        synced = dict(zip(("scenes", "contents"), resync(col, to_sync["scenes"], to_sync["contents"])))
+        for kind in kinds:
+            report[kind]["resynced"] = synced[kind]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff MongoDB against Milvus and repair the drift")
+    parser.add_argument("--collection", choices=["scenes", "contents", "all"], default="all",
+                        help="Which collection(s) to reconcile (default: all)")
+    parser.add_argument("--dry-run", action="store_true", help="Report the differences without repairing")
+    parser.add_argument("--delete-unsourced", action="store_true",
+                        help="Also delete rows without a source digest that are not in MongoDB")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Page size of the MongoDB / Milvus scans")
+    parser.add_argument("--sample", type=int, default=20, help="Ids listed per difference in the report")
+    args = parser.parse_args()
+
+    if settings.backend != "milvus":
+        parser.error("reconciliation needs MS_BACKEND=milvus")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    from src.milvus_client import get_milvus_client
+    from src.mongo_client import get_collection
+
+    kinds = ["scenes", "contents"] if args.collection == "all" else [args.collection]
+    report = reconcile(get_collection(), get_milvus_client(), kinds, dry_run=args.dry_run,
+                       delete_unsourced=args.delete_unsourced, batch_size=args.batch_size, sample=args.sample)
+    print(json.dumps(report, indent=2, ensure_ascii=False, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+bge-m3 embedding backend with learned sparse output (MS_EMBEDDING_BACKEND=bge_m3).
+
+Wraps pymilvus' BGEM3EmbeddingFunction so one forward pass yields both the
+dense vector and bge-m3's learned lexical weights.  ``encode_documents`` /
+``encode_queries`` keep the dense-only interface of the other backends; the
+``*_with_sparse`` variants return ``(dense_vectors, sparse_vectors)`` where
+each sparse vector is a ``{token_id: weight}`` dict ready for a Milvus
+SPARSE_FLOAT_VECTOR field.
+"""
+
+import numpy as np
+
+
+def csr_to_dicts(matrix) -> list[dict[int, float]]:
+    """Rows of a scipy CSR matrix as {column: value} dicts."""
+    indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+    return [
+        {int(col): float(val) for col, val in zip(indices[start:end], data[start:end])}
+        for start, end in zip(indptr[:-1], indptr[1:])
+    ]
+
+
+class BGEM3DenseSparseFunction:
+    def __init__(self, model_name: str = "BAAI/bge-m3", device: str = "cpu", batch_size: int = 32):
+        from pymilvus.model.hybrid import BGEM3EmbeddingFunction
+
+        self._fn = BGEM3EmbeddingFunction(
+            model_name=model_name,
+            batch_size=batch_size,
+            device=device,
+            use_fp16=device.startswith("cuda"),
+            return_dense=True,
+            return_sparse=True,
+            return_colbert_vecs=False,
+        )
+        self.tokenizer = self._fn.model.tokenizer
+        self.dim = self._fn.dim["dense"]
+
+    @staticmethod
+    def _split(output: dict) -> tuple[list[np.ndarray], list[dict[int, float]]]:
+        return list(output["dense"]), csr_to_dicts(output["sparse"])
+
+    def encode_documents_with_sparse(self, documents: list[str]) -> tuple[list, list[dict[int, float]]]:
+        return self._split(self._fn.encode_documents(list(documents)))
+
+    def encode_queries_with_sparse(self, queries: list[str]) -> tuple[list, list[dict[int, float]]]:
+        return self._split(self._fn.encode_queries(list(queries)))
+
+    def encode_documents(self, documents: list[str]) -> list[np.ndarray]:
+        return self.encode_documents_with_sparse(documents)[0]
+
+    def encode_queries(self, queries: list[str]) -> list[np.ndarray]:
+        return self.encode_queries_with_sparse(queries)[0]
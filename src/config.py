@@ -25,13 +25,96 @@ class Settings(BaseSettings):
     mongo_db: str = "Metadata_Enrichment"
     mongo_collection: str = "video_queue"
     mongo_resume_token_path: str = "resume_token.json"
+    watcher_metrics_port: int = 9101  # Prometheus exporter of the watcher, 0 = disabled
 
     # --- Milvus settings ---
     milvus_uri: str = "http://localhost:19530"
     milvus_collection_name: str = "scenes"
     milvus_content_collection_name: str = "contents"
+    milvus_content_chunk_collection_name: str = "content_chunks"
+    # Server limit proxy.maxVectorFieldNum; raise together with the server config
+    # to enable modality vectors and learned sparse vectors at the same time.
+    milvus_max_vector_fields: int = 4
     embedding_model_name: str = "BAAI/bge-m3"
     embedding_device: str = "cpu"
+    embedding_backend: str = "sentence_transformers"  # "sentence_transformers", "onnx" or "bge_m3"
+    embedding_max_tokens: int = 8192  # token budget per document, see src/embedding.py
+    embedding_truncation: str = "head_tail"  # "head_tail" or "chunked_mean"
+    embedding_batch_size: int = 32
+
+    # --- Local model artifact (scripts/export_model.py, src/model_artifact.py) ---
+    embedding_model_path: str = ""  # safetensors export loaded instead of embedding_model_name, "" = off
+    embedding_offline: bool = False  # never contact the Hugging Face hub (implied by embedding_model_path)
+
+    # --- ONNX Runtime backend (scripts/export_onnx.py) ---
+    embedding_onnx_path: str = "models/bge-m3-onnx"
+    embedding_onnx_quantized: bool = False  # use the int8 dynamically quantized model
+    embedding_onnx_threads: int = 0  # intra-op threads, 0 = onnxruntime default
+
+    # --- Shared embedding service (scripts/embedding_service.py) ---
+    # Unix socket path, Windows named pipe (\\.\pipe\name) or host:port.
+    # Empty = load the model in every process.
+    embedding_service_address: str = ""
+    # Shared secret for the connection handshake; required, there is no default.
+    embedding_service_authkey: str = ""
+    # The server only listens on a Unix socket, named pipe or loopback address
+    # unless this is set (the connection is authenticated but not encrypted).
+    embedding_service_allow_remote: bool = False
+    embedding_service_timeout: float = 60.0
+    embedding_service_max_batch: int = 64
+    embedding_service_max_wait_ms: float = 5.0
+
+    # --- Scene modality vectors (visual_embedding, audio_embedding) ---
+    # Needs a collection drop / recreate when switched on.
+    scene_multi_vector_enabled: bool = False
+
+    # --- bge-m3 learned sparse vectors (needs MS_EMBEDDING_BACKEND=bge_m3) ---
+    # Adds learned_sparse_embedding to scenes and contents; collection drop / recreate.
+    learned_sparse_enabled: bool = False
+
+    # --- BM25 text analysis (src/text_analysis.py) ---
+    # Changing these needs a collection drop / recreate and a full re-sync.
+    bm25_word_segmenter: str = "none"  # "none", "pyvi" or "underthesea"
+    bm25_fold_diacritics: bool = False
+    bm25_stopwords: str = ""  # "", "vi" (built-in list) or path to a stopword file
+
+    # --- Search profiling (profile=true, src/profiling.py) ---
+    profile_dump_sample_rate: float = 0.0  # share of profiled requests that also write a cProfile dump
+    profile_dump_dir: str = "profiles"
+
+    # --- Health checks (/ready, /health/deep, src/health.py) ---
+    health_timeout_sec: float = 2.0  # per backend call
+    watcher_status_path: str = "watcher_status.json"  # written by the watcher, read by /health/deep
+    watcher_status_interval_sec: float = 10.0  # watcher heartbeat; stale after 3 missed beats
+    watcher_max_lag_sec: float = 300.0  # event lag above this reports the watcher as degraded
+
+    # --- Query embedding cache / startup warmup (src/warmup.py) ---
+    query_embedding_cache_size: int = 4096  # LRU entries per embedding model, 0 = off
+    warmup_enabled: bool = True
+    warmup_top_queries: int = 200  # most frequent query log texts pre-embedded at startup
+    warmup_searches: int = 3  # searches per collection and search type to page in index segments
+    warmup_retry_sec: float = 30.0  # retry interval after a failed warmup
+
+    # --- Query log (src/query_log.py, replay with scripts/load_test.py) ---
+    query_log_enabled: bool = False
+    query_log_path: str = "logs/query_log.jsonl"
+    query_log_sample_rate: float = 0.1  # share of search requests logged
+    query_log_slow_ms: float = 0.0  # always log requests slower than this, 0 = off
+    query_log_max_bytes: int = 50_000_000  # rotate after this size
+    query_log_backup_count: int = 5
+    query_log_queue_size: int = 10000  # records waiting for the writer thread; more are dropped
+
+    # --- Content transcript chunks (src/content_chunks.py) ---
+    content_chunks_enabled: bool = False
+    content_chunk_chars: int = 1500  # window size over the description
+    content_chunk_overlap: int = 200
+    content_chunk_group_size: int = 3  # chunk hits pooled per content at search time
+
+    # --- Async ingest jobs ---
+    ingest_job_workers: int = 1  # worker threads sharing the embedding model
+    ingest_job_batch_size: int = 256  # items per embedding / upsert call
+    ingest_job_retention: int = 1000  # finished jobs kept for status polling
+    ingest_job_shutdown_timeout_sec: float = 30.0  # drain queued jobs on shutdown, then log the rest
 
     model_config = {"env_prefix": "MS_", "env_file": ".env"}
 
@@ -0,0 +1,129 @@
+"""
+Chunked transcript embeddings for contents (MS_CONTENT_CHUNKS_ENABLED).
+
+The content vector covers title + description + tags as one input, so a long
+audio transcription is mostly truncated away.  Here the description is split
+into overlapping character windows; each window (prefixed with the title for
+context) gets its own vector in the content_chunks collection, together with
+its offsets into the description and the content's filter fields.
+Content search then pools chunk hits per content_id (see milvus_queries).
+"""
+
+import json
+import logging
+
+from pymilvus import MilvusClient
+
+from src.config import settings
+from src.embedding import encode_documents
+from src.metrics import record_flush, record_ingest_batch
+
+logger = logging.getLogger(__name__)
+
+# Content fields copied onto every chunk so content filters apply to chunk search
+CHUNK_FILTER_FIELDS = [
+    "category",
+    "author",
+    "broadcast_date",
+    "program_id",
+    "content_type_id",
+    "created_at_ts",
+    "broadcast_date_ts",
+]
+
+
+def split_into_windows(text: str, window_chars: int, overlap_chars: int) -> list[tuple[int, int]]:
+    """
+    Split *text* into overlapping (start, end) windows of about *window_chars*.
+
+    Window ends are moved back to the last whitespace so words are not cut.
+    Empty text yields a single empty window so every content has one chunk.
+    """
+    text_len = len(text)
+    if text_len <= window_chars:
+        return [(0, text_len)]
+
+    step_back = max(0, min(overlap_chars, window_chars - 1))
+    windows = []
+    start = 0
+    while start < text_len:
+        end = min(start + window_chars, text_len)
+        if end < text_len:
+            cut = text.rfind(" ", start + window_chars // 2, end)
+            if cut > start:
+                end = cut
+        windows.append((start, end))
+        if end >= text_len:
+            break
+        next_start = end - step_back
+        # Start the next window on a word boundary as well
+        space = text.find(" ", next_start, end)
+        next_start = space + 1 if space != -1 else next_start
+        start = next_start if next_start > start else end
+    return windows
+
+
+def build_chunk_rows(content: dict) -> tuple[list[dict], list[str]]:
+    """Chunk rows (without embeddings) and the texts to embed for one content."""
+    description = content.get("description") or ""
+    title = content.get("title") or ""
+    rows, texts = [], []
+    windows = split_into_windows(
+        description, settings.content_chunk_chars, settings.content_chunk_overlap,
+    )
+    for i, (start, end) in enumerate(windows):
+        row = {
+            "chunk_id": f"{content['content_id']}#{i}",
+            "content_id": content["content_id"],
+            "chunk_index": i,
+            "start_char": start,
+            "end_char": end,
+        }
+        for field in CHUNK_FILTER_FIELDS:
+            row[field] = content.get(field) or (0 if field.endswith("_ts") else "")
+        rows.append(row)
+        texts.append(f"{title}\n{description[start:end]}".strip())
+    return rows, texts
+
+
+def delete_content_chunks(client: MilvusClient, content_ids: list[str], flush: bool = True) -> None:
+    if not content_ids:
+        return
+    ids_str = ", ".join(json.dumps(cid) for cid in content_ids)
+    client.delete(
+        collection_name=settings.milvus_content_chunk_collection_name,
+        filter=f"content_id in [{ids_str}]",
+    )
+    if flush:
+        client.flush(collection_name=settings.milvus_content_chunk_collection_name)
+        record_flush(settings.milvus_content_chunk_collection_name)
+
+
+def upsert_content_chunks(client: MilvusClient, embedding_fn, contents: list[dict], flush: bool = True) -> int:
+    """
+    Replace the chunks of *contents*.  Returns the number of chunks written.
+
+    Old chunks are deleted first because a shorter description produces
+    fewer chunks than before.
+    """
+    rows, texts = [], []
+    for content in contents:
+        content_rows, content_texts = build_chunk_rows(content)
+        rows.extend(content_rows)
+        texts.extend(content_texts)
+
+    delete_content_chunks(client, [c["content_id"] for c in contents], flush=False)
+    if not rows:
+        return 0
+
+    vectors = encode_documents(embedding_fn, texts)
+    for row, vector in zip(rows, vectors):
+        row["embedding"] = vector
+
+    client.insert(collection_name=settings.milvus_content_chunk_collection_name, data=rows)
+    record_ingest_batch(settings.milvus_content_chunk_collection_name, len(rows))
+    if flush:
+        client.flush(collection_name=settings.milvus_content_chunk_collection_name)
+        record_flush(settings.milvus_content_chunk_collection_name)
+    logger.info("Milvus content chunks: %d chunks for %d contents", len(rows), len(contents))
+    return len(rows)
@@ -0,0 +1,177 @@
+"""
+Document embedding preprocessing.
+
+Before calling the model, texts are measured in tokens and every item is
+brought within a token budget (MS_EMBEDDING_MAX_TOKENS):
+
+- ``head_tail``:    keep the first and last halves of the budget.
+- ``chunked_mean``: split into budget-sized chunks, embed each and average
+                    the chunk vectors (weighted by token count).
+
+The resulting pieces are sorted by token length and encoded in batches of
+similar length, so one long transcript no longer pads a whole batch, and the
+vectors are returned in the original order.
+"""
+
+import numpy as np
+
+from src.config import settings
+from src.metrics import observe_embedding
+
+TRUNCATION_MODES = ("head_tail", "chunked_mean")
+_SPECIAL_TOKENS = 2  # <s> ... </s>
+
+
+def get_tokenizer(embedding_fn):
+    """Tokenizer of a local embedding function, or None (e.g. the remote service)."""
+    tokenizer = getattr(embedding_fn, "tokenizer", None)
+    if tokenizer is None:
+        tokenizer = getattr(getattr(embedding_fn, "model", None), "tokenizer", None)
+    return tokenizer
+
+
+def _slice_text(text: str, tokenizer, ids: list[int], offsets, start: int, end: int) -> str:
+    if offsets is not None:
+        return text[offsets[start][0]:offsets[end - 1][1]]
+    return tokenizer.decode(ids[start:end])
+
+
+def split_to_budget(texts: list[str], tokenizer, max_tokens: int, mode: str) -> list[list[tuple[str, int]]]:
+    """Return, for every text, the pieces to embed as (text, token_count)."""
+    if mode not in TRUNCATION_MODES:
+        raise ValueError(f"Unknown truncation mode: {mode}")
+    budget = max(1, max_tokens - _SPECIAL_TOKENS)
+    use_offsets = bool(getattr(tokenizer, "is_fast", False))
+    encoded = tokenizer(texts, add_special_tokens=False, return_offsets_mapping=use_offsets)
+
+    result = []
+    for i, text in enumerate(texts):
+        ids = encoded["input_ids"][i]
+        offsets = encoded["offset_mapping"][i] if use_offsets else None
+        n = len(ids)
+        if n <= budget:
+            result.append([(text, n)])
+        elif mode == "head_tail":
+            head = budget - budget // 2
+            tail = budget // 2
+            pieces = _slice_text(text, tokenizer, ids, offsets, 0, head)
+            if tail:
+                pieces += " " + _slice_text(text, tokenizer, ids, offsets, n - tail, n)
+            result.append([(pieces, budget)])
+        else:
+            result.append([
+                (_slice_text(text, tokenizer, ids, offsets, start, min(start + budget, n)),
+                 min(budget, n - start))
+                for start in range(0, n, budget)
+            ])
+    return result
+
+
+def _encode_bucket(embedding_fn, texts: list[str], with_sparse: bool) -> list:
+    """Vectors for one batch; (dense, sparse) pairs when *with_sparse*."""
+    if with_sparse:
+        dense, sparse = embedding_fn.encode_documents_with_sparse(texts)
+        return list(zip(dense, sparse))
+    return embedding_fn.encode_documents(texts)
+
+
+def _merge_sparse(vectors: list[dict]) -> dict:
+    """Element-wise max of learned sparse weights (chunked_mean counterpart)."""
+    merged: dict = {}
+    for vec in vectors:
+        for token, weight in vec.items():
+            if weight > merged.get(token, 0.0):
+                merged[token] = weight
+    return merged
+
+
+def encode_documents(
+    embedding_fn,
+    texts: list[str],
+    max_tokens: int | None = None,
+    mode: str | None = None,
+    batch_size: int | None = None,
+    with_sparse: bool = False,
+):
+    """
+    Embed documents with token-budget truncation and length-bucketed batches.
+
+    Falls back to a plain ``encode_documents`` call when the embedding
+    function exposes no tokenizer (the shared embedding service applies the
+    same preprocessing on its side).
+
+    With *with_sparse* the function must provide
+    ``encode_documents_with_sparse`` (bge-m3 backend) and a
+    ``(dense_vectors, sparse_vectors)`` tuple is returned, both from the same
+    forward pass.
+    """
+    texts = list(texts)
+    with observe_embedding("documents", len(texts)):
+        return _encode_documents(embedding_fn, texts, max_tokens, mode, batch_size, with_sparse)
+
+
+def _encode_documents(
+    embedding_fn,
+    texts: list[str],
+    max_tokens: int | None,
+    mode: str | None,
+    batch_size: int | None,
+    with_sparse: bool,
+):
+    if with_sparse and not hasattr(embedding_fn, "encode_documents_with_sparse"):
+        raise RuntimeError("Learned sparse vectors need MS_EMBEDDING_BACKEND=bge_m3")
+    tokenizer = get_tokenizer(embedding_fn)
+    if tokenizer is None or not texts:
+        if with_sparse:
+            return embedding_fn.encode_documents_with_sparse(texts)
+        return embedding_fn.encode_documents(texts)
+
+    max_tokens = max_tokens or settings.embedding_max_tokens
+    mode = mode or settings.embedding_truncation
+    batch_size = batch_size or settings.embedding_batch_size
+
+    pieces = split_to_budget(texts, tokenizer, max_tokens, mode)
+    flat = [(i, piece, n) for i, item in enumerate(pieces) for piece, n in item]
+    order = sorted(range(len(flat)), key=lambda j: flat[j][2])
+
+    piece_vectors: list = [None] * len(flat)
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        vectors = _encode_bucket(embedding_fn, [flat[j][1] for j in bucket], with_sparse)
+        for j, vec in zip(bucket, vectors):
+            piece_vectors[j] = vec
+
+    dense_result: list = []
+    sparse_result: list = []
+    j = 0
+    for item in pieces:
+        item_vectors = piece_vectors[j:j + len(item)]
+        if with_sparse:
+            sparse_result.append(_merge_sparse([s for _, s in item_vectors]))
+            item_vectors = [d for d, _ in item_vectors]
+        if len(item) == 1:
+            dense_result.append(item_vectors[0])
+        else:
+            weights = np.array([n for _, n in item], dtype=np.float32)
+            stacked = np.asarray(item_vectors, dtype=np.float32)
+            mean = (stacked * weights[:, None]).sum(axis=0) / weights.sum()
+            dense_result.append(mean / max(float(np.linalg.norm(mean)), 1e-12))
+        j += len(item)
+    if with_sparse:
+        return dense_result, sparse_result
+    return dense_result
+
+
+def embed_rows(embedding_fn, rows: list[dict], texts: list[str]) -> None:
+    """
+    Set ``embedding`` on every row, plus ``learned_sparse_embedding`` when
+    MS_LEARNED_SPARSE_ENABLED (same encode call).
+    """
+    if settings.learned_sparse_enabled:
+        dense, sparse = encode_documents(embedding_fn, texts, with_sparse=True)
+        for row, d, sp in zip(rows, dense, sparse):
+            row["embedding"] = d
+            row["learned_sparse_embedding"] = sp
+        return
+    for row, d in zip(rows, encode_documents(embedding_fn, texts)):
+        row["embedding"] = d
@@ -0,0 +1,248 @@
+"""
+Shared embedding service.
+
+One process loads the embedding model and serves encode requests over a
+local socket (Unix socket path, Windows named pipe or ``host:port``), so API
+workers and the watcher do not each hold their own copy of the model.
+
+Requests from all clients are micro-batched: the batcher thread waits up to
+``max_wait_ms`` for more texts of the same kind and encodes up to
+``max_batch`` texts in one model call.
+
+Server:  python -m scripts.embedding_service
+Client:  set MS_EMBEDDING_SERVICE_ADDRESS; get_embedding_fn() then returns a
+         RemoteEmbeddingFunction instead of loading the model locally.
+
+Trust model: messages are pickled, so any peer that completes the handshake
+can run code in the other process.  Both sides therefore require an explicit
+shared secret (MS_EMBEDDING_SERVICE_AUTHKEY), and the server only listens on a
+Unix socket, named pipe or loopback address unless
+MS_EMBEDDING_SERVICE_ALLOW_REMOTE is set.  The connection is not encrypted.
+"""
+
+import ipaddress
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing.connection import Client, Connection, Listener
+
+from src.embedding import encode_documents
+
+logger = logging.getLogger(__name__)
+
+METHODS = (
+    "encode_queries",
+    "encode_documents",
+    # (dense, learned sparse) pairs, bge_m3 backend only
+    "encode_queries_with_sparse",
+    "encode_documents_with_sparse",
+)
+
+
+def parse_address(address: str) -> str | tuple[str, int]:
+    """'host:port' -> TCP tuple; anything else is a Unix socket path / named pipe."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address and "\\" not in address:
+        return host, int(port)
+    return address
+
+
+def check_authkey(authkey: bytes) -> bytes:
+    if not authkey:
+        raise ValueError(
+            "The embedding service needs a shared secret: set MS_EMBEDDING_SERVICE_AUTHKEY "
+            "to the same value for the service and its clients"
+        )
+    return authkey
+
+
+def is_local_address(address: str | tuple[str, int]) -> bool:
+    """Unix socket / named pipe, or a TCP address on the loopback interface."""
+    if isinstance(address, str):
+        return True
+    host = address[0]
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:  # other host names, "" (all interfaces)
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Request:
+    method: str
+    texts: list[str]
+    done: threading.Event = field(default_factory=threading.Event)
+    result: list | None = None
+    error: str | None = None
+
+
+class EmbeddingServer:
+    """Serve encode requests for *embedding_fn*; one thread per client connection."""
+
+    def __init__(self, embedding_fn, address: str, authkey: bytes,
+                 max_batch: int = 64, max_wait_ms: float = 5.0, allow_remote: bool = False):
+        self._embedding_fn = embedding_fn
+        self._address = parse_address(address)
+        if not allow_remote and not is_local_address(self._address):
+            raise ValueError(
+                f"Refusing to listen on {address}: use a Unix socket, named pipe or loopback address, "
+                "or set MS_EMBEDDING_SERVICE_ALLOW_REMOTE=true on a trusted network"
+            )
+        self._authkey = check_authkey(authkey)
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000
+        self._requests: queue.Queue[_Request] = queue.Queue()
+        self._dim = getattr(embedding_fn, "dim", None)
+
+    def serve_forever(self) -> None:
+        if isinstance(self._address, str) and os.path.exists(self._address):
+            os.unlink(self._address)  # stale socket from a previous run
+        threading.Thread(target=self._batcher, name="embedding-batcher", daemon=True).start()
+        with Listener(self._address, authkey=self._authkey) as listener:
+            logger.info(f"Embedding service listening on {self._address}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:  # failed handshake, bad authkey ...
+                    logger.warning(f"Rejected connection: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: Connection) -> None:
+        with conn:
+            while True:
+                try:
+                    method, texts = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if method == "info":
+                    conn.send(("ok", {"dim": self._dim}))
+                    continue
+                if method not in METHODS:
+                    conn.send(("error", f"Unknown method: {method}"))
+                    continue
+                req = _Request(method, list(texts))
+                self._requests.put(req)
+                req.done.wait()
+                conn.send(("error", req.error) if req.error else ("ok", req.result))
+
+    def _batcher(self) -> None:
+        pending: _Request | None = None
+        while True:
+            first = pending or self._requests.get()
+            pending = None
+            batch = [first]
+            size = len(first.texts)
+            deadline = time.monotonic() + self._max_wait
+            while size < self._max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    req = self._requests.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if req.method != first.method:
+                    pending = req
+                    break
+                batch.append(req)
+                size += len(req.texts)
+            self._encode(first.method, batch)
+
+    def _encode(self, method: str, batch: list[_Request]) -> None:
+        texts = [t for req in batch for t in req.texts]
+        try:
+            if method == "encode_documents":
+                vectors = encode_documents(self._embedding_fn, texts)
+            elif method == "encode_documents_with_sparse":
+                vectors = list(zip(*encode_documents(self._embedding_fn, texts, with_sparse=True)))
+            elif method == "encode_queries_with_sparse":
+                vectors = list(zip(*self._embedding_fn.encode_queries_with_sparse(texts))) if texts else []
+            else:
+                vectors = self._embedding_fn.encode_queries(texts) if texts else []
+        except Exception as e:
+            logger.exception(f"{method} failed for {len(texts)} texts")
+            for req in batch:
+                req.error = str(e)
+                req.done.set()
+            return
+        offset = 0
+        for req in batch:
+            req.result = list(vectors[offset:offset + len(req.texts)])
+            offset += len(req.texts)
+            req.done.set()
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+class RemoteEmbeddingFunction:
+    """Drop-in replacement for the local embedding function backed by the service."""
+
+    def __init__(self, address: str, authkey: bytes, timeout: float = 60.0):
+        self._address = parse_address(address)
+        self._authkey = check_authkey(authkey)
+        self._timeout = timeout
+        self._local = threading.local()  # Connection objects are not thread-safe
+        self._dim: int | None = None
+
+    def _conn(self) -> Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self._address, authkey=self._authkey)
+            self._local.conn = conn
+        return conn
+
+    def _call(self, method: str, texts: list[str]):
+        for attempt in range(2):
+            conn = self._conn()
+            try:
+                conn.send((method, texts))
+                if not conn.poll(self._timeout):
+                    # Drop the connection so a late answer is not read by the next call
+                    self._local.conn = None
+                    conn.close()
+                    raise TimeoutError(f"Embedding service did not answer within {self._timeout}s")
+                status, payload = conn.recv()
+                break
+            except (EOFError, ConnectionError):
+                # Service restarted: reconnect once and retry
+                self._local.conn = None
+                conn.close()
+                if attempt:
+                    raise
+        if status != "ok":
+            raise RuntimeError(f"Embedding service error: {payload}")
+        return payload
+
+    def encode_queries(self, queries: list[str]) -> list:
+        return self._call("encode_queries", list(queries))
+
+    def encode_documents(self, documents: list[str]) -> list:
+        return self._call("encode_documents", list(documents))
+
+    def _call_with_sparse(self, method: str, texts: list[str]) -> tuple[list, list]:
+        pairs = self._call(method, texts)
+        return [d for d, _ in pairs], [sp for _, sp in pairs]
+
+    def encode_queries_with_sparse(self, queries: list[str]) -> tuple[list, list]:
+        return self._call_with_sparse("encode_queries_with_sparse", list(queries))
+
+    def encode_documents_with_sparse(self, documents: list[str]) -> tuple[list, list]:
+        return self._call_with_sparse("encode_documents_with_sparse", list(documents))
+
+    @property
+    def dim(self) -> int | None:
+        if self._dim is None:
+            self._dim = self._call("info", [])["dim"]
+        return self._dim
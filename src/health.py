@@ -0,0 +1,218 @@
+"""
+Backend health for load balancers and operators.
+
+  GET /ready        — readiness: warmup done, backend reachable, collections
+                      (or the index) loaded and the embedding model in memory.
+                      503 otherwise, so load balancers stop routing to cold or
+                      broken instances.
+  GET /health/deep  — the same checks plus row counts and the Mongo watcher
+                      status; "ok", "degraded" (serves requests, something needs
+                      attention) or "down" (503).
+
+/health stays a plain liveness probe that never touches a backend.
+
+The watcher (scripts/mongo_watcher.py) runs in its own process and publishes
+its state to MS_WATCHER_STATUS_PATH; the API only sees it when both share a
+filesystem, otherwise the watcher section is null.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from src.config import settings
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+# ---------------------------------------------------------------------------
+# Vector backends
+# ---------------------------------------------------------------------------
+
+def expected_collections() -> list[str]:
+    names = [settings.milvus_collection_name, settings.milvus_content_collection_name]
+    if settings.content_chunks_enabled:
+        names.append(settings.milvus_content_chunk_collection_name)
+    return names
+
+
+def milvus_health(include_counts: bool = False) -> dict:
+    """Reachability, latency and load state of every collection the API searches."""
+    from src.milvus_client import get_milvus_client
+
+    timeout = settings.health_timeout_sec
+    client = get_milvus_client()
+    start = time.perf_counter()
+    existing = set(client.list_collections(timeout=timeout))
+    latency_ms = _elapsed_ms(start)
+
+    collections = {}
+    for name in expected_collections():
+        if name not in existing:
+            collections[name] = {"exists": False, "load_state": None, "loaded": False}
+            continue
+        load_state = client.get_load_state(name, timeout=timeout)["state"]
+        load_state = getattr(load_state, "name", str(load_state))  # LoadState enum
+        collections[name] = {"exists": True, "load_state": load_state, "loaded": load_state == "Loaded"}
+        if include_counts:
+            collections[name]["row_count"] = client.get_collection_stats(name, timeout=timeout)["row_count"]
+
+    return {
+        "backend": "milvus",
+        "reachable": True,
+        "latency_ms": latency_ms,
+        "collections": collections,
+        "ok": all(c["loaded"] for c in collections.values()),
+    }
+
+
+def opensearch_health(include_counts: bool = False) -> dict:
+    """Reachability, latency and cluster status, plus the scene index."""
+    from src.opensearch_client import get_client
+
+    timeout = settings.health_timeout_sec
+    client = get_client()
+    start = time.perf_counter()
+    cluster = client.cluster.health(request_timeout=timeout)
+    latency_ms = _elapsed_ms(start)
+
+    index = {"exists": client.indices.exists(index=settings.index_name, request_timeout=timeout)}
+    if include_counts and index["exists"]:
+        index["doc_count"] = client.count(index=settings.index_name, request_timeout=timeout)["count"]
+
+    return {
+        "backend": "opensearch",
+        "reachable": True,
+        "latency_ms": latency_ms,
+        "cluster_status": cluster["status"],
+        "indices": {settings.index_name: index},
+        "ok": index["exists"] and cluster["status"] != "red",
+    }
+
+
+def backend_health(include_counts: bool = False) -> dict:
+    """Health of the configured backend; connection errors become reachable=False."""
+    check = milvus_health if settings.backend == "milvus" else opensearch_health
+    start = time.perf_counter()
+    try:
+        return check(include_counts)
+    except Exception as e:
+        return {
+            "backend": settings.backend,
+            "reachable": False,
+            "latency_ms": _elapsed_ms(start),
+            "error": str(e),
+            "ok": False,
+        }
+
+
+def embedding_health() -> dict | None:
+    """Whether the query embedding model is loaded (None with OpenSearch, which embeds itself)."""
+    if settings.backend != "milvus":
+        return None
+    from src.milvus_client import embedding_fn_loaded
+
+    loaded = embedding_fn_loaded()
+    return {
+        "model": settings.embedding_model_path or settings.embedding_model_name,
+        "backend": settings.embedding_backend,
+        "remote": bool(settings.embedding_service_address),
+        "loaded": loaded,
+        "ok": loaded,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Mongo watcher status file
+# ---------------------------------------------------------------------------
+
+def write_watcher_status(status: dict, path: str | None = None) -> None:
+    """Atomically replace the watcher status file (readers never see a partial file)."""
+    path = Path(path or settings.watcher_status_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({**status, "updated_at": time.time()}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def read_watcher_status(path: str | None = None) -> dict | None:
+    try:
+        return json.loads(Path(path or settings.watcher_status_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def watcher_health(now: float | None = None) -> dict | None:
+    """Watcher status with heartbeat age and event lag; None without a status file."""
+    status = read_watcher_status()
+    if status is None:
+        return None
+    now = now or time.time()
+
+    heartbeat_age = now - status.get("updated_at", 0.0)
+    cluster_time = status.get("last_event_cluster_time")
+    processed_at = status.get("last_event_processed_at")
+    # Lag of the last event: MongoDB write -> vector DB upsert done
+    lag = max(0.0, processed_at - cluster_time) if cluster_time and processed_at else None
+    stale = heartbeat_age > 3 * settings.watcher_status_interval_sec
+
+    return {
+        **status,
+        "heartbeat_age_sec": round(heartbeat_age, 3),
+        "event_lag_sec": lag,
+        "stale": stale,
+        "ok": (not stale and status.get("state") != "stopped"
+               and (lag is None or lag <= settings.watcher_max_lag_sec)),
+    }
+
+
+# ---------------------------------------------------------------------------
+# /ready and /health/deep
+# ---------------------------------------------------------------------------
+
+def readiness() -> tuple[bool, dict]:
+    """(ready, report) for GET /ready."""
+    from src import warmup
+
+    backend = backend_health()
+    embedding = embedding_health()
+    if not warmup.state.ready:
+        status = "warming_up"
+    elif not backend["ok"] or (embedding is not None and not embedding["ok"]):
+        status = "unavailable"
+    else:
+        status = "ready"
+
+    report = {"status": status, "warmup": warmup.state.to_dict(), "backend": backend}
+    if embedding is not None:
+        report["embedding"] = embedding
+    return status == "ready", report
+
+
+def deep_health() -> dict:
+    """Full report for GET /health/deep; status ok | degraded | down."""
+    from src import warmup
+
+    backend = backend_health(include_counts=True)
+    embedding = embedding_health()
+    watcher = watcher_health()
+
+    if not backend["ok"]:
+        status = "down"
+    elif (not warmup.state.ready
+          or (embedding is not None and not embedding["ok"])
+          or (watcher is not None and not watcher["ok"])):
+        status = "degraded"
+    else:
+        status = "ok"
+
+    return {
+        "status": status,
+        "backend": backend,
+        "embedding": embedding,
+        "warmup": warmup.state.to_dict(),
+        "watcher": watcher,
+    }
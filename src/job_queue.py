@@ -0,0 +1,242 @@
+"""
+In-process ingest job queue.
+
+Ingest requests are split into tasks and put on a queue; background worker
+threads drain it, coalescing tasks of the same kind (across jobs) into one
+large batch per handler call so the embedding model always runs on full
+batches.  Job progress is kept in memory and can be polled by job id.
+"""
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+_STOP = object()  # worker shutdown sentinel
+
+
+@dataclass
+class Job:
+    job_id: str
+    kind: str
+    total: int
+    status: str = JOB_QUEUED
+    processed: int = 0
+    indexed: int = 0
+    errors: list[str] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one handler call: items indexed and errors by position in the batch."""
+    indexed: int
+    failed: dict[int, str] = field(default_factory=dict)
+
+
+@dataclass
+class _Task:
+    job: Job
+    items: list
+
+
+class JobQueue:
+    """
+    Args:
+        handlers: kind -> callable(items) that indexes one batch and returns
+            the number of items indexed, or a BatchResult naming the failed
+            items (None counts as all indexed).  A bare count short of the
+            batch marks its last items failed.  Raise to mark every item of
+            the batch as failed.
+        finalizers: kind -> callable() run once the queue is drained after a
+            batch of that kind (e.g. a Milvus flush).
+        workers: number of worker threads.
+        batch_size: max items per handler call.
+        retention: number of finished jobs kept for status polling.
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, Callable[[list], object]],
+        finalizers: dict[str, Callable[[], None]] | None = None,
+        workers: int = 1,
+        batch_size: int = 256,
+        retention: int = 1000,
+    ):
+        self._handlers = handlers
+        self._finalizers = finalizers or {}
+        self._workers = max(1, workers)
+        self._batch_size = max(1, batch_size)
+        self._retention = retention
+        self._queue: queue.Queue = queue.Queue()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._dirty: set[str] = set()
+
+    # -- public API ---------------------------------------------------------
+
+    def submit(self, kind: str, items: list) -> Job:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = Job(job_id=uuid.uuid4().hex, kind=kind, total=len(items))
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict_finished()
+            if not self._threads:
+                self._start()
+        for i in range(0, len(items), self._batch_size):
+            self._queue.put(_Task(job, items[i:i + self._batch_size]))
+        if not items:
+            with self._lock:
+                self._finish(job)
+        return job
+
+    def get(self, job_id: str) -> dict | None:
+        """Return a snapshot of the job, or None if unknown / evicted."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {**job.__dict__, "errors": list(job.errors)}
+
+    def shutdown(self, wait: bool = True, timeout: float | None = None) -> list[str]:
+        """
+        Stop the workers after the tasks already queued (drain).
+
+        With *wait*, block up to *timeout* seconds in total.  Returns (and
+        logs) the ids of jobs left unfinished, whose remaining items are lost
+        with the process.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        if not wait:
+            return []
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for t in threads:
+            t.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        with self._lock:
+            unfinished = [job_id for job_id, job in self._jobs.items() if job.finished_at is None]
+        if unfinished:
+            logger.warning(f"Ingest queue shut down with {len(unfinished)} unfinished jobs: {', '.join(unfinished)}")
+        return unfinished
+
+    # -- internals ----------------------------------------------------------
+
+    def _start(self) -> None:
+        for i in range(self._workers):
+            t = threading.Thread(target=self._worker, name=f"ingest-job-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _evict_finished(self) -> None:
+        excess = len(self._jobs) - self._retention
+        if excess <= 0:
+            return
+        for job_id in [j.job_id for j in self._jobs.values() if j.finished_at is not None][:excess]:
+            del self._jobs[job_id]
+
+    def _collect_batch(self, first: _Task) -> tuple[list[_Task], object | None]:
+        """
+        Coalesce queued tasks of the same kind into one batch (non-blocking).
+
+        Returns the batch and the first dequeued entry that did not fit
+        (a task of another kind or the stop sentinel), to be handled next.
+        """
+        tasks = [first]
+        size = len(first.items)
+        while size < self._batch_size:
+            try:
+                task = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if task is _STOP or task.job.kind != first.job.kind:
+                return tasks, task
+            tasks.append(task)
+            size += len(task.items)
+        return tasks, None
+
+    def _worker(self) -> None:
+        pending = None
+        while True:
+            task = pending if pending is not None else self._queue.get()
+            pending = None
+            if task is _STOP:
+                self._run_finalizers()  # flush what was indexed before shutdown
+                return
+            tasks, pending = self._collect_batch(task)
+            self._run_batch(task.job.kind, tasks)
+            if pending is None and self._queue.empty():
+                self._run_finalizers()
+
+    def _run_batch(self, kind: str, tasks: list[_Task]) -> None:
+        items = [item for t in tasks for item in t.items]
+        now = time.time()
+        with self._lock:
+            for t in tasks:
+                if t.job.status == JOB_QUEUED:
+                    t.job.status = JOB_RUNNING
+                    t.job.started_at = now
+        try:
+            result = self._batch_result(self._handlers[kind](items), len(items))
+        except Exception as e:
+            logger.exception(f"Ingest batch of {len(items)} {kind} failed")
+            result = BatchResult(0, {i: str(e) for i in range(len(items))})
+        with self._lock:
+            if result.indexed:
+                self._dirty.add(kind)
+            offset = 0
+            for t in tasks:
+                errors = [result.failed[i] for i in range(offset, offset + len(t.items)) if i in result.failed]
+                offset += len(t.items)
+                t.job.processed += len(t.items)
+                t.job.indexed += len(t.items) - len(errors)
+                if errors and len(set(errors)) == 1:
+                    t.job.errors.append(f"{len(errors)} items failed: {errors[0]}")
+                else:
+                    t.job.errors.extend(errors)
+                if t.job.processed >= t.job.total:
+                    self._finish(t.job)
+
+    @staticmethod
+    def _batch_result(outcome, size: int) -> BatchResult:
+        if outcome is None:
+            return BatchResult(size)
+        if isinstance(outcome, BatchResult):
+            return outcome
+        # A bare count: the items beyond it are failed
+        indexed = min(int(outcome), size)
+        return BatchResult(indexed, {i: f"not indexed ({indexed} of {size} in batch)" for i in range(indexed, size)})
+
+    def _run_finalizers(self) -> None:
+        with self._lock:
+            kinds, self._dirty = self._dirty, set()
+        for kind in kinds:
+            finalize = self._finalizers.get(kind)
+            if finalize is None:
+                continue
+            try:
+                finalize()
+            except Exception as e:
+                logger.warning(f"Finalizer for {kind} failed: {e}")
+
+    @staticmethod
+    def _finish(job: Job) -> None:
+        """Mark *job* finished.  Caller must hold the lock."""
+        job.status = JOB_FAILED if job.errors and job.indexed == 0 else JOB_COMPLETED
+        job.finished_at = time.time()
@@ -0,0 +1,123 @@
+"""
+Prometheus metrics.
+
+The API exposes them on GET /metrics; the watcher, which has no HTTP server,
+starts its own exporter on MS_WATCHER_METRICS_PORT.  With several uvicorn
+workers set PROMETHEUS_MULTIPROC_DIR so /metrics aggregates all processes.
+
+Search latency is split into stages (observe_stage), e.g.:
+    encode_queries, milvus_search, milvus_hybrid_search, milvus_query,
+    parse_hits, fusion, facets, serialize
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+from src.profiling import current_profile
+
+_NAMESPACE = "ms"
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_BATCH_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route", "status"], namespace=_NAMESPACE, buckets=_LATENCY_BUCKETS,
+)
+SEARCH_STAGE_SECONDS = Histogram(
+    "search_stage_duration_seconds", "Time spent per search stage",
+    ["stage"], namespace=_NAMESPACE, buckets=_LATENCY_BUCKETS,
+)
+EMBED_SECONDS = Histogram(
+    "embed_duration_seconds", "Embedding call latency",
+    ["kind"], namespace=_NAMESPACE, buckets=_LATENCY_BUCKETS,
+)
+EMBED_TEXTS = Counter("embed_texts", "Texts embedded", ["kind"], namespace=_NAMESPACE)
+INGEST_BATCH_ROWS = Histogram(
+    "ingest_batch_rows", "Rows per ingest / sync upsert batch",
+    ["collection"], namespace=_NAMESPACE, buckets=_BATCH_BUCKETS,
+)
+INGEST_ROWS = Counter("ingest_rows", "Rows upserted", ["collection"], namespace=_NAMESPACE)
+MILVUS_FLUSHES = Counter("milvus_flushes", "Milvus flush calls", ["collection"], namespace=_NAMESPACE)
+CACHE_REQUESTS = Counter("cache_requests", "Cache lookups by result (hit / miss)", ["cache", "result"],
+                         namespace=_NAMESPACE)
+QUERY_LOG_DROPPED = Counter("query_log_dropped", "Query log records dropped on a full queue", namespace=_NAMESPACE)
+
+# Watcher (scripts/mongo_watcher.py)
+WATCHER_EVENTS = Counter("watcher_events", "Change stream events handled", ["operation", "status"],
+                         namespace=_NAMESPACE)
+WATCHER_EVENT_LAG_SECONDS = Histogram(
+    "watcher_event_lag_seconds", "Delay between the MongoDB write and its processing",
+    namespace=_NAMESPACE, buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600),
+)
+WATCHER_LAST_EVENT_TIMESTAMP = Gauge(
+    "watcher_last_event_timestamp_seconds", "Cluster time of the last processed event",
+    namespace=_NAMESPACE, multiprocess_mode="max",
+)
+
+
+@contextmanager
+def observe_stage(stage: str):
+    """
+    Time a search stage; usable as ``with`` block or decorator.
+
+    The time is also added to the request's profile when profile=true.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        SEARCH_STAGE_SECONDS.labels(stage).observe(elapsed)
+        profile = current_profile()
+        if profile is not None:
+            profile.add_stage(stage, elapsed)
+
+
+@contextmanager
+def observe_embedding(kind: str, count: int):
+    """Time one embedding call of *count* texts (kind: documents | queries)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        EMBED_SECONDS.labels(kind).observe(time.perf_counter() - start)
+        EMBED_TEXTS.labels(kind).inc(count)
+
+
+def record_ingest_batch(collection: str, rows: int) -> None:
+    INGEST_BATCH_ROWS.labels(collection).observe(rows)
+    INGEST_ROWS.labels(collection).inc(rows)
+
+
+def record_flush(collection: str) -> None:
+    MILVUS_FLUSHES.labels(collection).inc()
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Exposition payload and content type for GET /metrics."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def start_exporter(port: int) -> None:
+    """Serve /metrics of this process on *port* (standalone processes such as the watcher)."""
+    start_http_server(port)
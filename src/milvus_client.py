@@ -1,24 +1,92 @@
-from pymilvus import MilvusClient
-from pymilvus import model
+"""
+Process-wide Milvus client and embedding function.
+
+pymilvus and the embedding stack (pymilvus.model pulls in transformers / torch)
+are imported on first use, so importing this module — and the API, scripts and
+tests that do — stays cheap for the OpenSearch backend and for tools that
+never embed.
+"""
+
+from typing import TYPE_CHECKING
 
 from src.config import settings
 
-_client: MilvusClient | None = None
+if TYPE_CHECKING:
+    from pymilvus import MilvusClient
+
+_client: "MilvusClient | None" = None
 _embedding_fn = None
 
 
-def get_milvus_client() -> MilvusClient:
+def get_milvus_client() -> "MilvusClient":
     global _client
     if _client is None:
+        from pymilvus import MilvusClient
+
         _client = MilvusClient(settings.milvus_uri)
     return _client
 
 
+def load_local_embedding_fn():
+    """
+    Load the embedding model in this process (backend from MS_EMBEDDING_BACKEND).
+
+    With MS_EMBEDDING_MODEL_PATH the model comes from the local safetensors
+    artifact without contacting the hub (src/model_artifact.py).
+    """
+    from src.model_artifact import apply_offline_mode, model_source, offline
+
+    apply_offline_mode()
+    if settings.embedding_backend == "onnx":
+        from src.onnx_embedding import OnnxEmbeddingFunction
+
+        return OnnxEmbeddingFunction(
+            settings.embedding_onnx_path,
+            quantized=settings.embedding_onnx_quantized,
+            intra_op_threads=settings.embedding_onnx_threads,
+            max_length=settings.embedding_max_tokens,
+        )
+
+    source = model_source()
+    if settings.embedding_backend == "bge_m3":
+        from src.bge_m3_embedding import BGEM3DenseSparseFunction
+
+        return BGEM3DenseSparseFunction(
+            model_name=source,
+            device=settings.embedding_device,
+            batch_size=settings.embedding_batch_size,
+        )
+    from pymilvus import model
+
+    return model.dense.SentenceTransformerEmbeddingFunction(
+        model_name=source,
+        device=settings.embedding_device,
+        local_files_only=offline(),
+    )
+
+
 def get_embedding_fn():
+    """
+    Embedding function for this process.
+
+    When MS_EMBEDDING_SERVICE_ADDRESS is set, texts are encoded by the shared
+    embedding service (scripts/embedding_service.py) instead of a local model copy.
+    """
     global _embedding_fn
     if _embedding_fn is None:
-        _embedding_fn = model.dense.SentenceTransformerEmbeddingFunction(
-            model_name=settings.embedding_model_name,
-            device=settings.embedding_device,
-        )
+        if settings.embedding_service_address:
+            from src.embedding_service import RemoteEmbeddingFunction
+
+            _embedding_fn = RemoteEmbeddingFunction(
+                settings.embedding_service_address,
+                authkey=settings.embedding_service_authkey.encode(),
+                timeout=settings.embedding_service_timeout,
+            )
+        else:
+            _embedding_fn = load_local_embedding_fn()
     return _embedding_fn
+
+
+def embedding_fn_loaded() -> bool:
+    """Whether get_embedding_fn() has already loaded the model (or connected to the service)."""
+    return _embedding_fn is not None
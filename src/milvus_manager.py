@@ -10,6 +10,8 @@ from pymilvus import (
 )
 
 from src.config import settings
+from src.sync_utils import SOURCE_DIGEST_FIELD
+from src.text_analysis import build_analyzer_params
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,48 @@ logger = logging.getLogger(__name__)
 # Schema builders
 # ---------------------------------------------------------------------------
 
+# Extra dense vectors per scene (MS_SCENE_MULTI_VECTOR_ENABLED):
+# visual_caption and audio_summarization + audio_transcription.
+SCENE_MODALITY_VECTOR_FIELDS = ["visual_embedding", "audio_embedding"]
+
+# bge-m3 learned sparse weights (MS_LEARNED_SPARSE_ENABLED), written by the
+# client from the same encode call as "embedding" - not a Milvus function.
+LEARNED_SPARSE_FIELD = "learned_sparse_embedding"
+
+
+# Digest of the MongoDB source row (src.sync_utils.source_digest), used by
+# scripts/reconcile.py.  Nullable: rows ingested through the API have none, and
+# existing collections get the field added in place instead of a recreate.
+SOURCE_DIGEST_MAX_LENGTH = 64
+
+
+def _source_digest_field() -> FieldSchema:
+    return FieldSchema(
+        name=SOURCE_DIGEST_FIELD, dtype=DataType.VARCHAR, max_length=SOURCE_DIGEST_MAX_LENGTH, nullable=True,
+    )
+
+
+def _learned_sparse_fields() -> list[FieldSchema]:
+    if not settings.learned_sparse_enabled:
+        return []
+    return [FieldSchema(name=LEARNED_SPARSE_FIELD, dtype=DataType.SPARSE_FLOAT_VECTOR)]
+
+
+_VECTOR_TYPES = (DataType.FLOAT_VECTOR, DataType.SPARSE_FLOAT_VECTOR)
+
+
+def _check_vector_field_count(fields: list[FieldSchema], collection: str) -> None:
+    """Fail before any Milvus call when the schema exceeds proxy.maxVectorFieldNum."""
+    vector_fields = [f.name for f in fields if f.dtype in _VECTOR_TYPES]
+    if len(vector_fields) > settings.milvus_max_vector_fields:
+        raise ValueError(
+            f"The {collection} schema has {len(vector_fields)} vector fields ({', '.join(vector_fields)}) "
+            f"but Milvus allows {settings.milvus_max_vector_fields} (proxy.maxVectorFieldNum). "
+            "Disable MS_SCENE_MULTI_VECTOR_ENABLED or MS_LEARNED_SPARSE_ENABLED, or raise "
+            "proxy.maxVectorFieldNum on the server together with MS_MILVUS_MAX_VECTOR_FIELDS"
+        )
+
+
 def _build_scenes_schema() -> CollectionSchema:
     fields = [
         FieldSchema(name="scene_id", dtype=DataType.VARCHAR, is_primary=True, max_length=256),
@@ -38,14 +82,17 @@ def _build_scenes_schema() -> CollectionSchema:
         FieldSchema(name="video_tags", dtype=DataType.VARCHAR, max_length=4096),  # JSON-serialized list
         FieldSchema(name="video_duration_sec", dtype=DataType.FLOAT),
         FieldSchema(name="video_created_at", dtype=DataType.VARCHAR, max_length=64),
+        FieldSchema(name="video_created_at_ts", dtype=DataType.INT64),  # UTC epoch seconds, 0 = unknown
         FieldSchema(name="resolution", dtype=DataType.VARCHAR, max_length=64),
         FieldSchema(name="fps", dtype=DataType.FLOAT),
         FieldSchema(name="program_id", dtype=DataType.VARCHAR, max_length=256),
         FieldSchema(name="broadcast_date", dtype=DataType.VARCHAR, max_length=64),
+        FieldSchema(name="broadcast_date_ts", dtype=DataType.INT64),
         FieldSchema(name="content_type_id", dtype=DataType.VARCHAR, max_length=256),
         # Scene metadata fields
         FieldSchema(name="category", dtype=DataType.VARCHAR, max_length=256),
         FieldSchema(name="created_date", dtype=DataType.VARCHAR, max_length=64),
+        FieldSchema(name="created_date_ts", dtype=DataType.INT64),
         FieldSchema(name="author", dtype=DataType.VARCHAR, max_length=256),
         # BM25 full-text search
         FieldSchema(
@@ -53,10 +100,20 @@ def _build_scenes_schema() -> CollectionSchema:
             dtype=DataType.VARCHAR,
             max_length=65535,
             enable_analyzer=True,
-            analyzer_params={"type": "standard"},
+            analyzer_params=build_analyzer_params(),
         ),
         FieldSchema(name="sparse_embedding", dtype=DataType.SPARSE_FLOAT_VECTOR),
+        _source_digest_field(),
     ]
+    if settings.scene_multi_vector_enabled:
+        # Modality vectors; with embedding + sparse_embedding this is the
+        # default Milvus limit of 4 vector fields per collection.
+        fields += [
+            FieldSchema(name=name, dtype=DataType.FLOAT_VECTOR, dim=settings.embedding_dimension)
+            for name in SCENE_MODALITY_VECTOR_FIELDS
+        ]
+    fields += _learned_sparse_fields()
+    _check_vector_field_count(fields, settings.milvus_collection_name)
     schema = CollectionSchema(fields=fields, description="Video scene search collection")
     schema.add_function(Function(
         name="bm25",
@@ -78,6 +135,7 @@ def _build_contents_schema() -> CollectionSchema:
         FieldSchema(name="tags", dtype=DataType.VARCHAR, max_length=4096),  # JSON-serialized list
         FieldSchema(name="duration_sec", dtype=DataType.FLOAT),
         FieldSchema(name="created_at", dtype=DataType.VARCHAR, max_length=64),
+        FieldSchema(name="created_at_ts", dtype=DataType.INT64),  # UTC epoch seconds, 0 = unknown
         FieldSchema(name="category", dtype=DataType.VARCHAR, max_length=256),
         FieldSchema(name="author", dtype=DataType.VARCHAR, max_length=256),
         FieldSchema(name="video_name", dtype=DataType.VARCHAR, max_length=1024),
@@ -85,6 +143,7 @@ def _build_contents_schema() -> CollectionSchema:
         FieldSchema(name="fps", dtype=DataType.FLOAT),
         FieldSchema(name="program_id", dtype=DataType.VARCHAR, max_length=256),
         FieldSchema(name="broadcast_date", dtype=DataType.VARCHAR, max_length=64),
+        FieldSchema(name="broadcast_date_ts", dtype=DataType.INT64),
         FieldSchema(name="content_type_id", dtype=DataType.VARCHAR, max_length=256),
         # BM25 full-text search
         FieldSchema(
@@ -92,9 +151,11 @@ def _build_contents_schema() -> CollectionSchema:
             dtype=DataType.VARCHAR,
             max_length=65535,
             enable_analyzer=True,
-            analyzer_params={"type": "standard"},
+            analyzer_params=build_analyzer_params(),
         ),
         FieldSchema(name="sparse_embedding", dtype=DataType.SPARSE_FLOAT_VECTOR),
+        _source_digest_field(),
+        *_learned_sparse_fields(),
     ]
     schema = CollectionSchema(fields=fields, description="Whole-video content search collection")
     schema.add_function(Function(
@@ -106,6 +167,103 @@ def _build_contents_schema() -> CollectionSchema:
     return schema
 
 
+def _build_content_chunks_schema() -> CollectionSchema:
+    fields = [
+        FieldSchema(name="chunk_id", dtype=DataType.VARCHAR, is_primary=True, max_length=300),  # "{content_id}#{i}"
+        FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=settings.embedding_dimension),
+        FieldSchema(name="content_id", dtype=DataType.VARCHAR, max_length=256),
+        FieldSchema(name="chunk_index", dtype=DataType.INT64),
+        # Character offsets of the window in the content description
+        FieldSchema(name="start_char", dtype=DataType.INT64),
+        FieldSchema(name="end_char", dtype=DataType.INT64),
+        # Content filter fields (copied so filters apply to chunk search)
+        FieldSchema(name="category", dtype=DataType.VARCHAR, max_length=256),
+        FieldSchema(name="author", dtype=DataType.VARCHAR, max_length=256),
+        FieldSchema(name="broadcast_date", dtype=DataType.VARCHAR, max_length=64),
+        FieldSchema(name="program_id", dtype=DataType.VARCHAR, max_length=256),
+        FieldSchema(name="content_type_id", dtype=DataType.VARCHAR, max_length=256),
+        FieldSchema(name="created_at_ts", dtype=DataType.INT64),
+        FieldSchema(name="broadcast_date_ts", dtype=DataType.INT64),
+    ]
+    return CollectionSchema(fields=fields, description="Content transcript chunk collection")
+
+
+# ---------------------------------------------------------------------------
+# Scalar indexes on filter / facet fields
+# ---------------------------------------------------------------------------
+
+# field name -> Milvus scalar index type.  BITMAP suits low-cardinality
+# facets, INVERTED suits high-cardinality ids and free-form values, and
+# STL_SORT serves range predicates on the numeric *_ts epoch fields.
+SCENE_SCALAR_INDEXES = {
+    "video_id": "INVERTED",
+    "category": "BITMAP",
+    "content_type_id": "BITMAP",
+    "author": "INVERTED",
+    "program_id": "INVERTED",
+    "created_date": "INVERTED",
+    "broadcast_date": "INVERTED",
+    "video_created_at_ts": "STL_SORT",
+    "broadcast_date_ts": "STL_SORT",
+    "created_date_ts": "STL_SORT",
+}
+
+CONTENT_SCALAR_INDEXES = {
+    "category": "BITMAP",
+    "content_type_id": "BITMAP",
+    "author": "INVERTED",
+    "program_id": "INVERTED",
+    "broadcast_date": "INVERTED",
+    "created_at_ts": "STL_SORT",
+    "broadcast_date_ts": "STL_SORT",
+}
+
+
+CONTENT_CHUNK_SCALAR_INDEXES = {
+    "content_id": "INVERTED",
+    **CONTENT_SCALAR_INDEXES,
+}
+
+
+def _add_scalar_indexes(index_params, scalar_indexes: dict[str, str]) -> None:
+    for field_name, index_type in scalar_indexes.items():
+        index_params.add_index(field_name=field_name, index_type=index_type, index_name=field_name)
+
+
+def ensure_scalar_indexes(
+    client: MilvusClient,
+    collection_name: str,
+    scalar_indexes: dict[str, str],
+) -> list[str]:
+    """
+    Create any missing scalar indexes on an existing collection.
+
+    The collection is released while the indexes are built and loaded again
+    afterwards.  Returns the names of the fields that got a new index.
+    """
+    info = client.describe_collection(collection_name=collection_name)
+    field_names = {f["name"] for f in info.get("fields", [])}
+    existing = set(client.list_indexes(collection_name=collection_name))
+    # Fields missing from an older collection schema cannot be indexed yet
+    missing = {
+        f: t for f, t in scalar_indexes.items()
+        if f in field_names and f not in existing
+    }
+    if not missing:
+        return []
+
+    index_params = client.prepare_index_params()
+    _add_scalar_indexes(index_params, missing)
+
+    client.release_collection(collection_name=collection_name)
+    try:
+        client.create_index(collection_name=collection_name, index_params=index_params)
+    finally:
+        client.load_collection(collection_name=collection_name)
+    logger.info("Created scalar indexes on '%s': %s", collection_name, ", ".join(missing))
+    return list(missing)
+
+
 # ---------------------------------------------------------------------------
 # Schema compatibility check
 # ---------------------------------------------------------------------------
@@ -120,6 +278,93 @@ def _schema_compatible(client: MilvusClient, collection: str, required_fields: s
         return False
 
 
+_has_source_digest: dict[str, bool] = {}
+
+
+def has_source_digest(client: MilvusClient, collection_name: str) -> bool:
+    """Whether the collection has the source_digest field (cached per process)."""
+    if collection_name not in _has_source_digest:
+        _has_source_digest[collection_name] = _schema_compatible(client, collection_name, {SOURCE_DIGEST_FIELD})
+    return _has_source_digest[collection_name]
+
+
+def ensure_source_digest_field(client: MilvusClient, collection_name: str) -> bool:
+    """
+    Add source_digest to a collection created before it existed.
+
+    Nullable fields can be added in place on Milvus 2.6+, so no drop / re-sync
+    is needed; older servers keep the collection as is.  Returns whether the
+    collection has the field afterwards.
+    """
+    _has_source_digest.pop(collection_name, None)
+    if has_source_digest(client, collection_name):
+        return True
+    try:
+        client.add_collection_field(
+            collection_name=collection_name,
+            field_name=SOURCE_DIGEST_FIELD,
+            data_type=DataType.VARCHAR,
+            max_length=SOURCE_DIGEST_MAX_LENGTH,
+            nullable=True,
+        )
+    except Exception as e:
+        logger.warning("Cannot add '%s' to '%s' (reconciliation compares ids only): %s",
+                       SOURCE_DIGEST_FIELD, collection_name, e)
+        return False
+    _has_source_digest[collection_name] = True
+    logger.info("Added field '%s' to '%s'.", SOURCE_DIGEST_FIELD, collection_name)
+    return True
+
+
+class SchemaMigrationError(RuntimeError):
+    """An existing collection lacks fields that cannot be added in place."""
+
+
+# Field types that can be added to an existing collection (as nullable)
+_ADDABLE_TYPES = (DataType.INT64, DataType.FLOAT, DataType.VARCHAR)
+
+
+def add_missing_fields(client: MilvusClient, collection_name: str, schema_builder, required_fields: set[str]) -> None:
+    """
+    Bring an existing collection up to *required_fields* or fail.
+
+    Missing scalar fields (e.g. the *_ts epoch fields) are added in place as
+    nullable on Milvus 2.6+; rows written before keep null until re-synced.
+    Anything else (vector fields, BM25 inputs, or an older server) needs a drop
+    and re-sync, since every write would otherwise be rejected.
+    """
+    info = client.describe_collection(collection_name=collection_name)
+    missing = required_fields - {f["name"] for f in info.get("fields", [])}
+    if not missing:
+        return
+    schema_fields = {f.name: f for f in schema_builder().fields}
+    for name in sorted(missing):
+        field_schema = schema_fields.get(name)
+        if (field_schema is None or field_schema.dtype not in _ADDABLE_TYPES
+                or field_schema.params.get("enable_analyzer")):
+            continue
+        try:
+            client.add_collection_field(
+                collection_name=collection_name,
+                field_name=name,
+                data_type=field_schema.dtype,
+                nullable=True,
+                **field_schema.params,
+            )
+        except Exception as e:
+            logger.warning("Cannot add '%s' to '%s': %s", name, collection_name, e)
+            continue
+        missing.discard(name)
+        logger.info("Added field '%s' to '%s'; re-sync to fill existing rows and run "
+                    "'python -m scripts.migrate_indexes' to index it.", name, collection_name)
+    if missing:
+        raise SchemaMigrationError(
+            f"Collection '{collection_name}' is missing fields {sorted(missing)} that cannot be added in place. "
+            "Run 'python -m scripts.drop_collection' to drop and recreate it, then "
+            "'python -m scripts.mongo_watcher --full-sync-only' to re-sync."
+        )
+
+
 # ---------------------------------------------------------------------------
 # Ensure collections
 # ---------------------------------------------------------------------------
@@ -129,47 +374,78 @@ def _ensure_single_collection(
     collection_name: str,
     schema_builder,
     required_fields: set[str],
+    scalar_indexes: dict[str, str],
+    sparse: bool = True,
+    extra_vector_fields: list[str] | None = None,
+    extra_sparse_fields: list[str] | None = None,
+    digest: bool = True,
 ) -> None:
     if client.has_collection(collection_name=collection_name):
-        if not _schema_compatible(client, collection_name, required_fields):
-            logger.warning(
-                "Collection '%s' exists but has incompatible schema. "
-                "Run 'python -m scripts.drop_collection' to drop and recreate it.",
-                collection_name,
-            )
+        add_missing_fields(client, collection_name, schema_builder, required_fields)
+        if digest:
+            ensure_source_digest_field(client, collection_name)
         client.load_collection(collection_name=collection_name)
         return
 
     schema = schema_builder()
     client.create_collection(collection_name=collection_name, schema=schema)
+    _has_source_digest.pop(collection_name, None)
 
     index_params = client.prepare_index_params()
-    index_params.add_index(
-        field_name="embedding",
-        index_type="HNSW",
-        metric_type="COSINE",
-        params={"M": 16, "efConstruction": 128},
-    )
-    index_params.add_index(
-        field_name="sparse_embedding",
-        index_type="SPARSE_INVERTED_INDEX",
-        metric_type="BM25",
-    )
+    for vector_field in ["embedding", *(extra_vector_fields or [])]:
+        index_params.add_index(
+            field_name=vector_field,
+            index_type="HNSW",
+            metric_type="COSINE",
+            params={"M": 16, "efConstruction": 128},
+        )
+    if sparse:
+        index_params.add_index(
+            field_name="sparse_embedding",
+            index_type="SPARSE_INVERTED_INDEX",
+            metric_type="BM25",
+        )
+    for sparse_field in extra_sparse_fields or []:
+        index_params.add_index(
+            field_name=sparse_field,
+            index_type="SPARSE_INVERTED_INDEX",
+            metric_type="IP",
+        )
+    _add_scalar_indexes(index_params, scalar_indexes)
     client.create_index(collection_name=collection_name, index_params=index_params)
     client.load_collection(collection_name=collection_name)
 
 
 def ensure_collection(client: MilvusClient) -> None:
-    """Ensure both scenes and contents collections exist."""
+    """Ensure the scenes and contents collections (and content_chunks when enabled) exist."""
+    scene_vector_fields = SCENE_MODALITY_VECTOR_FIELDS if settings.scene_multi_vector_enabled else []
+    learned_sparse_fields = [LEARNED_SPARSE_FIELD] if settings.learned_sparse_enabled else []
     _ensure_single_collection(
         client,
         settings.milvus_collection_name,
         _build_scenes_schema,
-        {"scene_id", "visual_caption", "audio_summarization", "audio_transcription", "faces", "category", "created_date", "author", "bm25_text", "sparse_embedding"},
+        {"scene_id", "visual_caption", "audio_summarization", "audio_transcription", "faces", "category", "created_date", "author", "bm25_text", "sparse_embedding",
+         "video_created_at_ts", "broadcast_date_ts", "created_date_ts", *scene_vector_fields, *learned_sparse_fields},
+        SCENE_SCALAR_INDEXES,
+        extra_vector_fields=scene_vector_fields,
+        extra_sparse_fields=learned_sparse_fields,
     )
     _ensure_single_collection(
         client,
         settings.milvus_content_collection_name,
         _build_contents_schema,
-        {"content_id", "title", "description", "video_summary", "program_id", "bm25_text", "sparse_embedding"},
+        {"content_id", "title", "description", "video_summary", "program_id", "bm25_text", "sparse_embedding",
+         "created_at_ts", "broadcast_date_ts", *learned_sparse_fields},
+        CONTENT_SCALAR_INDEXES,
+        extra_sparse_fields=learned_sparse_fields,
     )
+    if settings.content_chunks_enabled:
+        _ensure_single_collection(
+            client,
+            settings.milvus_content_chunk_collection_name,
+            _build_content_chunks_schema,
+            {"chunk_id", "content_id", "chunk_index", "start_char", "end_char", "created_at_ts"},
+            CONTENT_CHUNK_SCALAR_INDEXES,
+            sparse=False,
+            digest=False,  # chunks follow their content row
+        )
@@ -1,9 +1,56 @@
+import contextvars
 import json
-from collections import defaultdict
+import threading
+import time
+import weakref
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-from pymilvus import AnnSearchRequest, MilvusClient, RRFRanker
+from pymilvus import AnnSearchRequest, MilvusClient, RRFRanker, WeightedRanker
 
 from src.config import settings
+from src.metrics import observe_embedding, observe_stage, record_cache
+from src.milvus_manager import LEARNED_SPARSE_FIELD
+from src.profiling import current_profile
+from src.sync_utils import parse_date_to_epoch
+from src.text_analysis import prepare_bm25_queries
+
+
+# ---------------------------------------------------------------------------
+# Date range filters
+# ---------------------------------------------------------------------------
+
+def build_range_filter(field_ranges: dict[str, tuple[str | None, str | None]]) -> str | None:
+    """
+    Build a Milvus filter over numeric *_ts epoch fields from date bounds.
+
+    *field_ranges* maps an epoch field to ``(date_from, date_to)``; both bounds
+    are inclusive and either may be None.  A date-only upper bound covers the
+    whole day.  Raises ValueError on an unparseable date.
+    """
+    conditions: list[str] = []
+    for field, (date_from, date_to) in field_ranges.items():
+        lower = upper = None
+        if date_from:
+            lower = parse_date_to_epoch(date_from)
+            if lower is None:
+                raise ValueError(f"Invalid date for {field}: {date_from!r}")
+        if date_to:
+            upper = parse_date_to_epoch(date_to, end_of_day=True)
+            if upper is None:
+                raise ValueError(f"Invalid date for {field}: {date_to!r}")
+
+        if lower is not None:
+            conditions.append(f"{field} >= {lower}")
+        elif upper is not None:
+            # 0 marks a missing date; keep those out of open-ended ranges
+            conditions.append(f"{field} > 0")
+        if upper is not None:
+            conditions.append(f"{field} <= {upper}")
+    if not conditions:
+        return None
+    return " and ".join(conditions)
+
 
 # ---------------------------------------------------------------------------
 # Scene output fields & helpers
@@ -82,6 +129,7 @@ def _parse_scene_hit(result: dict) -> dict:
     }
 
 
+@observe_stage("facets")
 def build_scene_facets(hits: list[dict]) -> dict:
     groups = {field: defaultdict(list) for field in SCENE_FACET_FIELDS}
     for hit in hits:
@@ -153,6 +201,7 @@ def _parse_content_hit(result: dict) -> dict:
     }
 
 
+@observe_stage("facets")
 def build_content_facets(hits: list[dict]) -> dict:
     groups = {field: defaultdict(list) for field in CONTENT_FACET_FIELDS}
     for hit in hits:
@@ -174,116 +223,541 @@ def build_content_facets(hits: list[dict]) -> dict:
 # Scene search functions
 # ---------------------------------------------------------------------------
 
-def search_scene_semantic(
+def _profiled_call(operation: str, stage: str, call, kwargs: dict):
+    """Run a Milvus call under *stage*; with profile=true also record its parameters."""
+    profile = current_profile()
+    start = time.perf_counter()
+    with observe_stage(stage):
+        results = call(**kwargs)
+    if profile is not None:
+        profile.add_milvus_call(operation, kwargs, results, time.perf_counter() - start)
+    return results
+
+
+def _milvus_search(client: MilvusClient, search_kwargs: dict):
+    return _profiled_call("search", "milvus_search", client.search, search_kwargs)
+
+
+def _milvus_hybrid_search(client: MilvusClient, hybrid_kwargs: dict):
+    return _profiled_call("hybrid_search", "milvus_hybrid_search", client.hybrid_search, hybrid_kwargs)
+
+
+def milvus_query(client: MilvusClient, **query_kwargs) -> list[dict]:
+    """client.query timed as the milvus_query stage (row hydration / scalar lookups)."""
+    return _profiled_call("query", "milvus_query", client.query, query_kwargs)
+
+
+def _parse_hits(results, parse_hit) -> list[list[dict]]:
+    with observe_stage("parse_hits"):
+        return [[parse_hit(r) for r in result] for result in results]
+
+
+def _apply_video_grouping(kwargs: dict, group_size: int | None) -> None:
+    """Ask Milvus for at most *group_size* hits per video; limit then counts videos."""
+    if group_size:
+        kwargs["group_by_field"] = "video_id"
+        kwargs["group_size"] = group_size
+
+
+# The *_search helpers take one or more queries (nq) and return one hit list
+# per query, so a batch of queries costs a single Milvus round trip.
+
+def _scene_semantic_search(
     client: MilvusClient,
-    embedding_fn,
-    query_text: str,
+    query_vectors: list,
     k: int,
     filter_expr: str | None = None,
-) -> dict:
-    query_vectors = embedding_fn.encode_queries([query_text])
-
+    group_size: int | None = None,
+    output_fields: list[str] = SCENE_OUTPUT_FIELDS,
+) -> list[list[dict]]:
     search_kwargs = {
         "collection_name": settings.milvus_collection_name,
         "data": query_vectors,
         "anns_field": "embedding",
         "limit": k,
-        "output_fields": SCENE_OUTPUT_FIELDS,
+        "output_fields": output_fields,
         "search_params": {"metric_type": "COSINE", "params": {"ef": 256}},
     }
     if filter_expr:
         search_kwargs["filter"] = filter_expr
+    _apply_video_grouping(search_kwargs, group_size)
 
-    results = client.search(**search_kwargs)
-    hits = [_parse_scene_hit(r) for r in results[0]]
-    facets = build_scene_facets(hits)
-    return {"total": len(hits), "hits": hits, "facets": facets}
+    results = _milvus_search(client, search_kwargs)
+    return _parse_hits(results, _parse_scene_hit)
 
 
-def search_scene_fulltext(
+def _scene_fulltext_search(
     client: MilvusClient,
-    query_text: str,
+    query_texts: list[str],
     k: int,
     filter_expr: str | None = None,
-) -> dict:
+    group_size: int | None = None,
+    output_fields: list[str] = SCENE_OUTPUT_FIELDS,
+) -> list[list[dict]]:
     search_kwargs = {
         "collection_name": settings.milvus_collection_name,
-        "data": [query_text],
+        "data": prepare_bm25_queries(query_texts),
         "anns_field": "sparse_embedding",
         "limit": k,
-        "output_fields": SCENE_OUTPUT_FIELDS,
+        "output_fields": output_fields,
         "search_params": {"metric_type": "BM25"},
     }
     if filter_expr:
         search_kwargs["filter"] = filter_expr
+    _apply_video_grouping(search_kwargs, group_size)
 
-    results = client.search(**search_kwargs)
-    hits = [_parse_scene_hit(r) for r in results[0]]
-    facets = build_scene_facets(hits)
-    return {"total": len(hits), "hits": hits, "facets": facets}
+    results = _milvus_search(client, search_kwargs)
+    return _parse_hits(results, _parse_scene_hit)
 
 
-def search_scene_fulltext_with_filter(
-    client: MilvusClient,
-    query_text: str,
-    k: int,
-    filter_expr: str | None = None,
-) -> dict:
-    """Alias for search_scene_fulltext with filter support."""
-    return search_scene_fulltext(client, query_text, k, filter_expr)
+# ---- Query encoding (with cache) / learned sparse (bge-m3) ----
 
+class QueryEmbeddingCache:
+    """Thread-safe LRU of (query text, learned sparse on) -> (dense vector, sparse vector or None)."""
 
-def search_scene_hybrid(
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# One cache per embedding function, so vectors of different models never mix
+_query_caches: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_query_caches_lock = threading.Lock()
+
+
+def query_embedding_cache(embedding_fn) -> QueryEmbeddingCache | None:
+    """The query cache of *embedding_fn*, or None when MS_QUERY_EMBEDDING_CACHE_SIZE is 0."""
+    if settings.query_embedding_cache_size <= 0:
+        return None
+    with _query_caches_lock:
+        try:
+            cache = _query_caches.get(embedding_fn)
+            if cache is None:
+                cache = _query_caches[embedding_fn] = QueryEmbeddingCache(settings.query_embedding_cache_size)
+        except TypeError:  # not weak-referenceable
+            return None
+    return cache
+
+
+def _encode_uncached(embedding_fn, query_texts: list[str]) -> tuple[list, list | None]:
+    with observe_embedding("queries", len(query_texts)):
+        if settings.learned_sparse_enabled:
+            return embedding_fn.encode_queries_with_sparse(query_texts)
+        return embedding_fn.encode_queries(query_texts), None
+
+
+def _encode_queries(embedding_fn, query_texts: list[str]) -> tuple[list, list | None]:
+    """
+    Dense query vectors, plus learned sparse vectors when MS_LEARNED_SPARSE_ENABLED.
+
+    Repeated texts are served from the query embedding cache; only the misses
+    are sent to the model, in one call.
+    """
+    with observe_stage("encode_queries"):
+        cache = query_embedding_cache(embedding_fn)
+        if cache is None:
+            return _encode_uncached(embedding_fn, query_texts)
+
+        sparse_on = settings.learned_sparse_enabled
+        cached = [cache.get((text, sparse_on)) for text in query_texts]
+        for pair in cached:
+            record_cache("query_embedding", pair is not None)
+        missing = list(dict.fromkeys(t for t, pair in zip(query_texts, cached) if pair is None))
+        encoded = {}
+        if missing:
+            dense, sparse = _encode_uncached(embedding_fn, missing)
+            encoded = dict(zip(missing, zip(dense, sparse if sparse is not None else [None] * len(missing))))
+            for text, pair in encoded.items():
+                cache.put((text, sparse_on), pair)
+
+        pairs = [pair if pair is not None else encoded[t] for t, pair in zip(query_texts, cached)]
+        return [p[0] for p in pairs], ([p[1] for p in pairs] if sparse_on else None)
+
+
+def warm_query_cache(embedding_fn, query_texts: list[str]) -> int:
+    """Pre-embed *query_texts* into the query cache (startup warmup); returns the number encoded."""
+    if query_embedding_cache(embedding_fn) is None:
+        return 0
+    batch_size = settings.embedding_batch_size
+    for i in range(0, len(query_texts), batch_size):
+        _encode_queries(embedding_fn, query_texts[i:i + batch_size])
+    return len(query_texts)
+
+
+def _learned_sparse_request(query_sparse: list, limit: int) -> AnnSearchRequest:
+    """Third hybrid sub-search over bge-m3's learned lexical weights."""
+    return AnnSearchRequest(
+        data=query_sparse,
+        anns_field=LEARNED_SPARSE_FIELD,
+        param={"metric_type": "IP"},
+        limit=limit,
+    )
+
+
+def _scene_hybrid_search(
     client: MilvusClient,
-    embedding_fn,
-    query_text: str,
+    query_texts: list[str],
+    query_vectors: list,
     k: int,
     filter_expr: str | None = None,
-) -> dict:
-    query_vectors = embedding_fn.encode_queries([query_text])
+    group_size: int | None = None,
+    output_fields: list[str] = SCENE_OUTPUT_FIELDS,
+    query_sparse: list | None = None,
+) -> list[list[dict]]:
+    # With grouping every sub-search must return enough candidates to fill the groups
+    candidate_limit = k * group_size if group_size else k
 
     dense_req = AnnSearchRequest(
         data=query_vectors,
         anns_field="embedding",
         param={"metric_type": "COSINE", "params": {"ef": 256}},
-        limit=k,
+        limit=candidate_limit,
     )
     sparse_req = AnnSearchRequest(
-        data=[query_text],
+        data=prepare_bm25_queries(query_texts),
         anns_field="sparse_embedding",
         param={"metric_type": "BM25"},
-        limit=k,
+        limit=candidate_limit,
     )
 
+    reqs = [dense_req, sparse_req]
+    if query_sparse is not None:
+        reqs.append(_learned_sparse_request(query_sparse, candidate_limit))
+
     hybrid_kwargs = {
         "collection_name": settings.milvus_collection_name,
-        "reqs": [dense_req, sparse_req],
+        "reqs": reqs,
         "ranker": RRFRanker(k=60),
         "limit": k,
-        "output_fields": SCENE_OUTPUT_FIELDS,
+        "output_fields": output_fields,
+    }
+    if filter_expr:
+        hybrid_kwargs["filter"] = filter_expr
+    _apply_video_grouping(hybrid_kwargs, group_size)
+
+    results = _milvus_hybrid_search(client, hybrid_kwargs)
+    return _parse_hits(results, _parse_scene_hit)
+
+
+# ---- Weighted multi-vector scene search ----
+
+# Request name -> scene vector field.  visual / audio exist only with
+# MS_SCENE_MULTI_VECTOR_ENABLED, sparse only with MS_LEARNED_SPARSE_ENABLED
+# (see milvus_manager).
+SCENE_VECTOR_FIELDS = {
+    "text": "embedding",
+    "visual": "visual_embedding",
+    "audio": "audio_embedding",
+    "bm25": "sparse_embedding",
+    "sparse": LEARNED_SPARSE_FIELD,
+}
+
+
+def available_scene_vectors() -> list[str]:
+    names = ["text", "bm25"]
+    if settings.scene_multi_vector_enabled:
+        names[1:1] = ["visual", "audio"]
+    if settings.learned_sparse_enabled:
+        names.append("sparse")
+    return names
+
+
+def parse_vector_weights(spec: str | dict[str, float]) -> dict[str, float]:
+    """
+    Parse and validate scene vector weights.
+
+    Accepts a dict or a "name:weight,name:weight" string; a bare name means
+    weight 1.  Raises ValueError for unknown / unavailable vectors or when no
+    positive weight is left.
+    """
+    if isinstance(spec, str):
+        weights = {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            name, _, value = part.partition(":")
+            try:
+                weights[name.strip()] = float(value) if value else 1.0
+            except ValueError:
+                raise ValueError(f"Invalid weight in '{part}'")
+    else:
+        weights = dict(spec)
+
+    available = available_scene_vectors()
+    for name, weight in weights.items():
+        if name not in available:
+            raise ValueError(f"Unknown or disabled scene vector '{name}', available: {', '.join(available)}")
+        if weight < 0:
+            raise ValueError(f"Weight of '{name}' must be >= 0")
+    weights = {name: weight for name, weight in weights.items() if weight > 0}
+    if not weights:
+        raise ValueError("At least one vector weight must be > 0")
+    return weights
+
+
+def _scene_weighted_search(
+    client: MilvusClient,
+    query_texts: list[str],
+    query_vectors: list | None,
+    k: int,
+    vector_weights: dict[str, float],
+    filter_expr: str | None = None,
+    group_size: int | None = None,
+    output_fields: list[str] = SCENE_OUTPUT_FIELDS,
+    query_sparse: list | None = None,
+) -> list[list[dict]]:
+    """One hybrid_search with a sub-search per weighted vector field, fused by WeightedRanker."""
+    candidate_limit = k * group_size if group_size else k
+    reqs, weights = [], []
+    for name, weight in vector_weights.items():
+        if name == "bm25":
+            reqs.append(AnnSearchRequest(
+                data=prepare_bm25_queries(query_texts), anns_field="sparse_embedding",
+                param={"metric_type": "BM25"}, limit=candidate_limit,
+            ))
+        elif name == "sparse":
+            reqs.append(_learned_sparse_request(query_sparse, candidate_limit))
+        else:
+            reqs.append(AnnSearchRequest(
+                data=query_vectors, anns_field=SCENE_VECTOR_FIELDS[name],
+                param={"metric_type": "COSINE", "params": {"ef": 256}}, limit=candidate_limit,
+            ))
+        weights.append(weight)
+
+    hybrid_kwargs = {
+        "collection_name": settings.milvus_collection_name,
+        "reqs": reqs,
+        # norm_score maps COSINE, BM25 and IP scores to a comparable range before weighting
+        "ranker": WeightedRanker(*weights, norm_score=True),
+        "limit": k,
+        "output_fields": output_fields,
     }
     if filter_expr:
         hybrid_kwargs["filter"] = filter_expr
+    _apply_video_grouping(hybrid_kwargs, group_size)
+
+    results = _milvus_hybrid_search(client, hybrid_kwargs)
+    return _parse_hits(results, _parse_scene_hit)
+
+
+def _scene_search(
+    client: MilvusClient,
+    embedding_fn,
+    query_texts: list[str],
+    k: int,
+    search_type: str,
+    filter_expr: str | None = None,
+    group_size: int | None = None,
+    output_fields: list[str] = SCENE_OUTPUT_FIELDS,
+    query_vectors: list | None = None,
+    vector_weights: dict[str, float] | None = None,
+    query_sparse: list | None = None,
+) -> list[list[dict]]:
+    """*vector_weights*, when given, selects the sub-searches and overrides *search_type*."""
+    if vector_weights:
+        vector_weights = dict(vector_weights)
+        if query_vectors is None and _needs_query_vector(search_type, vector_weights):
+            query_vectors, query_sparse = _encode_queries(embedding_fn, query_texts)
+        return _scene_weighted_search(
+            client, query_texts, query_vectors, k, vector_weights, filter_expr, group_size, output_fields,
+            query_sparse,
+        )
+    if search_type == "fulltext":
+        return _scene_fulltext_search(client, query_texts, k, filter_expr, group_size, output_fields)
+    if query_vectors is None:
+        query_vectors, query_sparse = _encode_queries(embedding_fn, query_texts)
+    if search_type == "hybrid":
+        return _scene_hybrid_search(
+            client, query_texts, query_vectors, k, filter_expr, group_size, output_fields, query_sparse,
+        )
+    return _scene_semantic_search(client, query_vectors, k, filter_expr, group_size, output_fields)
+
+
+def _scene_hits(
+    client: MilvusClient,
+    embedding_fn,
+    query_text: str,
+    k: int,
+    search_type: str,
+    filter_expr: str | None = None,
+    group_size: int | None = None,
+    output_fields: list[str] = SCENE_OUTPUT_FIELDS,
+    query_vectors: list | None = None,
+    query_sparse: list | None = None,
+) -> list[dict]:
+    return _scene_search(
+        client, embedding_fn, [query_text], k, search_type,
+        filter_expr, group_size, output_fields, query_vectors, query_sparse=query_sparse,
+    )[0]
+
+
+def search_scene_semantic(
+    client: MilvusClient,
+    embedding_fn,
+    query_text: str,
+    k: int,
+    filter_expr: str | None = None,
+    group_size: int | None = None,
+) -> dict:
+    hits = _scene_hits(client, embedding_fn, query_text, k, "semantic", filter_expr, group_size)
+    facets = build_scene_facets(hits)
+    return {"total": len(hits), "hits": hits, "facets": facets}
+
+
+def search_scene_fulltext(
+    client: MilvusClient,
+    query_text: str,
+    k: int,
+    filter_expr: str | None = None,
+    group_size: int | None = None,
+) -> dict:
+    hits = _scene_hits(client, None, query_text, k, "fulltext", filter_expr, group_size)
+    facets = build_scene_facets(hits)
+    return {"total": len(hits), "hits": hits, "facets": facets}
+
+
+def search_scene_fulltext_with_filter(
+    client: MilvusClient,
+    query_text: str,
+    k: int,
+    filter_expr: str | None = None,
+) -> dict:
+    """Alias for search_scene_fulltext with filter support."""
+    return search_scene_fulltext(client, query_text, k, filter_expr)
+
 
-    results = client.hybrid_search(**hybrid_kwargs)
-    hits = [_parse_scene_hit(r) for r in results[0]]
+def search_scene_weighted(
+    client: MilvusClient,
+    embedding_fn,
+    query_text: str,
+    k: int,
+    vector_weights: dict[str, float],
+    filter_expr: str | None = None,
+    group_size: int | None = None,
+) -> dict:
+    hits = _scene_search(
+        client, embedding_fn, [query_text], k, "hybrid", filter_expr, group_size,
+        vector_weights=vector_weights,
+    )[0]
+    facets = build_scene_facets(hits)
+    return {"total": len(hits), "hits": hits, "facets": facets}
+
+
+def search_scene_hybrid(
+    client: MilvusClient,
+    embedding_fn,
+    query_text: str,
+    k: int,
+    filter_expr: str | None = None,
+    group_size: int | None = None,
+) -> dict:
+    hits = _scene_hits(client, embedding_fn, query_text, k, "hybrid", filter_expr, group_size)
     facets = build_scene_facets(hits)
     return {"total": len(hits), "hits": hits, "facets": facets}
 
 
 # ---------------------------------------------------------------------------
-# Content search functions
+# Scene segments (contiguous scene runs per video)
 # ---------------------------------------------------------------------------
 
-def search_content_semantic(
+SEGMENT_OUTPUT_FIELDS = [
+    "scene_id",
+    "start_time_sec",
+    "end_time_sec",
+    "video_id",
+    "video_title",
+    "video_name",
+]
+
+
+def build_scene_segments(hits: list[dict], gap_sec: float = 0.0, score_mode: str = "max") -> list[dict]:
+    """
+    Merge scene hits of the same video into contiguous segments.
+
+    Scenes that overlap or start within *gap_sec* of the previous scene's end
+    are merged.  Each segment carries the max and the sum of its scene scores;
+    *score_mode* ("max" or "sum") picks which one ranks the segments.
+    """
+    by_video: dict[str, list[dict]] = defaultdict(list)
+    for hit in hits:
+        by_video[hit["content_id"]].append(hit)
+
+    segments = []
+    for scenes in by_video.values():
+        scenes.sort(key=lambda h: (h["start_time_sec"], h["end_time_sec"]))
+        current = None
+        for scene in scenes:
+            if current is not None and scene["start_time_sec"] <= current["end_time_sec"] + gap_sec:
+                current["end_time_sec"] = max(current["end_time_sec"], scene["end_time_sec"])
+                current["max_score"] = max(current["max_score"], scene["score"])
+                current["total_score"] += scene["score"]
+                current["scene_ids"].append(scene["scene_id"])
+                continue
+            current = {
+                "content_id": scene["content_id"],
+                "video_title": scene["video_title"],
+                "video_name": scene["video_name"],
+                "start_time_sec": scene["start_time_sec"],
+                "end_time_sec": scene["end_time_sec"],
+                "max_score": scene["score"],
+                "total_score": scene["score"],
+                "scene_ids": [scene["scene_id"]],
+            }
+            segments.append(current)
+
+    for segment in segments:
+        segment["scene_count"] = len(segment["scene_ids"])
+        segment["score"] = segment["total_score"] if score_mode == "sum" else segment["max_score"]
+    segments.sort(key=lambda s: (-s["score"], -s["total_score"]))
+    return segments
+
+
+def search_scene_segments(
     client: MilvusClient,
     embedding_fn,
     query_text: str,
     k: int,
+    group_size: int,
+    gap_sec: float = 0.0,
+    search_type: str = "semantic",
+    score_mode: str = "max",
     filter_expr: str | None = None,
 ) -> dict:
-    query_vectors = embedding_fn.encode_queries([query_text])
+    """Grouped scene search (k videos x group_size scenes) merged into ranked segments."""
+    hits = _scene_hits(
+        client, embedding_fn, query_text, k, search_type,
+        filter_expr, group_size, SEGMENT_OUTPUT_FIELDS,
+    )
+    segments = build_scene_segments(hits, gap_sec, score_mode)
+    return {"total": len(segments), "segments": segments}
+
+
+# ---------------------------------------------------------------------------
+# Content search functions
+# ---------------------------------------------------------------------------
 
+def _content_semantic_search(
+    client: MilvusClient,
+    query_vectors: list,
+    k: int,
+    filter_expr: str | None = None,
+) -> list[list[dict]]:
     search_kwargs = {
         "collection_name": settings.milvus_content_collection_name,
         "data": query_vectors,
@@ -295,21 +769,19 @@ def search_content_semantic(
     if filter_expr:
         search_kwargs["filter"] = filter_expr
 
-    results = client.search(**search_kwargs)
-    hits = [_parse_content_hit(r) for r in results[0]]
-    facets = build_content_facets(hits)
-    return {"total": len(hits), "hits": hits, "facets": facets}
+    results = _milvus_search(client, search_kwargs)
+    return _parse_hits(results, _parse_content_hit)
 
 
-def search_content_fulltext(
+def _content_fulltext_search(
     client: MilvusClient,
-    query_text: str,
+    query_texts: list[str],
     k: int,
     filter_expr: str | None = None,
-) -> dict:
+) -> list[list[dict]]:
     search_kwargs = {
         "collection_name": settings.milvus_content_collection_name,
-        "data": [query_text],
+        "data": prepare_bm25_queries(query_texts),
         "anns_field": "sparse_embedding",
         "limit": k,
         "output_fields": CONTENT_OUTPUT_FIELDS,
@@ -318,21 +790,18 @@ def search_content_fulltext(
     if filter_expr:
         search_kwargs["filter"] = filter_expr
 
-    results = client.search(**search_kwargs)
-    hits = [_parse_content_hit(r) for r in results[0]]
-    facets = build_content_facets(hits)
-    return {"total": len(hits), "hits": hits, "facets": facets}
+    results = _milvus_search(client, search_kwargs)
+    return _parse_hits(results, _parse_content_hit)
 
 
-def search_content_hybrid(
+def _content_hybrid_search(
     client: MilvusClient,
-    embedding_fn,
-    query_text: str,
+    query_texts: list[str],
+    query_vectors: list,
     k: int,
     filter_expr: str | None = None,
-) -> dict:
-    query_vectors = embedding_fn.encode_queries([query_text])
-
+    query_sparse: list | None = None,
+) -> list[list[dict]]:
     dense_req = AnnSearchRequest(
         data=query_vectors,
         anns_field="embedding",
@@ -340,15 +809,19 @@ def search_content_hybrid(
         limit=k,
     )
     sparse_req = AnnSearchRequest(
-        data=[query_text],
+        data=prepare_bm25_queries(query_texts),
         anns_field="sparse_embedding",
         param={"metric_type": "BM25"},
         limit=k,
     )
 
+    reqs = [dense_req, sparse_req]
+    if query_sparse is not None:
+        reqs.append(_learned_sparse_request(query_sparse, k))
+
     hybrid_kwargs = {
         "collection_name": settings.milvus_content_collection_name,
-        "reqs": [dense_req, sparse_req],
+        "reqs": reqs,
         "ranker": RRFRanker(k=60),
         "limit": k,
         "output_fields": CONTENT_OUTPUT_FIELDS,
@@ -356,7 +829,351 @@ def search_content_hybrid(
     if filter_expr:
         hybrid_kwargs["filter"] = filter_expr
 
-    results = client.hybrid_search(**hybrid_kwargs)
-    hits = [_parse_content_hit(r) for r in results[0]]
+    results = _milvus_hybrid_search(client, hybrid_kwargs)
+    return _parse_hits(results, _parse_content_hit)
+
+
+# ---- Chunk-pooled content search (content_chunks collection) ----
+
+CHUNK_OUTPUT_FIELDS = ["content_id", "chunk_index", "start_char", "end_char"]
+
+
+def pool_chunk_hits(results: list[dict], pooling: str = "max") -> list[dict]:
+    """
+    Aggregate chunk hits of one query per content_id.
+
+    ``max`` keeps the best chunk score, ``sum`` adds the scores of all
+    matched chunks (rewards contents that match in several places).
+    Returns [{content_id, score, matched_chunks}] sorted by pooled score.
+    """
+    pooled: dict[str, dict] = {}
+    for r in results:
+        entity = r["entity"]
+        content_id = entity.get("content_id", "")
+        entry = pooled.setdefault(content_id, {"content_id": content_id, "score": 0.0, "matched_chunks": []})
+        score = r["distance"]
+        entry["score"] = entry["score"] + score if pooling == "sum" else max(entry["score"], score)
+        entry["matched_chunks"].append({
+            "chunk_index": entity.get("chunk_index", 0),
+            "start_char": entity.get("start_char", 0),
+            "end_char": entity.get("end_char", 0),
+            "score": score,
+        })
+    for entry in pooled.values():
+        entry["matched_chunks"].sort(key=lambda c: -c["score"])
+    return sorted(pooled.values(), key=lambda e: -e["score"])
+
+
+def _content_chunk_search(
+    client: MilvusClient,
+    query_vectors: list,
+    k: int,
+    filter_expr: str | None,
+    pooling: str,
+) -> list[list[dict]]:
+    """Grouped chunk search: at most content_chunk_group_size chunks for each of k contents."""
+    search_kwargs = {
+        "collection_name": settings.milvus_content_chunk_collection_name,
+        "data": query_vectors,
+        "anns_field": "embedding",
+        "limit": k,
+        "group_by_field": "content_id",
+        "group_size": settings.content_chunk_group_size,
+        "output_fields": CHUNK_OUTPUT_FIELDS,
+        "search_params": {"metric_type": "COSINE", "params": {"ef": 256}},
+    }
+    if filter_expr:
+        search_kwargs["filter"] = filter_expr
+
+    results = _milvus_search(client, search_kwargs)
+    with observe_stage("fusion"):
+        return [pool_chunk_hits(list(result), pooling)[:k] for result in results]
+
+
+def _fetch_contents(client: MilvusClient, content_ids: list[str]) -> dict[str, dict]:
+    """Content rows by id, parsed like search hits (score 0)."""
+    if not content_ids:
+        return {}
+    ids_str = ", ".join(json.dumps(cid) for cid in content_ids)
+    rows = milvus_query(
+        client,
+        collection_name=settings.milvus_content_collection_name,
+        filter=f"content_id in [{ids_str}]",
+        output_fields=CONTENT_OUTPUT_FIELDS,
+    )
+    return {row["content_id"]: _parse_content_hit({"entity": row, "distance": 0.0}) for row in rows}
+
+
+def _rrf_scores(rankings: list[list[str]], rrf_k: int = 60) -> dict[str, float]:
+    """Reciprocal rank fusion, same formula as Milvus' RRFRanker."""
+    scores: dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, content_id in enumerate(ranking, start=1):
+            scores[content_id] += 1.0 / (rrf_k + rank)
+    return scores
+
+
+def _content_chunk_pooled_search(
+    client: MilvusClient,
+    query_texts: list[str],
+    query_vectors: list,
+    k: int,
+    search_type: str,
+    filter_expr: str | None,
+    pooling: str,
+) -> list[list[dict]]:
+    """
+    Content search whose dense side runs on transcript chunks.
+
+    semantic: contents ranked by pooled chunk score.
+    hybrid:   pooled chunk ranking fused with the content BM25 ranking (RRF).
+    """
+    pooled_lists = _content_chunk_search(client, query_vectors, k, filter_expr, pooling)
+    if search_type == "hybrid":
+        fulltext_lists = _content_fulltext_search(client, query_texts, k, filter_expr)
+    else:
+        fulltext_lists = [[] for _ in query_texts]
+
+    known = {h["content_id"]: h for hits in fulltext_lists for h in hits}
+    missing = {e["content_id"] for pooled in pooled_lists for e in pooled} - known.keys()
+    rows = {**_fetch_contents(client, sorted(missing)), **known}
+
+    all_hits = []
+    for pooled, fulltext_hits in zip(pooled_lists, fulltext_lists):
+        chunks = {e["content_id"]: e["matched_chunks"] for e in pooled}
+        if search_type == "hybrid":
+            with observe_stage("fusion"):
+                scores = _rrf_scores([[e["content_id"] for e in pooled], [h["content_id"] for h in fulltext_hits]])
+        else:
+            scores = {e["content_id"]: e["score"] for e in pooled}
+        ranked = sorted(scores.items(), key=lambda x: -x[1])
+        hits = []
+        for content_id, score in ranked:
+            row = rows.get(content_id)
+            if row is None:  # chunk left behind by a deleted content
+                continue
+            hits.append({**row, "score": score, "matched_chunks": chunks.get(content_id, [])})
+            if len(hits) == k:
+                break
+        all_hits.append(hits)
+    return all_hits
+
+
+def _content_search(
+    client: MilvusClient,
+    embedding_fn,
+    query_texts: list[str],
+    k: int,
+    search_type: str,
+    filter_expr: str | None = None,
+    query_vectors: list | None = None,
+    chunk_pooling: str | None = None,
+    query_sparse: list | None = None,
+) -> list[list[dict]]:
+    if search_type == "fulltext":
+        return _content_fulltext_search(client, query_texts, k, filter_expr)
+    if query_vectors is None:
+        query_vectors, query_sparse = _encode_queries(embedding_fn, query_texts)
+    if chunk_pooling:
+        return _content_chunk_pooled_search(
+            client, query_texts, query_vectors, k, search_type, filter_expr, chunk_pooling,
+        )
+    if search_type == "hybrid":
+        return _content_hybrid_search(client, query_texts, query_vectors, k, filter_expr, query_sparse)
+    return _content_semantic_search(client, query_vectors, k, filter_expr)
+
+
+def _content_hits(
+    client: MilvusClient,
+    embedding_fn,
+    query_text: str,
+    k: int,
+    search_type: str,
+    filter_expr: str | None = None,
+    query_vectors: list | None = None,
+    chunk_pooling: str | None = None,
+    query_sparse: list | None = None,
+) -> list[dict]:
+    return _content_search(
+        client, embedding_fn, [query_text], k, search_type, filter_expr, query_vectors, chunk_pooling,
+        query_sparse,
+    )[0]
+
+
+def search_content_semantic(
+    client: MilvusClient,
+    embedding_fn,
+    query_text: str,
+    k: int,
+    filter_expr: str | None = None,
+    chunk_pooling: str | None = None,
+) -> dict:
+    hits = _content_hits(client, embedding_fn, query_text, k, "semantic", filter_expr, chunk_pooling=chunk_pooling)
+    facets = build_content_facets(hits)
+    return {"total": len(hits), "hits": hits, "facets": facets}
+
+
+def search_content_fulltext(
+    client: MilvusClient,
+    query_text: str,
+    k: int,
+    filter_expr: str | None = None,
+) -> dict:
+    hits = _content_hits(client, None, query_text, k, "fulltext", filter_expr)
+    facets = build_content_facets(hits)
+    return {"total": len(hits), "hits": hits, "facets": facets}
+
+
+def search_content_hybrid(
+    client: MilvusClient,
+    embedding_fn,
+    query_text: str,
+    k: int,
+    filter_expr: str | None = None,
+    chunk_pooling: str | None = None,
+) -> dict:
+    hits = _content_hits(client, embedding_fn, query_text, k, "hybrid", filter_expr, chunk_pooling=chunk_pooling)
     facets = build_content_facets(hits)
     return {"total": len(hits), "hits": hits, "facets": facets}
+
+
+# ---------------------------------------------------------------------------
+# Joint content + scene search
+# ---------------------------------------------------------------------------
+
+# The scene search runs concurrently with the content search, so it cannot be
+# restricted to the returned contents; over-fetch videos to cover most of them.
+JOINT_SCENE_VIDEO_FACTOR = 2
+
+
+def search_joint(
+    client: MilvusClient,
+    embedding_fn,
+    query_text: str,
+    k: int,
+    scenes_per_content: int,
+    search_type: str = "hybrid",
+) -> dict:
+    """
+    Search contents and scenes with a single query embedding.
+
+    Both collection searches run concurrently; each content hit is annotated
+    with its best-matching scenes (scene.video_id == content.content_id).
+    """
+    query_vectors = query_sparse = None
+    if search_type != "fulltext":
+        query_vectors, query_sparse = _encode_queries(embedding_fn, [query_text])
+
+    scene_videos = min(k * JOINT_SCENE_VIDEO_FACTOR, 100)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        # copy_context: stage timings of both threads reach the request profile
+        content_future = pool.submit(
+            contextvars.copy_context().run,
+            _content_hits, client, embedding_fn, query_text, k, search_type,
+            None, query_vectors, None, query_sparse,
+        )
+        scene_future = pool.submit(
+            contextvars.copy_context().run,
+            _scene_hits, client, embedding_fn, query_text, scene_videos, search_type,
+            None, scenes_per_content, SCENE_OUTPUT_FIELDS, query_vectors, query_sparse,
+        )
+        content_hits = content_future.result()
+        scene_hits = scene_future.result()
+
+    scenes_by_video: dict[str, list[dict]] = defaultdict(list)
+    for scene in scene_hits:
+        scenes_by_video[scene["content_id"]].append(scene)
+
+    for hit in content_hits:
+        hit["scenes"] = scenes_by_video.get(hit["content_id"], [])[:scenes_per_content]
+
+    facets = build_content_facets(content_hits)
+    return {"total": len(content_hits), "hits": content_hits, "facets": facets}
+
+
+# ---------------------------------------------------------------------------
+# Batch (multi-query) search
+# ---------------------------------------------------------------------------
+
+def _needs_query_vector(search_type: str, vector_weights=None) -> bool:
+    if vector_weights:
+        return any(name != "bm25" for name in dict(vector_weights))
+    return search_type != "fulltext"
+
+
+def _encode_batch_queries(embedding_fn, queries: list[dict]) -> dict[str, tuple]:
+    """
+    Encode the distinct query texts that need a dense vector in a single call.
+
+    Maps text -> (dense vector, learned sparse vector or None).
+    """
+    texts = list(dict.fromkeys(
+        q["query_text"] for q in queries
+        if _needs_query_vector(q["search_type"], q.get("vector_weights"))
+    ))
+    if not texts:
+        return {}
+    dense, sparse = _encode_queries(embedding_fn, texts)
+    return dict(zip(texts, zip(dense, sparse if sparse is not None else [None] * len(texts))))
+
+
+def _batch_vectors(vectors: dict[str, tuple], texts: list[str]) -> tuple[list, list | None]:
+    dense = [vectors[t][0] for t in texts]
+    sparse = [vectors[t][1] for t in texts]
+    return dense, (sparse if settings.learned_sparse_enabled else None)
+
+
+def _group_batch_queries(queries: list[dict], key_fields: tuple[str, ...]) -> dict[tuple, list[int]]:
+    """Group query indexes that can share one multi-vector Milvus search."""
+    groups: dict[tuple, list[int]] = defaultdict(list)
+    for i, q in enumerate(queries):
+        groups[tuple(q.get(f) for f in key_fields)].append(i)
+    return groups
+
+
+def search_scene_batch(client: MilvusClient, embedding_fn, queries: list[dict]) -> list[dict]:
+    """
+    Run many scene searches with one embedding call.
+
+    Each query is a dict with query_text, k, search_type, filter_expr,
+    group_size and optional vector_weights (hashable, e.g. a tuple of pairs).
+    Queries sharing all of these go to Milvus as a single multi-vector
+    search.  Results keep the input order.
+    """
+    vectors = _encode_batch_queries(embedding_fn, queries)
+    results: list[dict | None] = [None] * len(queries)
+
+    key_fields = ("search_type", "filter_expr", "k", "group_size", "vector_weights")
+    for key, idxs in _group_batch_queries(queries, key_fields).items():
+        search_type, filter_expr, k, group_size, vector_weights = key
+        texts = [queries[i]["query_text"] for i in idxs]
+        query_vectors = query_sparse = None
+        if _needs_query_vector(search_type, vector_weights):
+            query_vectors, query_sparse = _batch_vectors(vectors, texts)
+        hit_lists = _scene_search(
+            client, embedding_fn, texts, k, search_type,
+            filter_expr, group_size, SCENE_OUTPUT_FIELDS, query_vectors, vector_weights, query_sparse,
+        )
+        for i, hits in zip(idxs, hit_lists):
+            results[i] = {"total": len(hits), "hits": hits, "facets": build_scene_facets(hits)}
+    return results
+
+
+def search_content_batch(client: MilvusClient, embedding_fn, queries: list[dict]) -> list[dict]:
+    """Content counterpart of search_scene_batch (no grouping; chunk_pooling is part of the key)."""
+    vectors = _encode_batch_queries(embedding_fn, queries)
+    results: list[dict | None] = [None] * len(queries)
+
+    key_fields = ("search_type", "filter_expr", "k", "chunk_pooling")
+    for (search_type, filter_expr, k, chunk_pooling), idxs in _group_batch_queries(queries, key_fields).items():
+        texts = [queries[i]["query_text"] for i in idxs]
+        query_vectors = query_sparse = None
+        if search_type != "fulltext":
+            query_vectors, query_sparse = _batch_vectors(vectors, texts)
+        hit_lists = _content_search(
+            client, embedding_fn, texts, k, search_type, filter_expr, query_vectors, chunk_pooling,
+            query_sparse,
+        )
+        for i, hits in zip(idxs, hit_lists):
+            results[i] = {"total": len(hits), "hits": hits, "facets": build_content_facets(hits)}
+    return results
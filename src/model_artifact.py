@@ -0,0 +1,68 @@
+"""
+Local embedding model artifact (MS_EMBEDDING_MODEL_PATH).
+
+scripts/export_model.py downloads the model once into a plain directory with
+safetensors weights (plus tokenizer, sentence-transformers and bge-m3 head
+files).  When MS_EMBEDDING_MODEL_PATH points at it, the sentence_transformers
+and bge_m3 backends load from that directory instead of resolving
+MS_EMBEDDING_MODEL_NAME:
+  - the Hugging Face hub is never contacted (offline switches are set before
+    transformers / huggingface_hub are first imported);
+  - every host loads the same pinned revision recorded in artifact.json;
+  - weights are read from safetensors rather than unpickled.
+MS_EMBEDDING_OFFLINE=true forces offline mode when loading by name from the
+local Hugging Face cache.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from src.config import settings
+
+WEIGHTS_FILE = "model.safetensors"
+WEIGHTS_INDEX_FILE = "model.safetensors.index.json"  # sharded weights
+MANIFEST_FILE = "artifact.json"
+
+_OFFLINE_ENV = ("HF_HUB_OFFLINE", "TRANSFORMERS_OFFLINE")
+
+
+def offline() -> bool:
+    return settings.embedding_offline or bool(settings.embedding_model_path)
+
+
+def has_weights(path: Path) -> bool:
+    return (path / WEIGHTS_FILE).exists() or (path / WEIGHTS_INDEX_FILE).exists()
+
+
+def apply_offline_mode() -> None:
+    """
+    Set the hub offline switches when offline() holds.
+
+    Call before importing the embedding stack: huggingface_hub reads them at
+    import time.
+    """
+    if offline():
+        for var in _OFFLINE_ENV:
+            os.environ[var] = "1"
+
+
+def model_source() -> str:
+    """Path or hub name to load the embedding model from."""
+    if not settings.embedding_model_path:
+        return settings.embedding_model_name
+
+    path = Path(settings.embedding_model_path)
+    if not has_weights(path):
+        raise FileNotFoundError(
+            f"No {WEIGHTS_FILE} in {path}, export it with: python -m scripts.export_model --output {path}"
+        )
+    return str(path)
+
+
+def read_manifest(path: str | Path) -> dict | None:
+    """Model name, revision and files recorded by scripts/export_model.py."""
+    try:
+        return json.loads((Path(path) / MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
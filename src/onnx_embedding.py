@@ -0,0 +1,68 @@
+"""
+ONNX Runtime embedding backend (MS_EMBEDDING_BACKEND=onnx).
+
+Runs a bge-m3 export produced by scripts/export_onnx.py, optionally
+dynamically quantized to int8, and reproduces the dense output of
+SentenceTransformerEmbeddingFunction: CLS pooling + L2 normalisation.
+onnxruntime / transformers are imported lazily so the default backend does
+not need them.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_QUANTIZED_MODEL_FILE = "model_int8.onnx"
+
+
+class OnnxEmbeddingFunction:
+    def __init__(
+        self,
+        model_dir: str,
+        quantized: bool = False,
+        intra_op_threads: int = 0,
+        max_length: int = 8192,
+        batch_size: int = 32,
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = Path(model_dir) / (ONNX_QUANTIZED_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"{model_path} not found, export it with: python -m scripts.export_onnx --output {model_dir}"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        self._session = ort.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self._max_length = max_length
+        self._batch_size = batch_size
+        self.dim = self._session.get_outputs()[0].shape[-1]
+
+    def _encode(self, texts: list[str]) -> list[np.ndarray]:
+        vectors: list[np.ndarray] = []
+        for i in range(0, len(texts), self._batch_size):
+            batch = texts[i:i + self._batch_size]
+            encoded = self.tokenizer(
+                batch, padding=True, truncation=True, max_length=self._max_length, return_tensors="np",
+            )
+            feed = {k: v.astype(np.int64) for k, v in encoded.items() if k in self._input_names}
+            last_hidden = self._session.run(None, feed)[0]
+            cls = last_hidden[:, 0].astype(np.float32)
+            cls /= np.linalg.norm(cls, axis=1, keepdims=True).clip(min=1e-12)
+            vectors.extend(cls)
+        return vectors
+
+    def encode_queries(self, queries: list[str]) -> list[np.ndarray]:
+        return self._encode(list(queries))
+
+    def encode_documents(self, documents: list[str]) -> list[np.ndarray]:
+        return self._encode(list(documents))
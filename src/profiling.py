@@ -0,0 +1,118 @@
+"""
+Opt-in per-request search profiling (``profile=true`` on the search, filter
+and face-search endpoints).
+
+While a request runs inside ``profiling(True)``, every ``observe_stage``
+(src/metrics.py) also adds its time to the request's RequestProfile, and the
+Milvus wrappers in milvus_queries record the parameters and candidate
+counts of each call.  The profile lives in a ContextVar, so concurrent
+requests never see each other's timings; worker threads must be started
+with ``contextvars.copy_context().run`` to contribute.
+
+With MS_PROFILE_DUMP_SAMPLE_RATE > 0 a sampled share of profiled requests
+also writes a cProfile dump (.prof, open with snakeviz / pstats) to
+MS_PROFILE_DUMP_DIR.
+"""
+
+import cProfile
+import logging
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar["RequestProfile | None"] = ContextVar("request_profile", default=None)
+
+# Search kwargs worth reporting (the rest are data / output fields)
+_SEARCH_PARAM_KEYS = ("anns_field", "limit", "filter", "search_params", "group_by_field", "group_size")
+
+
+class RequestProfile:
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()  # joint search records from two threads
+        self.stages: dict[str, float] = {}
+        self.milvus_calls: list[dict] = []
+        self.dump_path: str | None = None
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_milvus_call(self, operation: str, kwargs: dict, results, seconds: float) -> None:
+        params = {key: kwargs[key] for key in _SEARCH_PARAM_KEYS if key in kwargs}
+        if "reqs" in kwargs:
+            params["reqs"] = [
+                {"anns_field": r.anns_field, "limit": r.limit, "param": r.param} for r in kwargs["reqs"]
+            ]
+            params["ranker"] = str(kwargs.get("ranker"))
+        call = {
+            "operation": operation,
+            "collection": kwargs.get("collection_name", ""),
+            "ms": seconds * 1000,
+            "params": params,
+            # hits returned per query vector
+            "candidates": [len(r) for r in results] if operation != "query" else [len(results)],
+        }
+        with self._lock:
+            self.milvus_calls.append(call)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "total_ms": (time.perf_counter() - self._start) * 1000,
+                "stages": {stage: seconds * 1000 for stage, seconds in self.stages.items()},
+                "milvus_calls": list(self.milvus_calls),
+                "dump_path": self.dump_path,
+            }
+
+
+def current_profile() -> RequestProfile | None:
+    return _current.get()
+
+
+def _start_profiler() -> cProfile.Profile | None:
+    if settings.profile_dump_sample_rate <= 0 or random.random() >= settings.profile_dump_sample_rate:
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # another profiler is already active in this thread
+        return None
+    return profiler
+
+
+def _write_dump(profiler: cProfile.Profile, profile: RequestProfile) -> None:
+    try:
+        dump_dir = Path(settings.profile_dump_dir)
+        dump_dir.mkdir(parents=True, exist_ok=True)
+        path = dump_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.prof"
+        profiler.dump_stats(path)
+        profile.dump_path = str(path)
+    except OSError as e:
+        logger.warning(f"Could not write profile dump: {e}")
+
+
+@contextmanager
+def profiling(enabled: bool):
+    """Collect a RequestProfile for the enclosed block when *enabled* (yields it, or None)."""
+    if not enabled:
+        yield None
+        return
+    profile = RequestProfile()
+    token = _current.set(profile)
+    profiler = _start_profiler()
+    try:
+        yield profile
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _write_dump(profiler, profile)
+        _current.reset(token)
@@ -0,0 +1,164 @@
+"""
+Sampled query log of the search endpoints (MS_QUERY_LOG_ENABLED).
+
+One JSON line per logged request, written by a background thread to a
+size-rotated file (MS_QUERY_LOG_PATH plus .1 … .N backups):
+
+    {"ts": "2026-03-02T08:15:00+00:00", "method": "GET", "path": "/v1/search/scene",
+     "params": {"query_text": "bão lũ", "k": 10, "search_type": "hybrid"},
+     "query_text": "bão lũ", "search_type": "hybrid", "k": 10, "filters": {},
+     "status": 200, "latency_ms": 84.2, "result_ids": ["…", …]}
+
+method / path / params | json | form are what ``scripts/load_test.py --mode
+replay`` sends again.  MS_QUERY_LOG_SAMPLE_RATE of the requests is logged,
+plus every request slower than MS_QUERY_LOG_SLOW_MS.  The request thread
+only enqueues the dict; JSON encoding and file I/O happen on the writer
+thread, and records are dropped (ms_query_log_dropped_total) rather than
+blocking a request when the queue is full.
+
+With several uvicorn workers put ``{pid}`` in MS_QUERY_LOG_PATH so each
+process rotates its own file.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.config import settings
+from src.metrics import QUERY_LOG_DROPPED
+
+# Payload keys that are search options rather than filters
+_OPTION_KEYS = {
+    "query_text", "k", "search_type", "face_names", "group_by", "group_size", "vectors", "vector_weights",
+    "chunk_pooling",
+}
+
+_lock = threading.Lock()
+_logger: logging.Logger | None = None
+_listener: logging.handlers.QueueListener | None = None
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record  # formatted on the writer thread
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            QUERY_LOG_DROPPED.inc()
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record.msg, ensure_ascii=False, default=str)
+
+
+def log_path() -> Path:
+    return Path(settings.query_log_path.format(pid=os.getpid()))
+
+
+def _get_logger() -> logging.Logger:
+    global _logger, _listener
+    if _logger is not None:
+        return _logger
+    with _lock:
+        if _logger is None:
+            path = log_path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=settings.query_log_max_bytes, backupCount=settings.query_log_backup_count,
+                encoding="utf-8",
+            )
+            file_handler.setFormatter(_JsonFormatter())
+            records: queue.Queue = queue.Queue(maxsize=settings.query_log_queue_size)
+            _listener = logging.handlers.QueueListener(records, file_handler)
+            _listener.start()
+
+            logger = logging.getLogger("query_log")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.handlers = [_DroppingQueueHandler(records)]
+            _logger = logger
+    return _logger
+
+
+def should_log(latency_s: float) -> bool:
+    if not settings.query_log_enabled:
+        return False
+    if settings.query_log_slow_ms and latency_s * 1000 >= settings.query_log_slow_ms:
+        return True
+    return random.random() < settings.query_log_sample_rate
+
+
+def log_search(request: dict, status: int, latency_s: float, result_ids: list[str]) -> None:
+    """
+    Log one search request (sampled).
+
+    *request* holds method, path and the params / json / form payload as the
+    client sent it; query_text, search_type, k and filters are lifted from the
+    payload for analysis.
+    """
+    if not should_log(latency_s):
+        return
+    payload = request.get("params") or request.get("json") or request.get("form") or {}
+    record = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        **request,
+        "query_text": payload.get("query_text", ""),
+        "search_type": payload.get("search_type"),
+        "k": payload.get("k"),
+        "filters": {key: value for key, value in payload.items() if key not in _OPTION_KEYS and value},
+        "status": status,
+        "latency_ms": round(latency_s * 1000, 3),
+        "result_ids": result_ids,
+    }
+    _get_logger().info(record)
+
+
+def iter_records(path: Path | None = None) -> Iterator[dict]:
+    """
+    Records of a query log and its rotated backups, oldest first (corrupt lines skipped).
+
+    Streamed line by line: the log and its backups can add up to far more than
+    callers need in memory at once.
+    """
+    path = Path(path) if path else Path(settings.query_log_path.replace("{pid}", "*"))
+    files = sorted(path.parent.glob(path.name)) if "*" in path.name else [path]
+    for file in files:
+        backups = sorted(
+            (p for p in file.parent.glob(f"{file.name}.*") if p.suffix[1:].isdigit()),
+            key=lambda p: -int(p.suffix[1:]),
+        )
+        for part in [*backups, file]:
+            if not part.exists():
+                continue
+            with part.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+
+def load_records(path: Path | None = None) -> list[dict]:
+    """All records of iter_records() as a list."""
+    return list(iter_records(path))
+
+
+def shutdown() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _logger, _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+        _logger = _listener = None
@@ -3,10 +3,15 @@ Shared utilities for transforming MongoDB documents to vector DB format
 and syncing (upsert / delete) with the configured vector backend.
 """
 
+import hashlib
 import json
 import logging
+from datetime import date, datetime, timezone
 
 from src.config import settings
+from src.embedding import embed_rows, encode_documents
+from src.metrics import record_flush, record_ingest_batch
+from src.text_analysis import prepare_bm25_text
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +29,61 @@ def parse_time_to_sec(time_str: str) -> float:
     return h * 3600 + m * 60 + s
 
 
+_DATE_ONLY_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y%m%d")
+
+
+def parse_date_to_epoch(value, end_of_day: bool = False) -> int | None:
+    """
+    Normalize a date / datetime value to UTC epoch seconds.
+
+    Accepts datetime / date objects, epoch numbers (seconds or milliseconds),
+    Mongo extended JSON ``{"$date": ...}``, ISO 8601 strings and the common
+    date-only formats ("2026-01-20", "20/01/2026", ...).  Naive values are
+    treated as UTC.  With *end_of_day*, a date-only value maps to its last
+    second so it can be used as an inclusive upper bound.
+
+    Returns None if the value is empty or cannot be parsed.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, dict):
+        return parse_date_to_epoch(value.get("$date"), end_of_day)
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        # Heuristic: anything past year 5138 in seconds is really milliseconds
+        return int(value / 1000) if abs(value) >= 1e11 else int(value)
+
+    date_only = False
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, date):
+        dt = datetime(value.year, value.month, value.day)
+        date_only = True
+    else:
+        text = str(value).strip()
+        dt = None
+        for fmt in _DATE_ONLY_FORMATS:
+            try:
+                dt = datetime.strptime(text, fmt)
+                date_only = True
+                break
+            except ValueError:
+                continue
+        if dt is None:
+            try:
+                dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+            except ValueError:
+                return None
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    epoch = int(dt.timestamp())
+    if date_only and end_of_day:
+        epoch += 86399
+    return epoch
+
+
 def transform_mongo_doc(doc: dict) -> list[dict]:
     """
     Transform a single MongoDB video_queue document into a list of
@@ -166,18 +226,58 @@ def transform_mongo_doc_to_content(doc: dict) -> dict | None:
         category = first_scene.get("category", first_scene.get("video_type", ""))
         author = first_scene.get("author", "")
 
+    video_summary = enriched.get("audio", {}).get("summary", "")
+
+    broadcast_date = doc.get("broadcast_date") or ""
+    if hasattr(broadcast_date, "isoformat"):
+        broadcast_date = broadcast_date.isoformat()
+
     return {
         "content_id": video_id,
         "title": video_title,
         "description": description,
+        "video_summary": video_summary,
         "tags": json.dumps(video_tags),
         "duration_sec": duration_sec,
         "created_at": created_at,
+        "created_at_ts": parse_date_to_epoch(created_at) or 0,
         "category": category,
         "author": author,
+        "video_name": doc.get("video_name", ""),
+        "resolution": doc.get("resolution", ""),
+        "fps": doc.get("fps") or 0.0,
+        "program_id": doc.get("program_id", ""),
+        "broadcast_date": broadcast_date,
+        "broadcast_date_ts": parse_date_to_epoch(broadcast_date) or 0,
+        "content_type_id": doc.get("content_type_id", ""),
     }
 
 
+# Fields of a video_queue document read by the transforms above; reconciliation
+# (scripts/reconcile.py) fetches only these to recompute digests.
+SOURCE_PROJECTION = {
+    field: 1 for field in (
+        "unique_id", "status", "title", "video_name", "video_tags", "video_created_at",
+        "video_duration_sec", "resolution", "fps", "program_id", "broadcast_date", "content_type_id",
+        "enriched_data.scene_list", "enriched_data.audio", "enriched_data.video_info",
+    )
+}
+
+
+SOURCE_DIGEST_FIELD = "source_digest"
+
+
+def source_digest(item: dict) -> str:
+    """
+    Digest of a transformed scene / content, stored as source_digest in Milvus.
+
+    Computed before embedding, so equal digests mean the vector DB row is
+    up to date with MongoDB without re-embedding anything.
+    """
+    canonical = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
 def get_scene_ids_from_doc(doc: dict) -> list[str]:
     """Extract all scene_ids from a MongoDB document."""
     enriched = doc.get("enriched_data", {})
@@ -203,16 +303,36 @@ def sync_upsert_scenes(scenes: list[dict]) -> int:
 
 def sync_upsert_content(content: dict) -> int:
     """Upsert a single content document to the contents collection. Returns 1 on success."""
-    if not content or settings.backend != "milvus":
+    if not content:
+        return 0
+    return sync_upsert_contents([content])
+
+
+def sync_upsert_contents(contents: list[dict]) -> int:
+    """
+    Upsert content documents with one encode call and one flush.
+    Returns the number of upserted contents.
+    """
+    if not contents or settings.backend != "milvus":
         return 0
-    return _upsert_milvus_content(content)
+    return _upsert_milvus_contents(contents)
 
 
 def sync_delete_content(content_id: str) -> int:
     """Delete a content document from the contents collection."""
-    if not content_id or settings.backend != "milvus":
+    if not content_id:
+        return 0
+    return sync_delete_contents([content_id])
+
+
+def sync_delete_contents(content_ids: list[str]) -> int:
+    """
+    Delete content documents (and their chunks) with one filter and one flush.
+    Returns the number of deleted contents.
+    """
+    if not content_ids or settings.backend != "milvus":
         return 0
-    return _delete_milvus_content(content_id)
+    return _delete_milvus_contents(content_ids)
 
 
 def sync_delete_scenes(scene_ids: list[str]) -> int:
@@ -232,8 +352,28 @@ def sync_delete_scenes(scene_ids: list[str]) -> int:
 # Milvus backend
 # ---------------------------------------------------------------------------
 
+def add_scene_modality_vectors(embedding_fn, docs: list[dict]) -> None:
+    """
+    Fill visual_embedding / audio_embedding of scene rows (one encode call).
+
+    Scenes without a caption or audio text fall back to scene_description so
+    every row gets a meaningful vector.
+    """
+    visual_texts = [d.get("visual_caption") or d["scene_description"] for d in docs]
+    audio_texts = [
+        "\n".join(filter(None, [d.get("audio_summarization"), d.get("audio_transcription")]))
+        or d["scene_description"]
+        for d in docs
+    ]
+    vectors = encode_documents(embedding_fn, visual_texts + audio_texts)
+    for i, doc in enumerate(docs):
+        doc["visual_embedding"] = vectors[i]
+        doc["audio_embedding"] = vectors[len(docs) + i]
+
+
 def _upsert_milvus(scenes: list[dict]) -> int:
     from src.milvus_client import get_embedding_fn, get_milvus_client
+    from src.milvus_manager import has_source_digest
 
     client = get_milvus_client()
     embedding_fn = get_embedding_fn()
@@ -245,36 +385,59 @@ def _upsert_milvus(scenes: list[dict]) -> int:
         combined_text = f"{scene['scene_description']} {video['video_title']}".strip()
         combined_texts.append(combined_text)
 
+        video_created_at = video.get("video_created_at")
+        if hasattr(video_created_at, "isoformat"):
+            video_created_at = video_created_at.isoformat()
+        video_created_at = video_created_at or ""
+        broadcast_date = video.get("broadcast_date") or ""
+        if hasattr(broadcast_date, "isoformat"):
+            broadcast_date = broadcast_date.isoformat()
+        created_date = scene.get("created_date", "")
+
         docs.append({
             "scene_id": scene["scene_id"],
             "scene_description": scene["scene_description"],
+            "visual_caption": scene.get("visual_caption", ""),
+            "audio_summarization": scene.get("audio_summarization", ""),
+            "audio_transcription": scene.get("audio_transcription", ""),
+            "faces": json.dumps(scene.get("faces", []), ensure_ascii=False, default=str),
             "start_time_sec": scene["start_time_sec"],
             "end_time_sec": scene["end_time_sec"],
             "video_id": video["video_id"],
             "video_title": video["video_title"],
+            "video_name": video.get("video_name", ""),
             "video_summary": video.get("video_summary") or video.get("video_description") or "",
             "video_tags": json.dumps(video.get("video_tags", [])),
             "video_duration_sec": video.get("video_duration_sec") or 0.0,
-            "video_created_at": (
-                video["video_created_at"].isoformat()
-                if hasattr(video.get("video_created_at"), "isoformat")
-                else (video.get("video_created_at") or "")
-            ),
+            "video_created_at": video_created_at,
+            "video_created_at_ts": parse_date_to_epoch(video_created_at) or 0,
+            "resolution": video.get("resolution", ""),
+            "fps": video.get("fps") or 0.0,
+            "program_id": video.get("program_id", ""),
+            "broadcast_date": broadcast_date,
+            "broadcast_date_ts": parse_date_to_epoch(broadcast_date) or 0,
+            "content_type_id": video.get("content_type_id", ""),
             "category": scene.get("category", ""),
-            "created_date": scene.get("created_date", ""),
+            "created_date": created_date,
+            "created_date_ts": parse_date_to_epoch(created_date) or 0,
             "author": scene.get("author", ""),
-            "bm25_text": combined_text,
+            "bm25_text": prepare_bm25_text(combined_text),
         })
 
-    vectors = embedding_fn.encode_documents(combined_texts)
-    for i, doc in enumerate(docs):
-        doc["embedding"] = vectors[i]
+    if has_source_digest(client, settings.milvus_collection_name):
+        for doc, scene in zip(docs, scenes):
+            doc[SOURCE_DIGEST_FIELD] = source_digest(scene)
+    embed_rows(embedding_fn, docs, combined_texts)
+    if settings.scene_multi_vector_enabled:
+        add_scene_modality_vectors(embedding_fn, docs)
 
     res = client.upsert(
         collection_name=settings.milvus_collection_name,
         data=docs,
     )
+    record_ingest_batch(settings.milvus_collection_name, len(docs))
     client.flush(collection_name=settings.milvus_collection_name)
+    record_flush(settings.milvus_collection_name)
     count = res.get("upsert_count", len(docs))
     logger.info("Milvus upsert: %d scenes", count)
     return count
@@ -291,17 +454,13 @@ def _delete_milvus(scene_ids: list[str]) -> int:
         filter=filter_expr,
     )
     client.flush(collection_name=settings.milvus_collection_name)
+    record_flush(settings.milvus_collection_name)
     logger.info("Milvus delete: %d scenes", len(scene_ids))
     return len(scene_ids)
 
 
-def _upsert_milvus_content(content: dict) -> int:
-    from src.milvus_client import get_embedding_fn, get_milvus_client
-
-    client = get_milvus_client()
-    embedding_fn = get_embedding_fn()
-
-    # Build combined text for dense embedding: title + description + tags
+def _content_text(content: dict) -> str:
+    """Combined text for the dense embedding: title + description + tags."""
     tags_list = content.get("tags", "[]")
     if isinstance(tags_list, str):
         try:
@@ -309,37 +468,62 @@ def _upsert_milvus_content(content: dict) -> int:
         except Exception:
             tags_list = []
     tags_text = " ".join(tags_list) if isinstance(tags_list, list) else ""
+    return f"{content['title']} {content['description']} {tags_text}".strip()
+
 
-    combined_text = f"{content['title']} {content['description']} {tags_text}".strip()
+def _upsert_milvus_contents(contents: list[dict]) -> int:
+    from src.milvus_client import get_embedding_fn, get_milvus_client
+    from src.milvus_manager import has_source_digest
+
+    client = get_milvus_client()
+    embedding_fn = get_embedding_fn()
 
-    # BM25 text field (Milvus auto-generates sparse vector)
-    content["bm25_text"] = combined_text
+    with_digest = has_source_digest(client, settings.milvus_content_collection_name)
+    combined_texts = []
+    for content in contents:
+        combined_text = _content_text(content)
+        if with_digest:
+            content[SOURCE_DIGEST_FIELD] = source_digest(content)
+        # BM25 text field (Milvus auto-generates sparse vector)
+        content["bm25_text"] = prepare_bm25_text(combined_text)
+        combined_texts.append(combined_text)
 
-    vectors = embedding_fn.encode_documents([combined_text])
-    content["embedding"] = vectors[0]
+    embed_rows(embedding_fn, contents, combined_texts)
 
     res = client.upsert(
         collection_name=settings.milvus_content_collection_name,
-        data=[content],
+        data=contents,
     )
+    record_ingest_batch(settings.milvus_content_collection_name, len(contents))
     client.flush(collection_name=settings.milvus_content_collection_name)
-    count = res.get("upsert_count", 1)
-    logger.info("Milvus content upsert: content_id=%s", content["content_id"])
+    record_flush(settings.milvus_content_collection_name)
+    if settings.content_chunks_enabled:
+        from src.content_chunks import upsert_content_chunks
+
+        upsert_content_chunks(client, embedding_fn, contents)
+    count = res.get("upsert_count", len(contents))
+    logger.info("Milvus content upsert: %d contents", count)
     return count
 
 
-def _delete_milvus_content(content_id: str) -> int:
+def _delete_milvus_contents(content_ids: list[str]) -> int:
     from src.milvus_client import get_milvus_client
 
     client = get_milvus_client()
-    filter_expr = f'content_id in ["{content_id}"]'
+    ids_str = ", ".join(json.dumps(cid) for cid in content_ids)
     client.delete(
         collection_name=settings.milvus_content_collection_name,
-        filter=filter_expr,
+        filter=f"content_id in [{ids_str}]",
     )
     client.flush(collection_name=settings.milvus_content_collection_name)
-    logger.info("Milvus content delete: content_id=%s", content_id)
-    return 1
+    record_flush(settings.milvus_content_collection_name)
+    if settings.content_chunks_enabled:
+        from src.content_chunks import delete_content_chunks
+
+        # Deletes are visible without a flush; the contents flush above persists the batch
+        delete_content_chunks(client, content_ids, flush=False)
+    logger.info("Milvus content delete: %d contents", len(content_ids))
+    return len(content_ids)
 
 
 # ---------------------------------------------------------------------------
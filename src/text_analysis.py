@@ -0,0 +1,91 @@
+"""
+Vietnamese-aware text analysis for the BM25 field (bm25_text).
+
+Milvus' "standard" analyzer splits on every syllable, so "học sinh" matches
+any text containing "học" or "sinh".  Two stages, configured in settings:
+
+- Word segmentation (MS_BM25_WORD_SEGMENTER = pyvi | underthesea) runs in
+  Python on the ingest text *and* on fulltext queries, joining the syllables
+  of a word with "_" ("học_sinh"), which the standard tokenizer keeps as one
+  token.
+- Diacritic folding (MS_BM25_FOLD_DIACRITICS) and stopwords (MS_BM25_STOPWORDS)
+  are Milvus analyzer filters (see build_analyzer_params), applied to stored
+  text and queries alike.
+
+Changing any of these needs a collection drop / recreate and a full re-sync.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+from src.config import settings
+
+WORD_SEGMENTERS = ("none", "pyvi", "underthesea")
+
+# Common Vietnamese function words, in segmented form
+VIETNAMESE_STOPWORDS = [
+    "và", "của", "là", "các", "những", "được", "có", "cho", "với", "trong", "này", "đó",
+    "thì", "mà", "để", "một", "khi", "đã", "đang", "sẽ", "cũng", "từ", "theo", "về", "tại",
+    "như", "nhưng", "hay", "hoặc", "nên", "vì", "do", "bị", "rằng", "lại", "ra", "vào",
+    "rất", "nhiều", "còn", "nếu", "thế", "nào", "gì", "ai", "đây", "kia", "ấy", "vẫn",
+    "tuy_nhiên", "vì_vậy", "do_đó", "trong_khi", "bởi_vì", "thế_nhưng", "chúng_tôi", "chúng_ta",
+]
+
+
+@lru_cache(maxsize=1)
+def _segmenter(name: str):
+    """Word segmentation function for *name*; the libraries are optional."""
+    if name == "pyvi":
+        from pyvi import ViTokenizer
+
+        return ViTokenizer.tokenize
+    if name == "underthesea":
+        from underthesea import word_tokenize
+
+        return lambda text: word_tokenize(text, format="text")
+    raise ValueError(f"Unknown word segmenter: {name}, expected one of {', '.join(WORD_SEGMENTERS)}")
+
+
+def segment_words(text: str, segmenter: str | None = None) -> str:
+    """Join multi-syllable words with "_" ("học sinh" -> "học_sinh")."""
+    segmenter = segmenter or settings.bm25_word_segmenter
+    if segmenter == "none" or not text:
+        return text
+    return _segmenter(segmenter)(text)
+
+
+def prepare_bm25_text(text: str) -> str:
+    """Text for bm25_text at ingest time; fulltext queries go through the same function."""
+    return segment_words(text)
+
+
+def prepare_bm25_queries(query_texts: list[str]) -> list[str]:
+    return [prepare_bm25_text(t) for t in query_texts]
+
+
+def load_stopwords(spec: str | None = None) -> list[str]:
+    """
+    Stopwords from MS_BM25_STOPWORDS: "" (none), "vi" (built-in list) or a
+    file path with one word per line ("#" comments allowed).
+    """
+    spec = settings.bm25_stopwords if spec is None else spec
+    if not spec:
+        return []
+    if spec == "vi":
+        return list(VIETNAMESE_STOPWORDS)
+    lines = Path(spec).read_text(encoding="utf-8").splitlines()
+    return [w.strip().lower() for w in lines if w.strip() and not w.lstrip().startswith("#")]
+
+
+def build_analyzer_params() -> dict:
+    """Milvus analyzer_params for bm25_text."""
+    stopwords = load_stopwords()
+    if not stopwords and not settings.bm25_fold_diacritics:
+        return {"type": "standard"}
+    filters: list = ["lowercase"]  # what the standard analyzer applies
+    if stopwords:
+        # Before folding, so the list can be written with diacritics
+        filters.append({"type": "stop", "stop_words": stopwords})
+    if settings.bm25_fold_diacritics:
+        filters.append("asciifolding")
+    return {"tokenizer": "standard", "filter": filters}
@@ -0,0 +1,159 @@
+"""
+Startup warmup (MS_WARMUP_ENABLED), started by the API lifespan in a
+background thread so the process can answer /health while it runs.
+
+Steps with the Milvus backend (timed in state.steps):
+  load_model, dummy_batch — load the embedding function and encode a dummy
+                            batch (weights, tokenizer, first-call allocations);
+  queries                 — pre-embed the MS_WARMUP_TOP_QUERIES most frequent
+                            query texts of the query log (src/query_log.py)
+                            into the query embedding cache;
+  searches                — MS_WARMUP_SEARCHES semantic and fulltext searches
+                            per collection so Milvus pages in index segments.
+With OpenSearch only the searches run, as semantic searches on the scene index.
+
+/ready answers 503 until warmup is done.  A failed warmup (Milvus down, model
+missing) is retried every MS_WARMUP_RETRY_SEC until it succeeds or the API
+shuts down.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WARMUP_QUERY = "warmup"
+
+
+class WarmupState:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.status = "pending"  # pending | running | done | failed | disabled
+        self.attempts = 0
+        self.steps: dict[str, float] = {}  # step -> seconds of the last attempt
+        self.queries_cached = 0
+        self.error: str | None = None
+        self.finished_at: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status in ("done", "disabled")
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "status": self.status,
+                "attempts": self.attempts,
+                "steps_ms": {step: seconds * 1000 for step, seconds in self.steps.items()},
+                "queries_cached": self.queries_cached,
+                "error": self.error,
+            }
+
+
+state = WarmupState()
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+
+
+def popular_queries(limit: int) -> list[str]:
+    """Most frequent query texts of the query log (empty without a log)."""
+    from src.query_log import iter_records
+
+    counts = Counter(r["query_text"] for r in iter_records() if r.get("query_text"))
+    return [text for text, _ in counts.most_common(limit)]
+
+
+def _timed(step: str, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    with state._lock:
+        state.steps[step] = time.perf_counter() - start
+    return result
+
+
+def _warm_model(embedding_fn) -> None:
+    embedding_fn.encode_queries([_WARMUP_QUERY] * 4)
+    embedding_fn.encode_documents([" ".join([_WARMUP_QUERY] * 256)])
+
+
+def _warm_milvus_searches(client, embedding_fn, queries: list[str]) -> None:
+    from src import milvus_queries as mq
+
+    queries = queries[:settings.warmup_searches] or [_WARMUP_QUERY]
+    for query in queries:
+        mq.search_scene_semantic(client, embedding_fn, query, 10)
+        mq.search_scene_fulltext(client, query, 10)
+        mq.search_content_semantic(client, embedding_fn, query, 10)
+        mq.search_content_fulltext(client, query, 10)
+        if settings.content_chunks_enabled:
+            mq.search_content_semantic(client, embedding_fn, query, 10, chunk_pooling="max")
+
+
+def _warm_opensearch_searches(queries: list[str]) -> None:
+    from src.opensearch_client import get_client
+    from src.queries import build_semantic_query
+
+    client = get_client()
+    for query in queries[:settings.warmup_searches] or [_WARMUP_QUERY]:
+        client.search(index=settings.index_name, body=build_semantic_query(query, 10))
+
+
+def run_warmup() -> bool:
+    """One warmup attempt; returns True when it completed."""
+    with state._lock:
+        state.status = "running"
+        state.attempts += 1
+        state.steps = {}
+    try:
+        queries = popular_queries(settings.warmup_top_queries)
+        if settings.backend == "milvus":
+            from src.milvus_client import get_embedding_fn, get_milvus_client
+            from src.milvus_queries import warm_query_cache
+
+            embedding_fn = _timed("load_model", get_embedding_fn)
+            _timed("dummy_batch", _warm_model, embedding_fn)
+            state.queries_cached = _timed("queries", warm_query_cache, embedding_fn, queries)
+            _timed("searches", _warm_milvus_searches, get_milvus_client(), embedding_fn, queries)
+        else:
+            _timed("searches", _warm_opensearch_searches, queries)
+    except Exception as e:
+        with state._lock:
+            state.status = "failed"
+            state.error = str(e)
+        logger.warning(f"Warmup failed (attempt {state.attempts}, retry in {settings.warmup_retry_sec}s): {e}")
+        return False
+
+    with state._lock:
+        state.status = "done"
+        state.error = None
+        state.finished_at = time.time()
+    logger.info("Warmup done: %s", {step: round(s, 2) for step, s in state.steps.items()})
+    return True
+
+
+def _run_until_done() -> None:
+    while not _stop.is_set():
+        if run_warmup():
+            return
+        _stop.wait(settings.warmup_retry_sec)
+
+
+def start() -> None:
+    """Start the warmup thread (or mark warmup disabled)."""
+    global _thread
+    if not settings.warmup_enabled:
+        state.status = "disabled"
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run_until_done, name="warmup", daemon=True)
+    _thread.start()
+
+
+def stop() -> None:
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=1.0)
@@ -0,0 +1,125 @@
+"""
+Test the benchmark harness (benchmarks/) and its in-memory Milvus stand-in
+"""
+import pytest
+from pymilvus import AnnSearchRequest, RRFRanker
+
+from benchmarks.compare import compare
+from benchmarks.corpus import generate_corpus, generate_queries
+from benchmarks.run import parse_args, run
+from benchmarks.stand_ins import HashEmbeddingFunction, InMemoryMilvusClient
+from src import milvus_client
+from src.config import settings
+from src.sync_utils import transform_mongo_doc, transform_mongo_doc_to_content
+
+
+def _rows():
+    fn = HashEmbeddingFunction(16)
+    texts = ["bộ y tế cảnh báo", "bản đồ việt nam", "y tế dịch bệnh", "thời tiết hà nội"]
+    vectors = fn.encode_documents(texts)
+    return [
+        {"scene_id": f"s{i}", "video_id": f"v{i % 2}", "bm25_text": text, "embedding": vectors[i]}
+        for i, text in enumerate(texts)
+    ]
+
+
+class TestCorpus:
+    """Test the synthetic video_queue documents"""
+
+    def test_deterministic_and_transformable(self):
+        """Test that a seed gives the same corpus and every doc transforms"""
+        corpus = generate_corpus(3, 4, seed=7)
+        assert corpus == generate_corpus(3, 4, seed=7)
+        for doc in corpus:
+            assert len(transform_mongo_doc(doc)) == 4
+            assert transform_mongo_doc_to_content(doc)["content_id"] == doc["unique_id"]
+
+    def test_queries(self):
+        """Test that queries are short non-empty texts"""
+        queries = generate_queries(5)
+        assert len(queries) == 5
+        assert all(1 <= len(q.split()) <= 6 for q in queries)
+
+
+class TestInMemoryClient:
+    """Test the MilvusClient stand-in"""
+
+    def test_dense_search_ranks_same_text_first(self):
+        """Test cosine search over the embedding field"""
+        client = InMemoryMilvusClient()
+        client.upsert(collection_name="scenes", data=_rows())
+        query = HashEmbeddingFunction(16).encode_queries(["bản đồ việt nam"])
+        hits = client.search(collection_name="scenes", data=query, anns_field="embedding", limit=2,
+                             output_fields=["scene_id"])
+        assert len(hits[0]) == 2
+        assert hits[0][0]["entity"] == {"scene_id": "s1"}
+
+    def test_bm25_search_and_grouping(self):
+        """Test text search with group_by_field / group_size"""
+        client = InMemoryMilvusClient()
+        client.upsert(collection_name="scenes", data=_rows())
+        hits = client.search(collection_name="scenes", data=["y tế"], anns_field="sparse_embedding", limit=1,
+                             group_by_field="video_id", group_size=2)[0]
+        assert {h["id"] for h in hits} == {"s0", "s2"}
+
+    def test_hybrid_filter_and_delete(self):
+        """Test RRF fusion with a filter, and delete by filter"""
+        client = InMemoryMilvusClient()
+        client.upsert(collection_name="scenes", data=_rows())
+        query = HashEmbeddingFunction(16).encode_queries(["y tế"])
+        reqs = [
+            AnnSearchRequest(data=query, anns_field="embedding", param={}, limit=4),
+            AnnSearchRequest(data=["y tế"], anns_field="sparse_embedding", param={}, limit=4),
+        ]
+        hits = client.hybrid_search(collection_name="scenes", reqs=reqs, ranker=RRFRanker(60), limit=4,
+                                    filter='video_id == "v0"')[0]
+        assert {h["id"] for h in hits} == {"s0", "s2"}
+
+        client.delete(collection_name="scenes", filter='scene_id in ["s0", "s1"]')
+        assert client.get_collection_stats("scenes")["row_count"] == 2
+
+    def test_unsupported_filter(self):
+        """Test that filters the stand-in cannot evaluate are rejected"""
+        with pytest.raises(ValueError):
+            InMemoryMilvusClient().query(collection_name="scenes", filter="start_time_sec > 10")
+
+
+class TestRunner:
+    """Test a small end-to-end run and report comparison"""
+
+    def test_report(self, monkeypatch):
+        """Test that every benchmark reports and the report compares with itself"""
+        monkeypatch.setattr(settings, "backend", settings.backend)
+        monkeypatch.setattr(milvus_client, "_client", None)
+        monkeypatch.setattr(milvus_client, "_embedding_fn", None)
+        args = parse_args([
+            "--videos", "4", "--scenes-per-video", "3", "--queries", "3", "--repeat", "1",
+            "--k", "5", "--client", "memory",
+        ])
+
+        report = run(args)
+
+        results = report["results"]
+        assert report["meta"]["params"]["videos"] == 4
+        assert results["full_sync"]["count"] == 4
+        assert results["ingest.scenes"]["count"] == 12
+        assert results["search.scene.hybrid.k5"]["n"] == 3
+        assert results["facets.content.k5"]["hits"] == 4
+        rows = compare(report, report)
+        assert len(rows) == len(results)
+        assert not any(row["regression"] for row in rows)
+
+    def test_compare_flags_regressions(self):
+        """Test that slower latency and lower throughput are regressions"""
+        base = {"results": {
+            "search": {"unit": "ms", "p50": 10.0},
+            "ingest": {"unit": "rows/s", "value": 100.0},
+        }}
+        head = {"results": {
+            "search": {"unit": "ms", "p50": 12.0},
+            "ingest": {"unit": "rows/s", "value": 80.0},
+        }}
+        rows = {row["name"]: row for row in compare(base, head, threshold=0.1)}
+        assert rows["search"]["regression"]
+        assert rows["ingest"]["regression"]
+        assert not compare(head, base, threshold=0.1)[0]["regression"]
@@ -0,0 +1,151 @@
+"""
+Test transcript chunking and chunk-pooled content search
+"""
+from src.config import settings
+from src.content_chunks import build_chunk_rows, delete_content_chunks, split_into_windows, upsert_content_chunks
+from src.milvus_queries import pool_chunk_hits, search_content_hybrid, search_content_semantic
+
+
+def chunk_hit(content_id, chunk_index, score):
+    return {
+        "distance": score,
+        "entity": {"content_id": content_id, "chunk_index": chunk_index,
+                   "start_char": chunk_index * 10, "end_char": chunk_index * 10 + 10},
+    }
+
+
+class FakeEmbeddingFn:
+    def encode_queries(self, texts):
+        return [[1.0, 0.0] for _ in texts]
+
+    def encode_documents(self, texts):
+        return [[0.0, 1.0] for _ in texts]
+
+
+class ChunkClient:
+    """content_chunks returns chunk hits, contents answers queries and BM25 search."""
+
+    def __init__(self):
+        self.calls = []
+
+    def search(self, **kwargs):
+        self.calls.append(("search", kwargs))
+        if kwargs["collection_name"] == settings.milvus_content_chunk_collection_name:
+            return [[chunk_hit("c1", 0, 0.6), chunk_hit("c2", 3, 0.7), chunk_hit("c1", 2, 0.5),
+                     chunk_hit("gone", 0, 0.9)]]
+        return [[{"distance": 5.0, "entity": {"content_id": "c3", "title": "BM25 only"}}]]
+
+    def query(self, **kwargs):
+        self.calls.append(("query", kwargs))
+        return [{"content_id": cid, "title": cid.upper()} for cid in ("c1", "c2")]
+
+    def delete(self, **kwargs):
+        self.calls.append(("delete", kwargs))
+
+    def insert(self, **kwargs):
+        self.calls.append(("insert", kwargs))
+
+    def flush(self, **kwargs):
+        self.calls.append(("flush", kwargs))
+
+
+class TestSplitIntoWindows:
+    """Test overlapping window splitting"""
+
+    def test_short_text_single_window(self):
+        assert split_into_windows("hello world", 100, 10) == [(0, 11)]
+        assert split_into_windows("", 100, 10) == [(0, 0)]
+
+    def test_windows_cover_text_with_overlap(self):
+        text = " ".join(f"word{i}" for i in range(200))
+        windows = split_into_windows(text, 100, 30)
+
+        assert windows[0][0] == 0
+        assert windows[-1][1] == len(text)
+        for (s1, e1), (s2, e2) in zip(windows, windows[1:]):
+            assert s2 < e1  # overlap
+            assert s2 > s1  # progress
+            assert e1 - s1 <= 100
+        # windows end on word boundaries
+        assert all(e == len(text) or text[e] == " " for _, e in windows)
+
+    def test_overlap_larger_than_window_terminates(self):
+        windows = split_into_windows("x" * 1000, 100, 500)
+        assert windows[-1][1] == 1000
+
+
+class TestChunkRows:
+    """Test chunk row construction and writes"""
+
+    def test_rows_carry_offsets_and_filter_fields(self, monkeypatch):
+        monkeypatch.setattr(settings, "content_chunk_chars", 20)
+        monkeypatch.setattr(settings, "content_chunk_overlap", 5)
+        content = {"content_id": "c1", "title": "Title", "description": "alpha beta gamma delta epsilon zeta",
+                   "category": "news", "created_at_ts": 123}
+        rows, texts = build_chunk_rows(content)
+
+        assert len(rows) > 1
+        assert [r["chunk_id"] for r in rows] == [f"c1#{i}" for i in range(len(rows))]
+        assert rows[0]["category"] == "news" and rows[0]["created_at_ts"] == 123
+        assert rows[0]["broadcast_date_ts"] == 0 and rows[0]["author"] == ""
+        first = rows[0]
+        assert texts[0] == "Title\n" + content["description"][first["start_char"]:first["end_char"]]
+
+    def test_upsert_replaces_old_chunks(self):
+        client = ChunkClient()
+        count = upsert_content_chunks(client, FakeEmbeddingFn(), [{"content_id": "c1", "title": "T"}])
+
+        assert count == 1
+        ops = [op for op, _ in client.calls]
+        assert ops == ["delete", "insert", "flush"]
+        assert client.calls[0][1]["filter"] == 'content_id in ["c1"]'
+        assert client.calls[1][1]["data"][0]["embedding"] == [0.0, 1.0]
+
+    def test_delete_escapes_ids(self):
+        """Test that quotes and backslashes in ids cannot break out of the filter"""
+        client = ChunkClient()
+        delete_content_chunks(client, ['a"b', "c\\"], flush=False)
+
+        assert client.calls == [("delete", {
+            "collection_name": settings.milvus_content_chunk_collection_name,
+            "filter": 'content_id in ["a\\"b", "c\\\\"]',
+        })]
+
+
+class TestChunkPooling:
+    """Test pooling chunk hits per content"""
+
+    def test_max_and_sum(self):
+        hits = [chunk_hit("a", 0, 0.6), chunk_hit("b", 0, 0.7), chunk_hit("a", 1, 0.5)]
+
+        by_max = pool_chunk_hits(hits, "max")
+        assert [(e["content_id"], e["score"]) for e in by_max] == [("b", 0.7), ("a", 0.6)]
+
+        by_sum = pool_chunk_hits(hits, "sum")
+        assert by_sum[0]["content_id"] == "a"
+        assert by_sum[0]["score"] == 1.1
+        assert [c["chunk_index"] for c in by_sum[0]["matched_chunks"]] == [0, 1]
+
+    def test_semantic_search_uses_chunks(self):
+        client = ChunkClient()
+        result = search_content_semantic(client, FakeEmbeddingFn(), "q", k=5, filter_expr='category == "news"',
+                                         chunk_pooling="sum")
+
+        search = client.calls[0][1]
+        assert search["collection_name"] == settings.milvus_content_chunk_collection_name
+        assert search["group_by_field"] == "content_id"
+        assert search["filter"] == 'category == "news"'
+        # "gone" has chunks but no content row and is dropped
+        assert [h["content_id"] for h in result["hits"]] == ["c1", "c2"]
+        assert result["hits"][0]["title"] == "C1"
+        assert len(result["hits"][0]["matched_chunks"]) == 2
+
+    def test_hybrid_fuses_with_bm25(self):
+        client = ChunkClient()
+        result = search_content_hybrid(client, FakeEmbeddingFn(), "q", k=10, chunk_pooling="max")
+
+        ids = [h["content_id"] for h in result["hits"]]
+        assert set(ids) == {"c1", "c2", "c3"}
+        bm25_hit = next(h for h in result["hits"] if h["content_id"] == "c3")
+        assert bm25_hit["title"] == "BM25 only"
+        assert bm25_hit["matched_chunks"] == []
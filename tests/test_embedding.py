@@ -0,0 +1,143 @@
+"""
+Test document embedding preprocessing (token budget + length buckets)
+"""
+import re
+
+import numpy as np
+import pytest
+
+from src.embedding import encode_documents, split_to_budget
+
+
+class WhitespaceTokenizer:
+    """One token per word, with character offsets like a fast tokenizer"""
+    is_fast = True
+
+    def __call__(self, texts, add_special_tokens=False, return_offsets_mapping=False):
+        out = {"input_ids": [], "offset_mapping": []}
+        for text in texts:
+            spans = [m.span() for m in re.finditer(r"\S+", text)]
+            out["input_ids"].append(list(range(len(spans))))
+            out["offset_mapping"].append(spans)
+        return out
+
+
+class LengthEmbeddingFn:
+    """Vector = [word count, 1] normalised; records every batch"""
+
+    def __init__(self):
+        self.tokenizer = WhitespaceTokenizer()
+        self.batches = []
+
+    def encode_documents(self, texts):
+        self.batches.append(list(texts))
+        vecs = []
+        for t in texts:
+            v = np.array([len(t.split()), 1.0], dtype=np.float32)
+            vecs.append(v / np.linalg.norm(v))
+        return vecs
+
+
+def words(n, prefix="w"):
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+
+class TestSplitToBudget:
+    """Test per-item token budget"""
+
+    def test_short_text_unchanged(self):
+        assert split_to_budget(["a b c"], WhitespaceTokenizer(), 10, "head_tail") == [[("a b c", 3)]]
+
+    def test_head_tail_keeps_both_ends(self):
+        [[(text, n)]] = split_to_budget([words(20)], WhitespaceTokenizer(), 8, "head_tail")
+        # budget = 8 - 2 special tokens = 6 -> 3 head + 3 tail
+        assert text == "w0 w1 w2 w17 w18 w19"
+        assert n == 6
+
+    def test_chunked_mean_splits(self):
+        [pieces] = split_to_budget([words(10)], WhitespaceTokenizer(), 6, "chunked_mean")
+        assert [n for _, n in pieces] == [4, 4, 2]
+        assert pieces[-1][0] == "w8 w9"
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            split_to_budget(["a"], WhitespaceTokenizer(), 10, "middle")
+
+
+class TestEncodeDocuments:
+    """Test bucketing and order restoration"""
+
+    def test_order_restored_and_batches_length_sorted(self):
+        fn = LengthEmbeddingFn()
+        texts = [words(9), words(1), words(5), words(2)]
+        vectors = encode_documents(fn, texts, max_tokens=100, mode="head_tail", batch_size=2)
+
+        assert fn.batches == [[words(1), words(2)], [words(5), words(9)]]
+        expected = [fn.encode_documents([t])[0] for t in texts]
+        np.testing.assert_allclose(vectors, expected)
+
+    def test_chunked_mean_pools_and_normalises(self):
+        fn = LengthEmbeddingFn()
+        [vec] = encode_documents(fn, [words(10)], max_tokens=6, mode="chunked_mean", batch_size=8)
+        assert np.linalg.norm(vec) == pytest.approx(1.0)
+        assert sum(len(b) for b in fn.batches) == 3
+
+    def test_without_tokenizer_passthrough(self):
+        class Remote:
+            def encode_documents(self, texts):
+                return [[float(len(t))] for t in texts]
+
+        assert encode_documents(Remote(), ["ab", "c"]) == [[2.0], [1.0]]
+
+
+class SparseLengthEmbeddingFn(LengthEmbeddingFn):
+    """Adds bge-m3 style learned sparse output: {word index: weight}"""
+
+    def encode_documents_with_sparse(self, texts):
+        dense = self.encode_documents(texts)
+        sparse = [{int(w[1:]): 0.1 * (i + 1) for i, w in enumerate(t.split())} for t in texts]
+        return dense, sparse
+
+
+class TestLearnedSparse:
+    """Test learned sparse vectors from the same encode call"""
+
+    def test_dense_and_sparse_in_one_pass(self):
+        fn = SparseLengthEmbeddingFn()
+        dense, sparse = encode_documents(fn, [words(3), words(1)], max_tokens=100, with_sparse=True)
+
+        assert len(fn.batches) == 1
+        assert len(dense) == 2
+        assert sparse[0] == pytest.approx({0: 0.1, 1: 0.2, 2: 0.3})
+
+    def test_chunks_merged_by_max(self):
+        fn = SparseLengthEmbeddingFn()
+        _, [sparse] = encode_documents(fn, [words(6)], max_tokens=5, mode="chunked_mean", with_sparse=True)
+        # chunks "w0 w1 w2" and "w3 w4 w5" -> every word keeps its own weight
+        assert sparse == pytest.approx({0: 0.1, 1: 0.2, 2: 0.3, 3: 0.1, 4: 0.2, 5: 0.3})
+
+    def test_requires_sparse_backend(self):
+        with pytest.raises(RuntimeError):
+            encode_documents(LengthEmbeddingFn(), ["a"], with_sparse=True)
+
+    def test_embed_rows(self, monkeypatch):
+        from src.config import settings
+        from src.embedding import embed_rows
+
+        rows = [{}, {}]
+        monkeypatch.setattr(settings, "learned_sparse_enabled", True)
+        embed_rows(SparseLengthEmbeddingFn(), rows, [words(2), words(1)])
+        assert all("embedding" in r and "learned_sparse_embedding" in r for r in rows)
+
+        rows = [{}]
+        monkeypatch.setattr(settings, "learned_sparse_enabled", False)
+        embed_rows(SparseLengthEmbeddingFn(), rows, [words(2)])
+        assert list(rows[0]) == ["embedding"]
+
+    def test_csr_to_dicts(self):
+        from scipy.sparse import csr_matrix
+
+        from src.bge_m3_embedding import csr_to_dicts
+
+        matrix = csr_matrix(np.array([[0, 0.5, 0], [0.2, 0, 0.7]], dtype=np.float32))
+        assert csr_to_dicts(matrix) == [{1: 0.5}, {0: pytest.approx(0.2), 2: pytest.approx(0.7)}]
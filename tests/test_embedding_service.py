@@ -0,0 +1,146 @@
+"""
+Test the shared embedding service over a local socket
+"""
+import socket
+import threading
+
+import pytest
+
+from src.embedding_service import EmbeddingServer, RemoteEmbeddingFunction, is_local_address, parse_address
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available")
+
+AUTHKEY = b"test-key"
+
+
+class RecordingEmbeddingFn:
+    dim = 2
+
+    def __init__(self):
+        self.calls = []
+
+    def encode_queries(self, texts):
+        self.calls.append(("q", list(texts)))
+        return [[float(len(t)), 0.0] for t in texts]
+
+    def encode_documents(self, texts):
+        self.calls.append(("d", list(texts)))
+        if "boom" in texts:
+            raise RuntimeError("model failure")
+        return [[0.0, float(len(t))] for t in texts]
+
+    def encode_queries_with_sparse(self, texts):
+        return self.encode_queries(texts), [{len(t): 1.0} for t in texts]
+
+
+@pytest.fixture
+def service(tmp_path):
+    fn = RecordingEmbeddingFn()
+    address = str(tmp_path / "emb.sock")
+    server = EmbeddingServer(fn, address, AUTHKEY, max_batch=64, max_wait_ms=50)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = RemoteEmbeddingFunction(address, AUTHKEY, timeout=5)
+    # wait until the listener is up
+    for _ in range(100):
+        try:
+            client.dim
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            threading.Event().wait(0.02)
+    return fn, address
+
+
+class TestParseAddress:
+    """Test address parsing"""
+
+    def test_tcp_address(self):
+        assert parse_address("127.0.0.1:7010") == ("127.0.0.1", 7010)
+
+    def test_socket_path(self):
+        assert parse_address("/tmp/emb.sock") == "/tmp/emb.sock"
+
+    @pytest.mark.parametrize("address, local", [
+        ("/tmp/emb.sock", True),
+        ("127.0.0.1:7010", True),
+        ("localhost:7010", True),
+        ("0.0.0.0:7010", False),
+        ("10.0.0.5:7010", False),
+        ("embedding-host:7010", False),
+    ])
+    def test_is_local_address(self, address, local):
+        assert is_local_address(parse_address(address)) is local
+
+
+class TestAccessControl:
+    """Test that the service refuses missing secrets and non-local listeners"""
+
+    def test_authkey_required(self, tmp_path):
+        """Test that neither the server nor the client starts without a secret"""
+        with pytest.raises(ValueError, match="MS_EMBEDDING_SERVICE_AUTHKEY"):
+            EmbeddingServer(RecordingEmbeddingFn(), str(tmp_path / "emb.sock"), b"")
+        with pytest.raises(ValueError, match="MS_EMBEDDING_SERVICE_AUTHKEY"):
+            RemoteEmbeddingFunction(str(tmp_path / "emb.sock"), b"")
+
+    def test_remote_listener_needs_opt_in(self):
+        """Test that a non-loopback address is only accepted with allow_remote"""
+        with pytest.raises(ValueError, match="MS_EMBEDDING_SERVICE_ALLOW_REMOTE"):
+            EmbeddingServer(RecordingEmbeddingFn(), "0.0.0.0:7010", AUTHKEY)
+        EmbeddingServer(RecordingEmbeddingFn(), "0.0.0.0:7010", AUTHKEY, allow_remote=True)
+
+    def test_wrong_authkey_rejected(self, service):
+        """Test that a client with another secret cannot connect"""
+        from multiprocessing import AuthenticationError
+
+        _, address = service
+        with pytest.raises(AuthenticationError):
+            RemoteEmbeddingFunction(address, b"other-key", timeout=5).encode_queries(["a"])
+
+
+class TestEmbeddingService:
+    """Test remote encode calls and micro-batching"""
+
+    def test_encode_roundtrip(self, service):
+        """Vectors come back in order for the requested method"""
+        fn, address = service
+        client = RemoteEmbeddingFunction(address, AUTHKEY, timeout=5)
+        assert client.encode_queries(["a", "bbb"]) == [[1.0, 0.0], [3.0, 0.0]]
+        assert client.encode_documents(["cc"]) == [[0.0, 2.0]]
+        assert client.dim == 2
+
+    def test_sparse_roundtrip(self, service):
+        """Dense and learned sparse vectors come back from one call"""
+        fn, address = service
+        client = RemoteEmbeddingFunction(address, AUTHKEY, timeout=5)
+        dense, sparse = client.encode_queries_with_sparse(["a", "bbb"])
+        assert dense == [[1.0, 0.0], [3.0, 0.0]]
+        assert sparse == [{1: 1.0}, {3: 1.0}]
+
+    def test_concurrent_requests_batched(self, service):
+        """Concurrent clients share one model call"""
+        fn, address = service
+        fn.calls.clear()
+        client = RemoteEmbeddingFunction(address, AUTHKEY, timeout=5)
+        results = {}
+        barrier = threading.Barrier(4)
+
+        def worker(i):
+            barrier.wait()
+            results[i] = client.encode_queries(["x" * (i + 1)])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert {i: r[0][0] for i, r in results.items()} == {0: 1.0, 1: 2.0, 2: 3.0, 3: 4.0}
+        assert len(fn.calls) < 4
+
+    def test_model_error_propagates(self, service):
+        """Model errors are raised on the client"""
+        fn, address = service
+        client = RemoteEmbeddingFunction(address, AUTHKEY, timeout=5)
+        with pytest.raises(RuntimeError, match="model failure"):
+            client.encode_documents(["boom"])
+        # connection remains usable
+        assert client.encode_documents(["ok"]) == [[0.0, 2.0]]
@@ -0,0 +1,78 @@
+"""
+Test filter expression building and date normalization
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from src.milvus_queries import build_range_filter
+from src.sync_utils import parse_date_to_epoch
+
+
+JAN_20 = int(datetime(2026, 1, 20, tzinfo=timezone.utc).timestamp())
+
+
+class TestParseDateToEpoch:
+    """Test date normalization to UTC epoch seconds"""
+
+    def test_date_only_formats(self):
+        """Test that common date-only formats map to midnight UTC"""
+        assert parse_date_to_epoch("2026-01-20") == JAN_20
+        assert parse_date_to_epoch("20/01/2026") == JAN_20
+        assert parse_date_to_epoch("20260120") == JAN_20
+
+    def test_end_of_day(self):
+        """Test that a date-only upper bound covers the whole day"""
+        assert parse_date_to_epoch("2026-01-20", end_of_day=True) == JAN_20 + 86399
+        # Explicit times are kept as-is
+        assert parse_date_to_epoch("2026-01-20T00:00:00", end_of_day=True) == JAN_20
+
+    def test_iso_datetime_and_objects(self):
+        """Test ISO strings, datetime objects and Mongo extended JSON"""
+        assert parse_date_to_epoch("2026-01-20T10:30:00") == JAN_20 + 37800
+        assert parse_date_to_epoch("2026-01-20T10:30:00Z") == JAN_20 + 37800
+        assert parse_date_to_epoch("2026-01-20T17:30:00+07:00") == JAN_20 + 37800
+        assert parse_date_to_epoch(datetime(2026, 1, 20, 10, 30)) == JAN_20 + 37800
+        assert parse_date_to_epoch({"$date": "2026-01-20T10:30:00Z"}) == JAN_20 + 37800
+
+    def test_epoch_numbers(self):
+        """Test that epoch seconds and milliseconds are both accepted"""
+        assert parse_date_to_epoch(JAN_20) == JAN_20
+        assert parse_date_to_epoch(JAN_20 * 1000) == JAN_20
+
+    def test_missing_or_invalid(self):
+        """Test that empty and unparseable values return None"""
+        assert parse_date_to_epoch(None) is None
+        assert parse_date_to_epoch("") is None
+        assert parse_date_to_epoch("not a date") is None
+
+
+class TestBuildRangeFilter:
+    """Test range filter expressions over *_ts fields"""
+
+    def test_no_bounds(self):
+        """Test that empty ranges produce no filter"""
+        assert build_range_filter({"broadcast_date_ts": (None, None)}) is None
+
+    def test_closed_range(self):
+        """Test an inclusive from/to range"""
+        expr = build_range_filter({"broadcast_date_ts": ("2026-01-20", "2026-01-20")})
+        assert expr == f"broadcast_date_ts >= {JAN_20} and broadcast_date_ts <= {JAN_20 + 86399}"
+
+    def test_upper_bound_only_excludes_missing(self):
+        """Test that open-ended upper bounds skip unknown (0) dates"""
+        expr = build_range_filter({"created_at_ts": (None, "2026-01-20")})
+        assert expr == f"created_at_ts > 0 and created_at_ts <= {JAN_20 + 86399}"
+
+    def test_invalid_date_raises(self):
+        """Test that an unparseable bound raises ValueError"""
+        with pytest.raises(ValueError):
+            build_range_filter({"created_at_ts": ("yesterday", None)})
+
+    def test_scene_filter_rejects_invalid_date(self, client):
+        """Test that the filter endpoint returns 422 for an invalid date"""
+        response = client.post(
+            "/v1/search/scene/filter",
+            json={"query_text": "test", "broadcast_date_from": "yesterday"},
+        )
+        assert response.status_code in [422, 501]
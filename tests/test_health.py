@@ -1,6 +1,12 @@
 """
-Test health check endpoint
+Test health check, readiness and deep health endpoints
 """
+import time
+
+import pytest
+
+from src import health, milvus_client, warmup
+from src.config import settings
 
 
 def test_health_check(client):
@@ -23,3 +29,147 @@ def test_health_check_response_format(client):
     
     # Validate types
     assert isinstance(data["status"], str)
+
+
+# ---------------------------------------------------------------------------
+# /ready and /health/deep
+# ---------------------------------------------------------------------------
+
+class FakeLoadState:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeMilvusClient:
+    """Just the calls src/health.py makes, with a configurable load state per collection."""
+
+    def __init__(self, load_states: dict[str, str], row_count: int = 7):
+        self.load_states = load_states
+        self.row_count = row_count
+
+    def list_collections(self, **kwargs):
+        return list(self.load_states)
+
+    def get_load_state(self, collection_name, timeout=None):
+        return {"state": FakeLoadState(self.load_states[collection_name])}
+
+    def get_collection_stats(self, collection_name, timeout=None):
+        return {"row_count": self.row_count}
+
+
+@pytest.fixture
+def milvus_backend(monkeypatch, tmp_path):
+    """Milvus backend with loaded collections, a loaded model and finished warmup."""
+    fake = FakeMilvusClient({"scenes": "Loaded", "contents": "Loaded"})
+    monkeypatch.setattr(settings, "backend", "milvus")
+    monkeypatch.setattr(settings, "content_chunks_enabled", False)
+    monkeypatch.setattr(settings, "watcher_status_path", str(tmp_path / "watcher_status.json"))
+    monkeypatch.setattr(milvus_client, "_client", fake)
+    monkeypatch.setattr(milvus_client, "_embedding_fn", object())
+    monkeypatch.setattr(warmup, "state", warmup.WarmupState())
+    warmup.state.status = "done"
+    return fake
+
+
+class TestReadiness:
+    """Test GET /ready with backend checks"""
+
+    def test_ready(self, client, milvus_backend):
+        """Test 200 when warm, reachable and loaded"""
+        response = client.get("/ready")
+        data = response.json()
+
+        assert response.status_code == 200
+        assert data["status"] == "ready"
+        assert data["backend"]["collections"]["scenes"]["load_state"] == "Loaded"
+        assert "row_count" not in data["backend"]["collections"]["scenes"]
+        assert data["embedding"]["loaded"] is True
+
+    def test_collection_not_loaded(self, client, milvus_backend):
+        """Test 503 while a collection is still loading"""
+        milvus_backend.load_states["contents"] = "Loading"
+        response = client.get("/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "unavailable"
+        assert response.json()["backend"]["collections"]["contents"]["loaded"] is False
+
+    def test_backend_unreachable(self, client, milvus_backend, monkeypatch):
+        """Test 503 with the connection error when Milvus is down"""
+        def down(**kwargs):
+            raise ConnectionError("milvus down")
+
+        monkeypatch.setattr(milvus_backend, "list_collections", down)
+        data = client.get("/ready").json()
+
+        assert data["backend"]["reachable"] is False
+        assert "milvus down" in data["backend"]["error"]
+
+    def test_model_not_loaded(self, client, milvus_backend, monkeypatch):
+        """Test 503 without the embedding model"""
+        monkeypatch.setattr(milvus_client, "_embedding_fn", None)
+        assert client.get("/ready").status_code == 503
+
+
+class TestDeepHealth:
+    """Test GET /health/deep"""
+
+    def test_ok_with_row_counts(self, client, milvus_backend):
+        """Test row counts and ok status; no watcher section without a status file"""
+        response = client.get("/health/deep")
+        data = response.json()
+
+        assert response.status_code == 200
+        assert data["status"] == "ok"
+        assert data["backend"]["collections"]["scenes"]["row_count"] == 7
+        assert data["watcher"] is None
+
+    def test_missing_collection_is_down(self, client, milvus_backend):
+        """Test 503 when a collection does not exist"""
+        del milvus_backend.load_states["contents"]
+        response = client.get("/health/deep")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "down"
+        assert response.json()["backend"]["collections"]["contents"]["exists"] is False
+
+    def test_watcher_lag(self, client, milvus_backend):
+        """Test that a lagging watcher degrades the report but keeps 200"""
+        now = time.time()
+        health.write_watcher_status({
+            "state": "watching",
+            "last_event_cluster_time": now - 1000,
+            "last_event_processed_at": now - 400,
+        })
+        response = client.get("/health/deep")
+        watcher = response.json()["watcher"]
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "degraded"
+        assert watcher["event_lag_sec"] == pytest.approx(600)
+        assert watcher["stale"] is False
+
+    def test_stale_watcher(self, milvus_backend):
+        """Test that missed heartbeats mark the watcher stale"""
+        health.write_watcher_status({"state": "watching"})
+        later = time.time() + 4 * settings.watcher_status_interval_sec
+
+        report = health.watcher_health(now=later)
+        assert report["stale"] is True
+        assert report["ok"] is False
+
+
+class TestWatcherStatus:
+    """Test how the watcher publishes its status file"""
+
+    def test_events_published_by_heartbeat(self, milvus_backend, monkeypatch):
+        """Test that events only update memory and the next heartbeat writes them"""
+        from scripts import mongo_watcher
+
+        monkeypatch.setattr(mongo_watcher, "_status", dict(mongo_watcher._status))
+        mongo_watcher._publish_status(state="watching")
+        mongo_watcher._record_event({"operationType": "insert"}, "ok")
+        assert health.read_watcher_status()["events_ok"] == 0
+
+        mongo_watcher._publish_status()  # heartbeat
+        assert health.read_watcher_status()["events_ok"] == 1
@@ -0,0 +1,55 @@
+"""
+Test import cost of the API and CLI scripts (python -X importtime)
+
+Backend clients and the embedding stack must load on first use, not at import:
+pymilvus.model pulls in transformers / torch and costs seconds.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that only a request, a sync or a script's main() may import
+HEAVY = {"pymilvus", "pymongo", "opensearchpy", "torch", "transformers", "sentence_transformers", "onnxruntime"}
+
+# Generous cumulative budgets (seconds) — catch a heavy import creeping back, not CPU jitter
+BUDGETS = {
+    "api.main": 3.0,
+    "scripts.drop_collection": 1.5,
+    "scripts.migrate_indexes": 1.5,
+    "scripts.embedding_service": 1.5,
+}
+
+
+def import_times(module: str) -> dict[str, float]:
+    """Cumulative import time in seconds per imported module, from a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+class TestImportTime:
+    """Test that importing entry points stays cheap"""
+
+    def test_no_heavy_imports(self, module):
+        """Test that no backend client or model library is imported"""
+        loaded = {name.split(".")[0] for name in import_times(module)}
+        assert not loaded & HEAVY
+
+    def test_budget(self, module):
+        """Test the cumulative import time of the entry point"""
+        assert import_times(module)[module] < BUDGETS[module]
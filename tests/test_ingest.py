@@ -1,6 +1,8 @@
 """
 Test ingest endpoints
 """
+import json
+
 import pytest
 
 
@@ -211,3 +213,163 @@ class TestIngestDataValidation:
         
         response = client.post("/v1/contents/ingest", json=data)
         assert response.status_code == 422
+
+
+class TestStreamIngest:
+    """Test NDJSON streaming ingest endpoints"""
+
+    @staticmethod
+    def _ndjson(items):
+        return "\n".join(json.dumps(item) for item in items) + "\n"
+
+    def test_stream_invalid_lines_reported(self, client):
+        """Invalid lines are reported per line without failing the request"""
+        body = '{"scene_id": "s1"}\nnot json\n\n'
+        response = client.post("/v1/scenes/ingest/stream", content=body)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["indexed"] == 0
+        assert data["chunks"] == []
+        assert len(data["errors"]) == 2
+        assert data["errors"][0].startswith("line 1:")
+        assert data["errors"][1].startswith("line 2:")
+
+    def test_stream_empty_body(self, client):
+        """Empty body indexes nothing"""
+        response = client.post("/v1/contents/ingest/stream", content=b"")
+        assert response.status_code in [200, 501]
+        if response.status_code == 200:
+            assert response.json() == {"indexed": 0, "chunks": [], "errors": []}
+
+    def test_stream_chunk_size_validation(self, client):
+        """chunk_size must be positive"""
+        response = client.post("/v1/scenes/ingest/stream?chunk_size=0", content=b"")
+        assert response.status_code == 422
+
+    def test_stream_chunks_and_single_flush(self, client, sample_scene_data, monkeypatch):
+        """Items are upserted chunk by chunk and flushed once at the end"""
+        from api.routes import ingest
+        from src.config import settings
+
+        calls, flushes = [], []
+        monkeypatch.setattr(settings, "backend", "milvus")
+        monkeypatch.setattr(ingest, "_upsert_milvus_scenes",
+                            lambda scenes, flush=True: calls.append((len(scenes), flush)) or len(scenes))
+        monkeypatch.setattr(ingest, "_flush_milvus", lambda name: flushes.append(name))
+
+        scene = sample_scene_data["scenes"][0]
+        items = [dict(scene, scene_id=f"s{i}") for i in range(5)]
+        response = client.post("/v1/scenes/ingest/stream?chunk_size=2", content=self._ndjson(items))
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["indexed"] == 5
+        assert [c["items"] for c in data["chunks"]] == [2, 2, 1]
+        assert calls == [(2, False), (2, False), (1, False)]
+        assert flushes == [settings.milvus_collection_name]
+
+    def test_stream_chunk_error_does_not_abort(self, client, sample_content_data, monkeypatch):
+        """A failing chunk is reported and later chunks still run"""
+        from api.routes import ingest
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "backend", "milvus")
+        state = {"n": 0}
+
+        def fake_upsert(contents, flush=True):
+            state["n"] += 1
+            if state["n"] == 1:
+                raise RuntimeError("boom")
+            return len(contents)
+
+        monkeypatch.setattr(ingest, "_upsert_milvus_contents", fake_upsert)
+        monkeypatch.setattr(ingest, "_flush_milvus", lambda name: None)
+
+        content = sample_content_data["contents"][0]
+        items = [dict(content, content_id=f"c{i}") for i in range(3)]
+        response = client.post("/v1/contents/ingest/stream?chunk_size=2", content=self._ndjson(items))
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["indexed"] == 1
+        assert data["chunks"][0]["errors"] == ["boom"]
+        assert data["chunks"][1]["indexed"] == 1
+
+    def test_stream_partial_bulk_errors(self, client, sample_scene_data, monkeypatch):
+        """OpenSearch item errors are reported on the chunk without discarding the indexed items"""
+        from api.models.scene import IngestResponse
+        from api.routes import ingest
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "backend", "opensearch")
+        monkeypatch.setattr(ingest, "_ingest_opensearch", lambda req: IngestResponse(
+            indexed=len(req.scenes) - 1, errors=[f"{req.scenes[0].scene_id}: mapper_parsing_exception"]))
+
+        scene = sample_scene_data["scenes"][0]
+        items = [dict(scene, scene_id=f"s{i}") for i in range(5)]
+        response = client.post("/v1/scenes/ingest/stream?chunk_size=3", content=self._ndjson(items))
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["indexed"] == 3
+        assert [c["indexed"] for c in data["chunks"]] == [2, 1]
+        assert data["chunks"][0]["errors"] == ["s0: mapper_parsing_exception"]
+
+
+class TestIngestJobs:
+    """Test asynchronous ingest job endpoints"""
+
+    def test_unknown_job_404(self, client):
+        """Polling an unknown job id returns 404"""
+        response = client.get("/v1/ingest/jobs/does-not-exist")
+        assert response.status_code == 404
+
+    def test_job_submit_validates_body(self, client):
+        """Job submission validates the request body like the sync endpoint"""
+        response = client.post("/v1/scenes/ingest/jobs", json={"scenes": []})
+        assert response.status_code == 422
+
+    def test_scene_job_lifecycle(self, client, sample_scene_data, monkeypatch):
+        """Submit returns 202 with a job id; polling reports completion"""
+        import time
+
+        from api.routes import ingest
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "backend", "milvus")
+        monkeypatch.setattr(ingest, "_upsert_milvus_scenes", lambda scenes, flush=True: len(scenes))
+        monkeypatch.setattr(ingest, "_flush_milvus", lambda name: None)
+
+        response = client.post("/v1/scenes/ingest/jobs", json=sample_scene_data)
+        assert response.status_code == 202
+        data = response.json()
+        assert data["kind"] == "scenes"
+        assert data["total"] == 1
+        assert data["status"] in ["queued", "running", "completed"]
+
+        deadline = time.time() + 5
+        while data["status"] not in ["completed", "failed"] and time.time() < deadline:
+            time.sleep(0.02)
+            data = client.get(f"/v1/ingest/jobs/{data['job_id']}").json()
+
+        assert data["status"] == "completed"
+        assert data["indexed"] == 1
+        assert data["errors"] == []
+
+    def test_opensearch_job_item_errors(self, sample_scene_data, monkeypatch):
+        """Bulk item errors are mapped back to the positions of the failed scenes"""
+        from api.models.scene import SceneIngestItem
+        from api.routes import ingest
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "backend", "opensearch")
+        monkeypatch.setattr(ingest, "_bulk_opensearch", lambda scenes: (
+            len(scenes) - 1, [{"index": {"_id": "s1", "status": 400, "error": "mapper_parsing_exception"}}]))
+
+        scene = sample_scene_data["scenes"][0]
+        scenes = [SceneIngestItem(**dict(scene, scene_id=f"s{i}")) for i in range(3)]
+        result = ingest._upsert_scene_batch(scenes)
+
+        assert result.indexed == 2
+        assert result.failed == {1: "s1: mapper_parsing_exception"}
@@ -0,0 +1,161 @@
+"""
+Test the in-process ingest job queue
+"""
+import threading
+import time
+
+import pytest
+
+from src.job_queue import JOB_COMPLETED, JOB_FAILED, BatchResult, JobQueue
+
+
+def wait_done(q, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = q.get(job_id)
+        if job["finished_at"] is not None:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+class TestJobQueue:
+    """Test batching, progress and error reporting"""
+
+    def test_job_completes_in_batches(self):
+        """A job larger than batch_size is split into batch_size handler calls"""
+        calls = []
+        q = JobQueue({"scenes": lambda items: calls.append(list(items))}, batch_size=2)
+        job = q.submit("scenes", [1, 2, 3, 4, 5])
+        data = wait_done(q, job.job_id)
+        q.shutdown()
+
+        assert data["status"] == JOB_COMPLETED
+        assert data["processed"] == 5
+        assert data["indexed"] == 5
+        assert [len(c) for c in calls] == [2, 2, 1]
+
+    def test_small_jobs_coalesced(self):
+        """Tasks from several queued jobs share one handler call"""
+        gate = threading.Event()
+        calls = []
+
+        def handler(items):
+            gate.wait()
+            calls.append(list(items))
+
+        q = JobQueue({"scenes": handler}, batch_size=10)
+        first = q.submit("scenes", ["a"])  # occupies the worker until the gate opens
+        time.sleep(0.05)
+        jobs = [q.submit("scenes", [i]) for i in range(3)]
+        gate.set()
+        for job in [first, *jobs]:
+            wait_done(q, job.job_id)
+        q.shutdown()
+
+        assert calls == [["a"], [0, 1, 2]]
+
+    def test_failed_batch_reported(self):
+        """Handler errors mark the job failed with an error message"""
+        def handler(items):
+            raise RuntimeError("milvus down")
+
+        q = JobQueue({"contents": handler})
+        job = q.submit("contents", [1, 2])
+        data = wait_done(q, job.job_id)
+        q.shutdown()
+
+        assert data["status"] == JOB_FAILED
+        assert data["indexed"] == 0
+        assert "milvus down" in data["errors"][0]
+
+    def test_finalizer_runs_after_drain(self):
+        """Finalizer (flush) runs once the queue is drained"""
+        flushes = []
+        q = JobQueue({"scenes": lambda items: None},
+                     finalizers={"scenes": lambda: flushes.append(1)}, batch_size=100)
+        job = q.submit("scenes", list(range(10)))
+        wait_done(q, job.job_id)
+        deadline = time.time() + 5
+        while not flushes and time.time() < deadline:
+            time.sleep(0.01)
+        q.shutdown()
+        assert flushes == [1]
+
+    def test_unknown_kind_and_job(self):
+        """Unknown kinds are rejected and unknown job ids return None"""
+        q = JobQueue({"scenes": lambda items: None})
+        with pytest.raises(ValueError):
+            q.submit("faces", [1])
+        assert q.get("missing") is None
+
+    def test_retention_evicts_finished_jobs(self):
+        """Only the most recent finished jobs are kept"""
+        q = JobQueue({"scenes": lambda items: None}, retention=2)
+        ids = []
+        for i in range(4):
+            job = q.submit("scenes", [i])
+            wait_done(q, job.job_id)
+            ids.append(job.job_id)
+        q.shutdown()
+        assert q.get(ids[0]) is None
+        assert q.get(ids[-1]) is not None
+
+    def test_partial_failure_charged_to_its_job(self):
+        """A failed item in a coalesced batch only affects the job that submitted it"""
+        gate = threading.Event()
+
+        def handler(items):
+            gate.wait()
+            failed = {i: f"{item}: bad document" for i, item in enumerate(items) if item == "bad"}
+            return BatchResult(len(items) - len(failed), failed)
+
+        q = JobQueue({"scenes": handler}, batch_size=10)
+        first = q.submit("scenes", ["a"])
+        time.sleep(0.05)
+        good = q.submit("scenes", ["b", "c"])
+        mixed = q.submit("scenes", ["d", "bad"])
+        gate.set()
+        data = {job.job_id: wait_done(q, job.job_id) for job in (first, good, mixed)}
+        q.shutdown()
+
+        assert data[good.job_id]["indexed"] == 2
+        assert data[good.job_id]["errors"] == []
+        assert data[mixed.job_id]["status"] == JOB_COMPLETED
+        assert data[mixed.job_id]["indexed"] == 1
+        assert data[mixed.job_id]["errors"] == ["1 items failed: bad: bad document"]
+
+    def test_returned_count_used(self):
+        """A count short of the batch is not reported as fully indexed"""
+        q = JobQueue({"scenes": lambda items: len(items) - 1})
+        job = q.submit("scenes", [1, 2, 3])
+        data = wait_done(q, job.job_id)
+        q.shutdown()
+
+        assert data["indexed"] == 2
+        assert data["errors"] == ["1 items failed: not indexed (2 of 3 in batch)"]
+
+
+class TestShutdown:
+    """Test draining the queue on shutdown"""
+
+    def test_drains_queued_jobs(self):
+        """Jobs accepted before shutdown are finished and flushed"""
+        flushes = []
+        q = JobQueue({"scenes": lambda items: time.sleep(0.02)},
+                     finalizers={"scenes": lambda: flushes.append(1)}, batch_size=1)
+        job = q.submit("scenes", list(range(5)))
+
+        assert q.shutdown(timeout=5) == []
+        assert q.get(job.job_id)["indexed"] == 5
+        assert flushes
+
+    def test_timeout_reports_unfinished_jobs(self, caplog):
+        """Jobs still queued after the timeout are logged by id"""
+        gate = threading.Event()
+        q = JobQueue({"scenes": lambda items: gate.wait()}, batch_size=1)
+        job = q.submit("scenes", [1, 2])
+
+        assert q.shutdown(timeout=0.1) == [job.job_id]
+        assert job.job_id in caplog.text
+        gate.set()
@@ -0,0 +1,90 @@
+"""
+Test the load generator request sources and report helpers (scripts/load_test.py)
+"""
+import json
+from collections import Counter
+
+import pytest
+
+from scripts.load_test import (
+    load_replay_log,
+    metrics_delta,
+    parse_endpoint_mix,
+    summarize,
+    zipf_requests,
+)
+
+
+class TestRequestSources:
+    """Test replay logs and the synthetic Zipf mix"""
+
+    def test_replay_log(self, tmp_path):
+        """Test that methods default from the body and lines without a path are skipped"""
+        log = tmp_path / "log.jsonl"
+        log.write_text("\n".join([
+            json.dumps({"path": "/v1/search/scene", "params": {"query_text": "bão", "k": 5}}),
+            json.dumps({"path": "/v1/search/content/filter", "json": {"query_text": "lũ"}}),
+            json.dumps({"query_text": "no path"}),
+            "",
+        ]), encoding="utf-8")
+
+        entries = load_replay_log(log)
+
+        assert [e["method"] for e in entries] == ["GET", "POST"]
+        assert entries[0]["params"] == {"query_text": "bão", "k": 5}
+        assert entries[1]["json"] == {"query_text": "lũ"}
+
+    def test_zipf_favours_top_queries(self):
+        """Test that the first-ranked query is the most frequent"""
+        queries = [f"q{i}" for i in range(50)]
+        reqs = zipf_requests(queries, {"scene": 1.0}, 2000, s=1.2, k=10, search_type="hybrid", seed=1)
+
+        counts = Counter(r["params"]["query_text"] for r in reqs)
+        assert counts.most_common(1)[0][0] == "q0"
+        assert all(r["path"] == "/v1/search/scene" for r in reqs)
+
+    def test_endpoint_mix(self):
+        """Test weighted endpoint specs and POST bodies"""
+        assert parse_endpoint_mix(["scene:3", "content_filter"]) == {"scene": 3.0, "content_filter": 1.0}
+        with pytest.raises(ValueError):
+            parse_endpoint_mix(["unknown"])
+
+        reqs = zipf_requests(["q"], {"content_filter": 1.0}, 3, s=1.0, k=7, search_type="semantic", seed=0)
+        assert reqs[0]["method"] == "POST"
+        assert reqs[0]["json"] == {"query_text": "q", "k": 7, "search_type": "semantic"}
+
+
+class TestReport:
+    """Test per-endpoint stats and /metrics deltas"""
+
+    def test_summarize(self):
+        """Test error rate and throughput per endpoint and in total"""
+        samples = [
+            ("/v1/search/scene", "200", 0.010, 0.008),
+            ("/v1/search/scene", "502", 0.030, 0.030),
+            ("/v1/search/content", "ConnectionError", 0.001, 0.001),
+        ]
+        stats = summarize(samples, elapsed=2.0)
+
+        assert stats["/v1/search/scene"]["errors"] == 1
+        assert stats["/v1/search/scene"]["error_rate"] == 0.5
+        assert stats["/v1/search/content"]["status"] == {"ConnectionError": 1}
+        assert stats["total"]["requests"] == 3
+        assert stats["total"]["throughput_rps"] == 1.5
+
+    def test_metrics_delta(self):
+        """Test that only increased cumulative samples are reported"""
+        before = (
+            "# TYPE ms_flushes counter\n"
+            'ms_flushes_total{collection="scenes"} 2.0\n'
+            "# TYPE ms_up gauge\n"
+            "ms_up 1.0\n"
+        )
+        after = (
+            "# TYPE ms_flushes counter\n"
+            'ms_flushes_total{collection="scenes"} 5.0\n'
+            'ms_flushes_total{collection="contents"} 0.0\n'
+            "# TYPE ms_up gauge\n"
+            "ms_up 1.0\n"
+        )
+        assert metrics_delta(before, after) == {'ms_flushes_total{collection="scenes"}': 3.0}
@@ -0,0 +1,56 @@
+"""
+Test Prometheus metrics endpoint and stage timing
+"""
+from prometheus_client import REGISTRY
+
+from src.metrics import observe_stage, record_cache
+
+
+def _sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetricsEndpoint:
+    """Test GET /metrics"""
+
+    def test_exposes_request_latency_by_route(self, client):
+        client.get("/health")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'ms_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+
+    def test_unknown_job_uses_route_template(self, client):
+        client.get("/v1/ingest/jobs/does-not-exist")
+        assert 'route="/v1/ingest/jobs/{job_id}"' in client.get("/metrics").text
+
+
+class TestStageMetrics:
+    """Test search stage and cache counters"""
+
+    def test_observe_stage_counts_even_on_error(self):
+        labels = {"stage": "test_stage"}
+        before = _sample("ms_search_stage_duration_seconds_count", labels)
+        with observe_stage("test_stage"):
+            pass
+        try:
+            with observe_stage("test_stage"):
+                raise ValueError
+        except ValueError:
+            pass
+        assert _sample("ms_search_stage_duration_seconds_count", labels) == before + 2
+
+    def test_facets_are_timed(self):
+        from src.milvus_queries import build_scene_facets
+
+        labels = {"stage": "facets"}
+        before = _sample("ms_search_stage_duration_seconds_count", labels)
+        build_scene_facets([])
+        assert _sample("ms_search_stage_duration_seconds_count", labels) == before + 1
+
+    def test_record_cache(self):
+        labels = {"cache": "test", "result": "hit"}
+        before = _sample("ms_cache_requests_total", labels)
+        record_cache("test", hit=True)
+        assert _sample("ms_cache_requests_total", labels) == before + 1
@@ -0,0 +1,165 @@
+"""
+Test the Milvus schema builders and index helpers without a server
+"""
+import pytest
+from pymilvus import DataType, MilvusClient
+
+from src import milvus_manager
+from src.config import settings
+
+
+class StubMilvusClient:
+    """Existing collection with the given fields; records schema and index changes."""
+
+    def __init__(self, fields, supports_add=True, indexes=()):
+        self.fields = set(fields)
+        self.supports_add = supports_add
+        self.indexes = list(indexes)
+        self.added = {}
+        self.created = {}
+        self.calls = []
+
+    def has_collection(self, collection_name):
+        return True
+
+    def describe_collection(self, collection_name):
+        return {"fields": [{"name": name} for name in sorted(self.fields)]}
+
+    def add_collection_field(self, collection_name, field_name, data_type, **kwargs):
+        if not self.supports_add:
+            raise RuntimeError("AddCollectionField not supported")
+        self.added[field_name] = (data_type, kwargs)
+        self.fields.add(field_name)
+
+    def list_indexes(self, collection_name):
+        return list(self.indexes)
+
+    def prepare_index_params(self):
+        return MilvusClient.prepare_index_params()
+
+    def create_index(self, collection_name, index_params):
+        self.calls.append("create_index")
+        for index in index_params:
+            self.created[index.field_name] = index.index_type
+            self.indexes.append(index.index_name)
+
+    def release_collection(self, collection_name):
+        self.calls.append("release")
+
+    def load_collection(self, collection_name):
+        self.calls.append("load")
+
+
+def vector_fields(schema):
+    return [f.name for f in schema.fields if f.dtype in (DataType.FLOAT_VECTOR, DataType.SPARSE_FLOAT_VECTOR)]
+
+
+class TestScenesSchema:
+    """Test the vector field count against proxy.maxVectorFieldNum"""
+
+    @pytest.mark.parametrize("multi_vector, learned_sparse, count", [
+        (False, False, 2),
+        (True, False, 4),
+        (False, True, 3),
+    ])
+    def test_vector_field_count(self, monkeypatch, multi_vector, learned_sparse, count):
+        """Test the number of vector fields per flag combination"""
+        monkeypatch.setattr(settings, "scene_multi_vector_enabled", multi_vector)
+        monkeypatch.setattr(settings, "learned_sparse_enabled", learned_sparse)
+        assert len(vector_fields(milvus_manager._build_scenes_schema())) == count
+
+    def test_too_many_vector_fields(self, monkeypatch):
+        """Test that both flags fail before any Milvus call unless the limit is raised"""
+        monkeypatch.setattr(settings, "scene_multi_vector_enabled", True)
+        monkeypatch.setattr(settings, "learned_sparse_enabled", True)
+        with pytest.raises(ValueError, match="maxVectorFieldNum"):
+            milvus_manager._build_scenes_schema()
+
+        monkeypatch.setattr(settings, "milvus_max_vector_fields", 5)
+        assert len(vector_fields(milvus_manager._build_scenes_schema())) == 5
+
+
+class TestAddMissingFields:
+    """Test bringing a collection created before the *_ts fields up to date"""
+
+    TS_FIELDS = {"created_at_ts", "broadcast_date_ts"}
+
+    def old_contents_fields(self):
+        schema = milvus_manager._build_contents_schema()
+        return {f.name for f in schema.fields} - self.TS_FIELDS
+
+    def test_adds_scalar_fields_in_place(self):
+        """Test that missing epoch fields are added as nullable INT64"""
+        client = StubMilvusClient(self.old_contents_fields())
+        milvus_manager.add_missing_fields(client, "contents", milvus_manager._build_contents_schema,
+                                          {"content_id", *self.TS_FIELDS})
+
+        assert set(client.added) == self.TS_FIELDS
+        assert all(added == (DataType.INT64, {"nullable": True}) for added in client.added.values())
+
+    def test_fails_without_add_collection_field(self):
+        """Test that an older server stops with the drop and re-sync commands"""
+        client = StubMilvusClient(self.old_contents_fields(), supports_add=False)
+        with pytest.raises(milvus_manager.SchemaMigrationError, match="drop_collection.*full-sync-only"):
+            milvus_manager.add_missing_fields(client, "contents", milvus_manager._build_contents_schema,
+                                              {"content_id", *self.TS_FIELDS})
+
+    def test_vector_fields_not_added(self, monkeypatch):
+        """Test that a missing vector field needs a recreate even on servers that can add fields"""
+        client = StubMilvusClient(self.old_contents_fields() | self.TS_FIELDS)
+        monkeypatch.setattr(settings, "learned_sparse_enabled", True)
+        with pytest.raises(milvus_manager.SchemaMigrationError, match=milvus_manager.LEARNED_SPARSE_FIELD):
+            milvus_manager.add_missing_fields(client, "contents", milvus_manager._build_contents_schema,
+                                              {"content_id", milvus_manager.LEARNED_SPARSE_FIELD})
+        assert client.added == {}
+
+
+class TestEnsureScalarIndexes:
+    """Test creating missing scalar indexes on an existing collection (scripts/migrate_indexes.py)"""
+
+    def test_creates_missing_indexes(self):
+        """Test index types per field and that the collection is reloaded"""
+        client = StubMilvusClient(milvus_manager.SCENE_SCALAR_INDEXES, indexes=["embedding", "sparse_embedding"])
+        created = milvus_manager.ensure_scalar_indexes(client, "scenes", milvus_manager.SCENE_SCALAR_INDEXES)
+
+        assert sorted(created) == sorted(milvus_manager.SCENE_SCALAR_INDEXES)
+        assert client.created == milvus_manager.SCENE_SCALAR_INDEXES
+        assert client.created["category"] == "BITMAP"
+        assert client.created["video_id"] == "INVERTED"
+        assert client.created["broadcast_date_ts"] == "STL_SORT"
+        assert client.calls == ["release", "create_index", "load"]
+
+    def test_skips_existing_and_unknown_fields(self):
+        """Test that indexed fields are not recreated and fields missing from the schema are skipped"""
+        fields = set(milvus_manager.CONTENT_SCALAR_INDEXES) - {"created_at_ts", "broadcast_date_ts"}
+        client = StubMilvusClient(fields, indexes=["category", "author"])
+        created = milvus_manager.ensure_scalar_indexes(client, "contents", milvus_manager.CONTENT_SCALAR_INDEXES)
+
+        assert sorted(created) == ["broadcast_date", "content_type_id", "program_id"]
+        assert client.created == {"content_type_id": "BITMAP", "program_id": "INVERTED",
+                                  "broadcast_date": "INVERTED"}
+
+    def test_nothing_missing(self):
+        """Test that a fully indexed collection is not released"""
+        indexes = milvus_manager.CONTENT_CHUNK_SCALAR_INDEXES
+        client = StubMilvusClient(indexes, indexes=indexes)
+
+        assert milvus_manager.ensure_scalar_indexes(client, "content_chunks", indexes) == []
+        assert client.calls == []
+
+
+class TestMigrateIndexesScript:
+    """Test scripts/migrate_indexes.py against the stub client"""
+
+    def test_main(self, monkeypatch, capsys):
+        """Test that only the selected collection is migrated"""
+        from scripts import migrate_indexes
+        from src import milvus_client
+
+        client = StubMilvusClient(milvus_manager.CONTENT_SCALAR_INDEXES)
+        monkeypatch.setattr(milvus_client, "get_milvus_client", lambda: client)
+        monkeypatch.setattr("sys.argv", ["migrate_indexes", "--collection", "contents"])
+        migrate_indexes.main()
+
+        assert client.created == milvus_manager.CONTENT_SCALAR_INDEXES
+        assert f"Collection '{settings.milvus_content_collection_name}': created indexes" in capsys.readouterr().out
@@ -0,0 +1,291 @@
+"""
+Test multi-collection and multi-query search against an in-memory Milvus stand-in
+"""
+import pytest
+
+from src.config import settings
+from src.milvus_queries import (
+    parse_vector_weights,
+    search_content_hybrid,
+    search_joint,
+    search_scene_batch,
+    search_scene_hybrid,
+    search_scene_weighted,
+)
+
+
+class FakeEmbeddingFn:
+    def __init__(self):
+        self.calls = 0
+
+    def encode_queries(self, texts):
+        self.calls += 1
+        self.last_texts = list(texts)
+        return [[float(len(t)), 0.0, 0.0] for t in texts]
+
+
+class FakeClient:
+    """Returns canned hits per collection and records search kwargs."""
+
+    def __init__(self):
+        self.searches = []
+
+    def search(self, **kwargs):
+        self.searches.append(kwargs)
+        if kwargs["collection_name"] == settings.milvus_content_collection_name:
+            return [[
+                {"distance": 0.9, "entity": {"content_id": "v1", "title": "Video 1"}},
+                {"distance": 0.8, "entity": {"content_id": "v2", "title": "Video 2"}},
+            ]]
+        return [[
+            {"distance": 0.7, "entity": {"scene_id": "v1_s1", "video_id": "v1", "video_title": "Video 1"}},
+            {"distance": 0.6, "entity": {"scene_id": "v3_s1", "video_id": "v3", "video_title": "Video 3"}},
+            {"distance": 0.5, "entity": {"scene_id": "v1_s2", "video_id": "v1", "video_title": "Video 1"}},
+        ]]
+
+
+class TestJointSearch:
+    """Test search_joint"""
+
+    def test_embeds_query_once(self):
+        """Test that both collections are searched with a single embedding"""
+        client = FakeClient()
+        embedding_fn = FakeEmbeddingFn()
+
+        search_joint(client, embedding_fn, "test", k=2, scenes_per_content=2, search_type="semantic")
+
+        assert embedding_fn.calls == 1
+        assert len(client.searches) == 2
+        scene_search = next(
+            s for s in client.searches
+            if s["collection_name"] == settings.milvus_collection_name
+        )
+        assert scene_search["group_by_field"] == "video_id"
+        assert scene_search["group_size"] == 2
+
+    def test_contents_annotated_with_their_scenes(self):
+        """Test that scenes are attached to the content with the same id"""
+        result = search_joint(
+            FakeClient(), FakeEmbeddingFn(), "test", k=2, scenes_per_content=1, search_type="semantic",
+        )
+
+        assert result["total"] == 2
+        v1, v2 = result["hits"]
+        assert [s["scene_id"] for s in v1["scenes"]] == ["v1_s1"]
+        assert v2["scenes"] == []
+
+
+class BatchClient(FakeClient):
+    """Returns one hit per query vector, tagged with the query payload."""
+
+    def search(self, **kwargs):
+        self.searches.append(kwargs)
+        return [
+            [{"distance": 1.0, "entity": {"scene_id": f"{kwargs.get('filter', '')}|{q}", "video_id": "v"}}]
+            for q in kwargs["data"]
+        ]
+
+
+class TestBatchSearch:
+    """Test search_scene_batch"""
+
+    def _query(self, text, filter_expr=None, search_type="semantic", k=5):
+        return {
+            "query_text": text,
+            "k": k,
+            "search_type": search_type,
+            "filter_expr": filter_expr,
+            "group_size": None,
+        }
+
+    def test_single_encode_and_grouped_searches(self):
+        """Test one embedding call for all texts and one search per filter group"""
+        client = BatchClient()
+        embedding_fn = FakeEmbeddingFn()
+        queries = [
+            self._query("a"),
+            self._query("bb", 'category == "x"'),
+            self._query("ccc"),
+            self._query("a"),
+        ]
+
+        results = search_scene_batch(client, embedding_fn, queries)
+
+        assert embedding_fn.calls == 1
+        assert embedding_fn.last_texts == ["a", "bb", "ccc"]  # deduplicated
+        assert len(client.searches) == 2
+        assert sorted(len(s["data"]) for s in client.searches) == [1, 3]
+        assert len(results) == 4
+
+    def test_results_keep_input_order(self):
+        """Test that results line up with the input queries"""
+        queries = [
+            self._query("a", 'category == "x"'),
+            self._query("bb"),
+            self._query("ccc", 'category == "x"'),
+        ]
+
+        results = search_scene_batch(BatchClient(), FakeEmbeddingFn(), queries)
+
+        ids = [r["hits"][0]["scene_id"] for r in results]
+        assert ids[0].startswith('category == "x"|') and "1.0" in ids[0]
+        assert ids[1].startswith("|") and "2.0" in ids[1]
+        assert ids[2].startswith('category == "x"|') and "3.0" in ids[2]
+
+    def test_fulltext_queries_skip_embedding(self):
+        """Test that fulltext-only batches never call the embedding model"""
+        client = BatchClient()
+        results = search_scene_batch(client, None, [self._query("a", search_type="fulltext")])
+
+        assert client.searches[0]["data"] == ["a"]
+        assert results[0]["total"] == 1
+
+
+class HybridClient(FakeClient):
+    """Records hybrid_search kwargs and returns one hit per query."""
+
+    def hybrid_search(self, **kwargs):
+        self.searches.append(kwargs)
+        return [[{"distance": 0.5, "entity": {"scene_id": "s1", "video_id": "v1"}}] for _ in kwargs["reqs"][0].data]
+
+
+class TestMultiVectorSearch:
+    """Test weighted multi-vector scene search"""
+
+    def test_parse_vector_weights(self, monkeypatch):
+        """Test weight spec parsing and validation"""
+        monkeypatch.setattr(settings, "scene_multi_vector_enabled", True)
+        assert parse_vector_weights("text:1, visual:0.5,bm25") == {"text": 1.0, "visual": 0.5, "bm25": 1.0}
+        assert parse_vector_weights({"audio": 2, "text": 0}) == {"audio": 2}
+        for bad in ["image:1", "text:x", "text:-1", "text:0"]:
+            with pytest.raises(ValueError):
+                parse_vector_weights(bad)
+
+    def test_modality_vectors_need_setting(self, monkeypatch):
+        """Test visual/audio are rejected when the collection has no such fields"""
+        monkeypatch.setattr(settings, "scene_multi_vector_enabled", False)
+        with pytest.raises(ValueError):
+            parse_vector_weights("visual:1")
+
+    def test_single_hybrid_search_call(self):
+        """Test all weighted sub-searches go out in one hybrid_search"""
+        client = HybridClient()
+        embedding_fn = FakeEmbeddingFn()
+        result = search_scene_weighted(
+            client, embedding_fn, "q", k=5,
+            vector_weights={"text": 1.0, "visual": 0.5, "bm25": 0.3}, group_size=2,
+        )
+
+        assert embedding_fn.calls == 1
+        assert len(client.searches) == 1
+        call = client.searches[0]
+        assert [r.anns_field for r in call["reqs"]] == ["embedding", "visual_embedding", "sparse_embedding"]
+        assert call["reqs"][2].data == ["q"]
+        assert all(r.limit == 10 for r in call["reqs"])  # k * group_size candidates
+        assert call["group_by_field"] == "video_id"
+        assert result["total"] == 1
+
+    def test_bm25_only_weights_skip_embedding(self):
+        """Test a bm25-only weighting never calls the embedding model"""
+        client = HybridClient()
+        search_scene_weighted(client, None, "q", k=5, vector_weights={"bm25": 1.0})
+        assert client.searches[0]["reqs"][0].anns_field == "sparse_embedding"
+
+    def test_batch_groups_by_weights(self):
+        """Test batch queries with different weights are searched separately"""
+        client = HybridClient()
+        base = {"k": 5, "search_type": "semantic", "filter_expr": None, "group_size": None}
+        queries = [
+            {**base, "query_text": "a", "vector_weights": (("text", 1.0),)},
+            {**base, "query_text": "b", "vector_weights": (("audio", 1.0), ("text", 0.5))},
+            {**base, "query_text": "c", "vector_weights": (("text", 1.0),)},
+        ]
+        embedding_fn = FakeEmbeddingFn()
+        search_scene_batch(client, embedding_fn, queries)
+
+        assert embedding_fn.calls == 1
+        assert sorted(len(s["reqs"]) for s in client.searches) == [1, 2]
+
+
+class TestSceneModalityVectors:
+    """Test modality vectors on scene rows and schema"""
+
+    def test_add_scene_modality_vectors(self):
+        from src.sync_utils import add_scene_modality_vectors
+
+        class DocEmbeddingFn:
+            def encode_documents(self, texts):
+                self.texts = list(texts)
+                return [[float(i)] for i in range(len(texts))]
+
+        fn = DocEmbeddingFn()
+        docs = [
+            {"scene_description": "desc", "visual_caption": "cap", "audio_summarization": "sum",
+             "audio_transcription": "tr"},
+            {"scene_description": "only desc", "visual_caption": "", "audio_summarization": "",
+             "audio_transcription": ""},
+        ]
+        add_scene_modality_vectors(fn, docs)
+
+        assert fn.texts == ["cap", "only desc", "sum\ntr", "only desc"]
+        assert docs[0]["visual_embedding"] == [0.0] and docs[0]["audio_embedding"] == [2.0]
+
+    def test_schema_has_modality_fields_when_enabled(self, monkeypatch):
+        from src.milvus_manager import _build_scenes_schema
+
+        monkeypatch.setattr(settings, "scene_multi_vector_enabled", True)
+        names = [f.name for f in _build_scenes_schema().fields]
+        assert "visual_embedding" in names and "audio_embedding" in names
+
+        monkeypatch.setattr(settings, "scene_multi_vector_enabled", False)
+        names = [f.name for f in _build_scenes_schema().fields]
+        assert "visual_embedding" not in names
+
+
+class SparseEmbeddingFn(FakeEmbeddingFn):
+    def encode_queries_with_sparse(self, texts):
+        return self.encode_queries(texts), [{len(t): 1.0} for t in texts]
+
+
+class TestLearnedSparseSearch:
+    """Test bge-m3 learned sparse as third hybrid sub-request"""
+
+    @pytest.fixture(autouse=True)
+    def _enable(self, monkeypatch):
+        monkeypatch.setattr(settings, "learned_sparse_enabled", True)
+
+    def test_scene_hybrid_has_three_requests(self):
+        client = HybridClient()
+        embedding_fn = SparseEmbeddingFn()
+        search_scene_hybrid(client, embedding_fn, "abc", k=5)
+
+        assert embedding_fn.calls == 1
+        reqs = client.searches[0]["reqs"]
+        assert [r.anns_field for r in reqs] == ["embedding", "sparse_embedding", "learned_sparse_embedding"]
+        assert reqs[2].data == [{3: 1.0}]
+
+    def test_content_hybrid_has_three_requests(self):
+        client = HybridClient()
+        search_content_hybrid(client, SparseEmbeddingFn(), "ab", k=5)
+        assert client.searches[0]["reqs"][2].anns_field == "learned_sparse_embedding"
+
+    def test_weighted_sparse_vector(self):
+        assert parse_vector_weights("sparse:1") == {"sparse": 1.0}
+        client = HybridClient()
+        search_scene_weighted(client, SparseEmbeddingFn(), "q", k=5, vector_weights={"sparse": 1.0, "bm25": 0.5})
+        assert [r.anns_field for r in client.searches[0]["reqs"]] == ["learned_sparse_embedding", "sparse_embedding"]
+
+    def test_batch_passes_sparse(self):
+        client = HybridClient()
+        base = {"k": 5, "search_type": "hybrid", "filter_expr": None, "group_size": None}
+        embedding_fn = SparseEmbeddingFn()
+        search_scene_batch(client, embedding_fn, [{**base, "query_text": "a"}, {**base, "query_text": "bb"}])
+
+        assert embedding_fn.calls == 1
+        assert client.searches[0]["reqs"][2].data == [{1: 1.0}, {2: 1.0}]
+
+    def test_schema_fields(self):
+        from src.milvus_manager import _build_contents_schema, _build_scenes_schema
+
+        for schema in (_build_scenes_schema(), _build_contents_schema()):
+            assert "learned_sparse_embedding" in [f.name for f in schema.fields]
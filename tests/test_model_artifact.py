@@ -0,0 +1,90 @@
+"""
+Test loading the embedding model from a local artifact (MS_EMBEDDING_MODEL_PATH)
+"""
+import os
+
+import pytest
+
+from src import milvus_client
+from src.config import settings
+from src.model_artifact import WEIGHTS_FILE, apply_offline_mode, model_source, read_manifest
+
+
+@pytest.fixture
+def hub_env(monkeypatch):
+    """Clear the hub offline switches; monkeypatch restores them afterwards."""
+    for var in ("HF_HUB_OFFLINE", "TRANSFORMERS_OFFLINE"):
+        monkeypatch.delenv(var, raising=False)
+
+
+class TestModelSource:
+    """Test model_source and apply_offline_mode"""
+
+    def test_hub_name_by_default(self, monkeypatch, hub_env):
+        """Test that the model name is used and the hub stays reachable"""
+        monkeypatch.setattr(settings, "embedding_model_path", "")
+        monkeypatch.setattr(settings, "embedding_offline", False)
+        apply_offline_mode()
+
+        assert model_source() == settings.embedding_model_name
+        assert "HF_HUB_OFFLINE" not in os.environ
+
+    def test_local_artifact(self, monkeypatch, tmp_path, hub_env):
+        """Test that a model path with safetensors weights is loaded offline"""
+        (tmp_path / WEIGHTS_FILE).write_bytes(b"")
+        monkeypatch.setattr(settings, "embedding_model_path", str(tmp_path))
+        apply_offline_mode()
+
+        assert model_source() == str(tmp_path)
+        assert os.environ["HF_HUB_OFFLINE"] == "1"
+        assert os.environ["TRANSFORMERS_OFFLINE"] == "1"
+
+    def test_missing_weights(self, monkeypatch, tmp_path):
+        """Test that an unexported path fails with the export command"""
+        monkeypatch.setattr(settings, "embedding_model_path", str(tmp_path))
+        with pytest.raises(FileNotFoundError, match="scripts.export_model"):
+            model_source()
+
+
+class TestLoadLocalEmbeddingFn:
+    """Test that the sentence_transformers backend is pointed at the artifact"""
+
+    def test_loads_from_path(self, monkeypatch, tmp_path, hub_env):
+        """Test model_name and local_files_only passed to SentenceTransformerEmbeddingFunction"""
+        from pymilvus.model import dense
+
+        calls = []
+        monkeypatch.setattr(dense, "SentenceTransformerEmbeddingFunction", lambda **kwargs: calls.append(kwargs))
+        (tmp_path / WEIGHTS_FILE).write_bytes(b"")
+        monkeypatch.setattr(settings, "embedding_backend", "sentence_transformers")
+        monkeypatch.setattr(settings, "embedding_model_path", str(tmp_path))
+
+        milvus_client.load_local_embedding_fn()
+        assert calls[0]["model_name"] == str(tmp_path)
+        assert calls[0]["local_files_only"] is True
+
+
+class TestExportModel:
+    """Test scripts/export_model.py without network access"""
+
+    def test_export(self, monkeypatch, tmp_path):
+        """Test that pickled weights are dropped and the manifest lists the files"""
+        import huggingface_hub
+
+        from scripts.export_model import export
+
+        def fake_snapshot_download(repo_id, revision, local_dir, ignore_patterns):
+            (local_dir / WEIGHTS_FILE).write_bytes(b"weights")
+            (local_dir / "pytorch_model.bin").write_bytes(b"pickle")
+            (local_dir / "tokenizer.json").write_text("{}")
+            (local_dir / ".cache").mkdir()
+            (local_dir / ".cache" / "meta").write_text("")
+
+        monkeypatch.setattr(huggingface_hub, "snapshot_download", fake_snapshot_download)
+        output = export("BAAI/bge-m3", tmp_path / "bge-m3", revision="abc123")
+
+        assert not (output / "pytorch_model.bin").exists()
+        manifest = read_manifest(output)
+        assert manifest["model_name"] == "BAAI/bge-m3"
+        assert manifest["revision"] == "abc123"
+        assert manifest["files"] == {WEIGHTS_FILE: 7, "tokenizer.json": 2}
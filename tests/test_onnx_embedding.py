@@ -0,0 +1,62 @@
+"""
+Parity test: ONNX backend vs. the SentenceTransformer backend
+
+Runs only when an exported model exists (python -m scripts.export_onnx) and
+both onnxruntime and sentence-transformers are installed.
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.config import settings
+from src.onnx_embedding import ONNX_MODEL_FILE, ONNX_QUANTIZED_MODEL_FILE
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("sentence_transformers")
+
+TEXTS = [
+    "Phóng sự về lễ hội đền Hùng",
+    "Người dẫn chương trình giới thiệu bản tin thời sự buổi tối",
+    "a",
+    "Trận bóng đá giữa Việt Nam và Thái Lan tại sân Mỹ Đình " * 20,
+]
+
+
+def _require(model_file):
+    if not (Path(settings.embedding_onnx_path) / model_file).exists():
+        pytest.skip(f"{model_file} not exported to {settings.embedding_onnx_path}")
+
+
+@pytest.fixture(scope="module")
+def reference_vectors():
+    from pymilvus import model
+
+    fn = model.dense.SentenceTransformerEmbeddingFunction(
+        model_name=settings.embedding_model_name, device="cpu",
+    )
+    return np.asarray(fn.encode_documents(TEXTS))
+
+
+class TestOnnxParity:
+    """ONNX vectors must match the current PyTorch vectors"""
+
+    @pytest.mark.parametrize("quantized, min_cosine", [(False, 0.999), (True, 0.97)])
+    def test_cosine_parity(self, reference_vectors, quantized, min_cosine):
+        _require(ONNX_QUANTIZED_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+        from src.onnx_embedding import OnnxEmbeddingFunction
+
+        fn = OnnxEmbeddingFunction(settings.embedding_onnx_path, quantized=quantized)
+        vectors = np.asarray(fn.encode_documents(TEXTS))
+
+        assert vectors.shape == reference_vectors.shape
+        cosine = (vectors * reference_vectors).sum(axis=1)
+        assert cosine.min() >= min_cosine
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-4)
+
+    def test_queries_match_documents(self):
+        _require(ONNX_MODEL_FILE)
+        from src.onnx_embedding import OnnxEmbeddingFunction
+
+        fn = OnnxEmbeddingFunction(settings.embedding_onnx_path)
+        np.testing.assert_allclose(fn.encode_queries(TEXTS[:2]), fn.encode_documents(TEXTS[:2]), atol=1e-6)
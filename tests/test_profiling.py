@@ -0,0 +1,75 @@
+"""
+Test per-request search profiling (profile=true)
+"""
+from pathlib import Path
+
+from src.config import settings
+from src.profiling import current_profile, profiling
+
+
+class FakeEmbeddingFn:
+    def encode_queries(self, texts):
+        return [[1.0, 0.0] for _ in texts]
+
+
+class FakeClient:
+    def search(self, **kwargs):
+        return [[{"distance": 0.9, "entity": {"scene_id": "s1", "video_id": "v1"}}]]
+
+    def hybrid_search(self, **kwargs):
+        return [[{"distance": 0.5, "entity": {"scene_id": "s1", "video_id": "v1"}},
+                 {"distance": 0.4, "entity": {"scene_id": "s2", "video_id": "v1"}}]]
+
+
+class TestRequestProfile:
+    """Test stage timings and Milvus call capture"""
+
+    def test_disabled_collects_nothing(self):
+        with profiling(False) as profile:
+            assert profile is None
+            assert current_profile() is None
+
+    def test_hybrid_search_breakdown(self):
+        from src.milvus_queries import search_scene_hybrid
+
+        with profiling(True) as profile:
+            search_scene_hybrid(FakeClient(), FakeEmbeddingFn(), "q", k=5, filter_expr='category == "news"')
+        assert current_profile() is None
+
+        data = profile.to_dict()
+        assert {"encode_queries", "milvus_hybrid_search", "parse_hits", "facets"} <= set(data["stages"])
+        [call] = data["milvus_calls"]
+        assert call["operation"] == "hybrid_search"
+        assert call["candidates"] == [2]
+        assert call["params"]["filter"] == 'category == "news"'
+        assert [r["anns_field"] for r in call["params"]["reqs"]] == ["embedding", "sparse_embedding"]
+        assert call["params"]["reqs"][0]["param"]["params"]["ef"] == 256
+
+    def test_joint_search_threads_report_to_profile(self):
+        from src.milvus_queries import search_joint
+
+        with profiling(True) as profile:
+            search_joint(FakeClient(), FakeEmbeddingFn(), "q", k=5, scenes_per_content=2, search_type="semantic")
+        assert len(profile.milvus_calls) == 2
+
+    def test_sampled_cprofile_dump(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "profile_dump_sample_rate", 1.0)
+        monkeypatch.setattr(settings, "profile_dump_dir", str(tmp_path))
+        with profiling(True) as profile:
+            sum(range(1000))
+        assert profile.dump_path and Path(profile.dump_path).exists()
+
+
+class TestRunProfiled:
+    """Test the profile attached to route responses"""
+
+    def test_attaches_profile_only_when_enabled(self):
+        from api.models.search import SearchResponse
+        from api.routes.search import run_profiled
+
+        def search():
+            return SearchResponse(total=0, hits=[])
+
+        assert run_profiled(False, search).profile is None
+        response = run_profiled(True, search)
+        assert response.profile is not None and response.profile.total_ms >= 0
@@ -0,0 +1,125 @@
+"""
+Test the sampled search query log (src/query_log.py)
+"""
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from src import query_log
+from src.config import settings
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    path = tmp_path / "logs" / "query_log.jsonl"
+    monkeypatch.setattr(settings, "query_log_enabled", True)
+    monkeypatch.setattr(settings, "query_log_path", str(path))
+    monkeypatch.setattr(settings, "query_log_sample_rate", 1.0)
+    monkeypatch.setattr(settings, "query_log_slow_ms", 0.0)
+    yield path
+    query_log.shutdown()
+
+
+SCENE_REQUEST = {
+    "method": "POST",
+    "path": "/v1/search/scene/filter",
+    "json": {"query_text": "bão lũ", "k": 5, "search_type": "hybrid", "category": ["Tin tức"], "group_size": 1},
+}
+
+
+class TestQueryLog:
+    """Test record format, sampling and reading back"""
+
+    def test_record(self, log_file):
+        """Test that the request, lifted fields, latency and result ids are written"""
+        query_log.log_search(SCENE_REQUEST, 200, 0.0123, ["s1", "s2"])
+        query_log.shutdown()
+
+        record = json.loads(log_file.read_text(encoding="utf-8"))
+        assert record["path"] == "/v1/search/scene/filter"
+        assert record["json"] == SCENE_REQUEST["json"]
+        assert record["query_text"] == "bão lũ"
+        assert record["search_type"] == "hybrid"
+        assert record["k"] == 5
+        assert record["filters"] == {"category": ["Tin tức"]}
+        assert record["latency_ms"] == 12.3
+        assert record["result_ids"] == ["s1", "s2"]
+
+    def test_sampling_keeps_slow_requests(self, log_file, monkeypatch):
+        """Test that with sampling off only requests over the slow threshold are logged"""
+        monkeypatch.setattr(settings, "query_log_sample_rate", 0.0)
+        monkeypatch.setattr(settings, "query_log_slow_ms", 100.0)
+
+        query_log.log_search(SCENE_REQUEST, 200, 0.050, [])
+        query_log.log_search(SCENE_REQUEST, 200, 0.250, [])
+        query_log.shutdown()
+
+        assert [r["latency_ms"] for r in query_log.load_records(log_file)] == [250.0]
+
+    def test_disabled(self, log_file, monkeypatch):
+        """Test that nothing is written when the log is disabled"""
+        monkeypatch.setattr(settings, "query_log_enabled", False)
+        query_log.log_search(SCENE_REQUEST, 200, 1.0, [])
+        assert not log_file.exists()
+
+    def test_load_records_reads_backups_oldest_first(self, tmp_path):
+        """Test that rotated files are read before the current one"""
+        path = tmp_path / "q.jsonl"
+        (tmp_path / "q.jsonl.2").write_text('{"n": 1}\n', encoding="utf-8")
+        (tmp_path / "q.jsonl.1").write_text('{"n": 2}\nnot json\n', encoding="utf-8")
+        path.write_text('{"n": 3}\n', encoding="utf-8")
+
+        assert [r["n"] for r in query_log.load_records(path)] == [1, 2, 3]
+
+    def test_iter_records_streams(self, tmp_path):
+        """Test that records are yielded one by one instead of read up front"""
+        path = tmp_path / "q.jsonl"
+        path.write_text('{"n": 1}\n{"n": 2}\n', encoding="utf-8")
+
+        records = query_log.iter_records(path)
+        assert next(records) == {"n": 1}
+        assert list(records) == [{"n": 2}]
+
+    def test_records_replay_with_load_test(self, log_file):
+        """Test that logged records are valid load_test replay input"""
+        from scripts.load_test import load_replay_log
+
+        query_log.log_search(SCENE_REQUEST, 200, 0.01, [])
+        query_log.shutdown()
+
+        entries = load_replay_log(log_file)
+        assert entries[0]["method"] == "POST"
+        assert entries[0]["json"] == SCENE_REQUEST["json"]
+
+
+class TestRunLogged:
+    """Test the search route helper"""
+
+    def test_hit_ids_and_errors(self, log_file):
+        """Test that hit ids are logged on success and the status on HTTP errors"""
+        from api.models.search import SceneHit, SearchResponse
+        from api.routes.search import get_request, run_logged
+
+        hit = SceneHit(
+            score=1.0, scene_id="s1", scene_description="", start_time_sec=0.0, end_time_sec=1.0,
+            content_id="v1", video_title="",
+        )
+
+        def search():
+            return SearchResponse(total=1, hits=[hit], facets={})
+
+        def failing_search():
+            raise HTTPException(status_code=502, detail="Milvus error: down")
+
+        request = get_request("/v1/search/scene", query_text="bão", k=5, vectors=None)
+        assert run_logged(request, False, search).total == 1
+        with pytest.raises(HTTPException):
+            run_logged(request, False, failing_search)
+        query_log.shutdown()
+
+        ok, failed = query_log.load_records(log_file)
+        assert ok["params"] == {"query_text": "bão", "k": 5}
+        assert ok["result_ids"] == ["s1"]
+        assert failed["status"] == 502
+        assert failed["result_ids"] == []
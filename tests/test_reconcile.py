@@ -0,0 +1,197 @@
+"""
+Test scripts/reconcile.py against in-memory MongoDB and Milvus stand-ins
+"""
+import copy
+from collections import Counter
+
+import pytest
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.stand_ins import FakeMongoCollection, HashEmbeddingFunction, InMemoryMilvusClient
+from scripts.reconcile import diff, reconcile
+from src import milvus_client, milvus_manager
+from src.config import settings
+from src.sync_utils import (
+    SOURCE_DIGEST_FIELD,
+    sync_upsert_content,
+    sync_upsert_scenes,
+    transform_mongo_doc,
+    transform_mongo_doc_to_content,
+)
+
+
+class CountingEmbeddingFunction(HashEmbeddingFunction):
+    def __init__(self, dim: int):
+        super().__init__(dim)
+        self.documents = 0
+        self.calls = 0
+
+    def encode_documents(self, documents):
+        self.documents += len(documents)
+        self.calls += 1
+        return super().encode_documents(documents)
+
+
+class FlushCountingClient(InMemoryMilvusClient):
+    def __init__(self, fields=None):
+        super().__init__(fields)
+        self.flushes = Counter()
+
+    def flush(self, collection_name, **kwargs):
+        self.flushes[collection_name] += 1
+
+
+def sync_corpus(monkeypatch, docs):
+    """Sync *docs* fully into an in-memory Milvus with source digests."""
+    client = FlushCountingClient(fields={SOURCE_DIGEST_FIELD})
+    embedding_fn = CountingEmbeddingFunction(settings.embedding_dimension)
+    monkeypatch.setattr(settings, "backend", "milvus")
+    monkeypatch.setattr(settings, "content_chunks_enabled", False)
+    monkeypatch.setattr(settings, "scene_multi_vector_enabled", False)
+    monkeypatch.setattr(settings, "learned_sparse_enabled", False)
+    monkeypatch.setattr(milvus_client, "_client", client)
+    monkeypatch.setattr(milvus_client, "_embedding_fn", embedding_fn)
+    monkeypatch.setattr(milvus_manager, "_has_source_digest", {})
+
+    for doc in docs:
+        sync_upsert_scenes(transform_mongo_doc(doc))
+        sync_upsert_content(transform_mongo_doc_to_content(doc))
+    embedding_fn.documents = embedding_fn.calls = 0
+    client.flushes.clear()
+    return client, embedding_fn
+
+
+@pytest.fixture
+def synced(monkeypatch):
+    """Three videos fully synced."""
+    docs = generate_corpus(3, 4, seed=7)
+    return (*sync_corpus(monkeypatch, docs), docs)
+
+
+def rows(client, collection_name):
+    return {row["scene_id"] if "scene_id" in row else row["content_id"]: row
+            for row in client.query(collection_name)}
+
+
+class TestDiff:
+    """Test the set differences"""
+
+    def test_diff(self):
+        """Test missing, changed, orphans and unsourced orphans"""
+        source = {"a": ("d1", 1), "b": ("d2", 1), "c": ("d3", 2)}
+        target = {"a": "d1", "b": "old", "x": "d9", "y": None}
+        result = diff(source, target)
+
+        assert result.missing == ["c"]
+        assert result.changed == ["b"]
+        assert result.orphans == ["x"]
+        assert result.unsourced_orphans == ["y"]
+
+    def test_ids_only(self):
+        """Test that without digests nothing is changed and orphans are unsourced"""
+        result = diff({"a": ("d1", 1)}, {"a": None, "x": None}, compare_digests=False)
+        assert result.changed == []
+        assert result.unsourced_orphans == ["x"]
+
+
+class TestReconcile:
+    """Test reconcile end to end"""
+
+    def test_in_sync(self, synced):
+        """Test that an in-sync corpus reports nothing and embeds nothing"""
+        client, embedding_fn, docs = synced
+        report = reconcile(FakeMongoCollection(docs), client, ["scenes", "contents"])
+
+        assert report["scenes"]["mongo"] == report["scenes"]["milvus"] == 12
+        for kind in ("scenes", "contents"):
+            assert all(report[kind][name]["count"] == 0
+                       for name in ("missing", "changed", "orphans", "unsourced_orphans"))
+        assert embedding_fn.documents == 0
+
+    def test_repairs_only_the_drift(self, synced):
+        """Test delete without pre-image, a changed scene and a missed insert"""
+        client, embedding_fn, docs = synced
+        deleted, edited, *kept = docs
+        edited = copy.deepcopy(edited)
+        edited["enriched_data"]["scene_list"][0]["scene_captioning"] = "Cảnh mới sau khi sửa"
+        changed_scene = edited["enriched_data"]["scene_list"][0]["scene_id"]
+        missed_scene = kept[0]["enriched_data"]["scene_list"][1]["scene_id"]
+        client.delete(settings.milvus_collection_name, ids=[missed_scene])
+        api_row = {"scene_id": "api-only", "scene_description": "ingested through the API"}
+        client.upsert(settings.milvus_collection_name, [api_row])
+        mongo = FakeMongoCollection([edited, *kept])
+
+        dry = reconcile(mongo, client, ["scenes", "contents"], dry_run=True)
+        assert dry["scenes"]["orphans"]["count"] == 4
+        assert dry["scenes"]["changed"]["sample"] == [changed_scene]
+        assert dry["scenes"]["missing"]["sample"] == [missed_scene]
+        assert dry["scenes"]["unsourced_orphans"]["sample"] == ["api-only"]
+        assert dry["contents"]["orphans"]["sample"] == [deleted["unique_id"]]
+        assert "api-only" in rows(client, settings.milvus_collection_name)  # dry run repairs nothing
+
+        report = reconcile(mongo, client, ["scenes", "contents"])
+        scenes = rows(client, settings.milvus_collection_name)
+        assert report["scenes"]["deleted"] == 4
+        assert report["scenes"]["resynced"] == 2
+        assert report["contents"]["resynced"] == 0  # a scene caption is not part of the content row
+        assert "Cảnh mới" in scenes[changed_scene]["scene_description"]
+        assert missed_scene in scenes
+        assert "api-only" in scenes
+        assert deleted["unique_id"] not in rows(client, settings.milvus_content_collection_name)
+        assert embedding_fn.documents == 2  # the 2 drifted scenes, not the corpus
+
+        again = reconcile(mongo, client, ["scenes", "contents"], dry_run=True)
+        assert all(again["scenes"][name]["count"] == 0 for name in ("missing", "changed", "orphans"))
+
+    def test_delete_unsourced(self, synced):
+        """Test that rows without a digest are deleted only on request"""
+        client, _, docs = synced
+        client.upsert(settings.milvus_collection_name, [{"scene_id": "api-only", "scene_description": ""}])
+
+        report = reconcile(FakeMongoCollection(docs), client, ["scenes"], delete_unsourced=True)
+        assert report["scenes"]["deleted"] == 1
+        assert "api-only" not in rows(client, settings.milvus_collection_name)
+
+
+class TestBatching:
+    """Test that repairs are batched instead of one flush per row"""
+
+    def test_content_drift_batched(self, monkeypatch):
+        """Test one flush and one encode call per batch of orphaned and changed contents"""
+        docs = generate_corpus(8, 1, seed=7)
+        client, embedding_fn = sync_corpus(monkeypatch, docs)
+        kept = copy.deepcopy(docs[4:])
+        for doc in kept:
+            doc["enriched_data"]["audio"]["metadata"]["transcription"] = "Bản ghi âm đã sửa"
+
+        report = reconcile(FakeMongoCollection(kept), client, ["contents"])
+
+        assert report["contents"]["deleted"] == 4
+        assert report["contents"]["resynced"] == 4
+        # one delete batch + one upsert batch, not one flush per content
+        assert client.flushes[settings.milvus_content_collection_name] == 2
+        assert embedding_fn.calls == 1
+        assert embedding_fn.documents == 4
+
+
+class TestSourceDigestField:
+    """Test adding source_digest to existing collections"""
+
+    class OldCollectionClient(InMemoryMilvusClient):
+        def __init__(self, supports_add: bool):
+            super().__init__()
+            self.supports_add = supports_add
+
+        def add_collection_field(self, collection_name, field_name, **kwargs):
+            if not self.supports_add:
+                raise RuntimeError("AddCollectionField not supported")
+            self._fields.add(field_name)
+
+    @pytest.mark.parametrize("supports_add", [True, False])
+    def test_ensure_field(self, monkeypatch, supports_add):
+        """Test that the field is added in place, or reported missing on older servers"""
+        monkeypatch.setattr(milvus_manager, "_has_source_digest", {})
+        client = self.OldCollectionClient(supports_add)
+
+        assert milvus_manager.ensure_source_digest_field(client, "scenes") is supports_add
+        assert milvus_manager.has_source_digest(client, "scenes") is supports_add
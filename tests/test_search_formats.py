@@ -65,6 +65,14 @@ class TestSceneSearchFormat:
                 assert "video_tags" in hit
                 assert isinstance(hit["video_tags"], list)
     
+    def test_scene_search_group_by_validation(self, client):
+        """Test that only video_id grouping and positive group sizes are accepted"""
+        response = client.get("/v1/search/scene?query_text=test&group_by=author")
+        assert response.status_code == 422
+        
+        response = client.get("/v1/search/scene?query_text=test&group_by=video_id&group_size=0")
+        assert response.status_code == 422
+    
     def test_scene_filter_endpoint_format(self, client):
         """Test scene filter endpoint request/response format"""
         request_data = {
@@ -93,8 +101,68 @@ class TestSceneSearchFormat:
             assert "facets" in data
 
 
+class TestSceneSegmentFormat:
+    """Test scene segment search response format"""
+    
+    def test_segment_search_requires_query_text(self, client):
+        """Test that query_text is required"""
+        response = client.get("/v1/search/scene/segments")
+        assert response.status_code == 422
+    
+    def test_segment_search_rejects_invalid_score_mode(self, client):
+        """Test that score_mode is validated"""
+        response = client.get("/v1/search/scene/segments?query_text=test&score_mode=avg")
+        assert response.status_code == 422
+    
+    def test_segment_search_response_structure(self, client):
+        """Test segment search response structure when successful"""
+        response = client.get("/v1/search/scene/segments?query_text=test&k=5&group_size=3")
+        
+        if response.status_code == 200:
+            data = response.json()
+            
+            assert "total" in data
+            assert "segments" in data
+            assert isinstance(data["segments"], list)
+            
+            if len(data["segments"]) > 0:
+                seg = data["segments"][0]
+                assert "content_id" in seg
+                assert "start_time_sec" in seg
+                assert "end_time_sec" in seg
+                assert "scene_ids" in seg
+                assert seg["scene_count"] == len(seg["scene_ids"])
+
+
+class TestWeightedSceneSearch:
+    """Test weighted multi-vector scene search validation"""
+
+    def test_unknown_vector_rejected(self, client, monkeypatch):
+        """Test unknown vector names return 422"""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "backend", "milvus")
+        response = client.get("/v1/search/scene?query_text=test&vectors=image:1")
+        assert response.status_code == 422
+
+        response = client.post("/v1/search/scene/filter", json={"query_text": "test", "vector_weights": {"text": 0}})
+        assert response.status_code == 422
+
+
 class TestContentSearchFormat:
     """Test content search response formats"""
+
+    def test_content_chunk_pooling_validation(self, client, monkeypatch):
+        """Test chunk_pooling accepts max/sum and needs content chunks enabled"""
+        from src.config import settings
+
+        response = client.get("/v1/search/content?query_text=test&chunk_pooling=avg")
+        assert response.status_code == 422
+
+        monkeypatch.setattr(settings, "backend", "milvus")
+        monkeypatch.setattr(settings, "content_chunks_enabled", False)
+        response = client.get("/v1/search/content?query_text=test&chunk_pooling=max")
+        assert response.status_code == 501
     
     def test_content_search_endpoint_exists(self, client):
         """Test that content search endpoint exists"""
@@ -154,6 +222,35 @@ class TestContentSearchFormat:
         assert response.status_code != 404
 
 
+class TestJointSearchFormat:
+    """Test joint content + scene search response format"""
+    
+    def test_joint_search_requires_query_text(self, client):
+        """Test that query_text is required"""
+        response = client.get("/v1/search/joint")
+        assert response.status_code == 422
+    
+    def test_joint_search_response_structure(self, client):
+        """Test joint search response structure when successful"""
+        response = client.get("/v1/search/joint?query_text=test&k=5&scenes_per_content=2")
+        
+        assert response.status_code in [200, 501, 502]
+        if response.status_code == 200:
+            data = response.json()
+            
+            assert "total" in data
+            assert "hits" in data
+            assert "facets" in data
+            
+            for hit in data["hits"]:
+                assert "content_id" in hit
+                assert "scenes" in hit
+                assert isinstance(hit["scenes"], list)
+                assert len(hit["scenes"]) <= 2
+                for scene in hit["scenes"]:
+                    assert scene["content_id"] == hit["content_id"]
+
+
 class TestSceneListFormat:
     """Test scene list response format"""
     
@@ -319,3 +416,39 @@ class TestFacetsFormat:
                         assert "count" in item
                         assert "content_ids" in item
                         assert isinstance(item["content_ids"], list)
+
+
+class TestBatchSearchFormat:
+    """Test batch search request validation and response format"""
+    
+    def test_scene_batch_requires_queries(self, client):
+        """Test that an empty batch is rejected"""
+        response = client.post("/v1/search/scene/batch", json={"queries": []})
+        assert response.status_code == 422
+    
+    def test_scene_batch_validates_items(self, client):
+        """Test that each query is validated like a filter request"""
+        response = client.post(
+            "/v1/search/scene/batch",
+            json={"queries": [{"query_text": "test", "search_type": "fuzzy"}]},
+        )
+        assert response.status_code == 422
+    
+    def test_content_batch_response_structure(self, client):
+        """Test content batch response structure when successful"""
+        response = client.post(
+            "/v1/search/content/batch",
+            json={"queries": [
+                {"query_text": "test", "k": 3},
+                {"query_text": "other", "category": ["news"], "search_type": "fulltext"},
+            ]},
+        )
+        
+        assert response.status_code in [200, 501, 502]
+        if response.status_code == 200:
+            data = response.json()
+            assert "results" in data
+            assert len(data["results"]) == 2
+            for result in data["results"]:
+                assert "total" in result
+                assert "hits" in result
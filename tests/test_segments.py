@@ -0,0 +1,68 @@
+"""
+Test merging of scene hits into per-video segments
+"""
+from src.milvus_queries import build_scene_segments
+
+
+def _hit(scene_id, video_id, start, end, score):
+    return {
+        "score": score,
+        "scene_id": scene_id,
+        "content_id": video_id,
+        "video_title": f"Title {video_id}",
+        "video_name": f"{video_id}.mp4",
+        "start_time_sec": start,
+        "end_time_sec": end,
+    }
+
+
+class TestBuildSceneSegments:
+    """Test build_scene_segments"""
+
+    def test_adjacent_and_overlapping_scenes_merge(self):
+        """Test that touching/overlapping scenes of one video form one segment"""
+        hits = [
+            _hit("s2", "v1", 10.0, 20.0, 0.8),
+            _hit("s1", "v1", 0.0, 10.0, 0.5),
+            _hit("s3", "v1", 18.0, 30.0, 0.6),
+        ]
+        segments = build_scene_segments(hits)
+
+        assert len(segments) == 1
+        seg = segments[0]
+        assert seg["scene_ids"] == ["s1", "s2", "s3"]
+        assert seg["start_time_sec"] == 0.0
+        assert seg["end_time_sec"] == 30.0
+        assert seg["scene_count"] == 3
+        assert seg["max_score"] == 0.8
+        assert abs(seg["total_score"] - 1.9) < 1e-9
+
+    def test_gap_splits_segments(self):
+        """Test that a gap larger than gap_sec starts a new segment"""
+        hits = [
+            _hit("s1", "v1", 0.0, 10.0, 0.5),
+            _hit("s2", "v1", 12.0, 20.0, 0.9),
+        ]
+        assert len(build_scene_segments(hits, gap_sec=1.0)) == 2
+        assert len(build_scene_segments(hits, gap_sec=2.0)) == 1
+
+    def test_videos_never_merge(self):
+        """Test that scenes from different videos stay separate"""
+        hits = [
+            _hit("a1", "v1", 0.0, 10.0, 0.5),
+            _hit("b1", "v2", 0.0, 10.0, 0.7),
+        ]
+        segments = build_scene_segments(hits)
+        assert [s["content_id"] for s in segments] == ["v2", "v1"]
+
+    def test_score_mode_sum(self):
+        """Test ranking by summed scores"""
+        hits = [
+            _hit("a1", "v1", 0.0, 10.0, 0.5),
+            _hit("a2", "v1", 10.0, 20.0, 0.5),
+            _hit("b1", "v2", 0.0, 10.0, 0.9),
+        ]
+        assert build_scene_segments(hits, score_mode="max")[0]["content_id"] == "v2"
+        top = build_scene_segments(hits, score_mode="sum")[0]
+        assert top["content_id"] == "v1"
+        assert top["score"] == top["total_score"]
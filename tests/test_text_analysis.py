@@ -0,0 +1,86 @@
+"""
+Test BM25 text analysis (word segmentation, stopwords, analyzer params)
+"""
+import pytest
+
+from src import text_analysis
+from src.config import settings
+from src.text_analysis import build_analyzer_params, load_stopwords, prepare_bm25_queries, prepare_bm25_text
+
+
+def fake_segmenter(name):
+    """Joins the known two-syllable words like pyvi does"""
+    words = {"học sinh": "học_sinh", "Hà Nội": "Hà_Nội"}
+
+    def segment(text):
+        for word, joined in words.items():
+            text = text.replace(word, joined)
+        return text
+    return segment
+
+
+class TestWordSegmentation:
+    """Test segmentation applied to ingest text and queries"""
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.setattr(settings, "bm25_word_segmenter", "none")
+        assert prepare_bm25_text("học sinh Hà Nội") == "học sinh Hà Nội"
+
+    def test_segmented_ingest_and_query_match(self, monkeypatch):
+        monkeypatch.setattr(settings, "bm25_word_segmenter", "pyvi")
+        monkeypatch.setattr(text_analysis, "_segmenter", fake_segmenter)
+        assert prepare_bm25_text("học sinh ở Hà Nội") == "học_sinh ở Hà_Nội"
+        assert prepare_bm25_queries(["học sinh"]) == ["học_sinh"]
+
+    def test_unknown_segmenter(self):
+        with pytest.raises(ValueError):
+            text_analysis.segment_words("a", "jieba")
+
+
+class TestAnalyzerParams:
+    """Test Milvus analyzer params from settings"""
+
+    def test_default_is_standard(self, monkeypatch):
+        monkeypatch.setattr(settings, "bm25_stopwords", "")
+        monkeypatch.setattr(settings, "bm25_fold_diacritics", False)
+        assert build_analyzer_params() == {"type": "standard"}
+
+    def test_stopwords_before_folding(self, monkeypatch):
+        monkeypatch.setattr(settings, "bm25_stopwords", "vi")
+        monkeypatch.setattr(settings, "bm25_fold_diacritics", True)
+        params = build_analyzer_params()
+
+        assert params["tokenizer"] == "standard"
+        assert params["filter"][0] == "lowercase"
+        assert params["filter"][1]["type"] == "stop" and "của" in params["filter"][1]["stop_words"]
+        assert params["filter"][2] == "asciifolding"
+
+    def test_stopword_file(self, tmp_path):
+        path = tmp_path / "stop.txt"
+        path.write_text("# comment\nCủa\n\nvà\n", encoding="utf-8")
+        assert load_stopwords(str(path)) == ["của", "và"]
+
+    def test_schema_uses_analyzer(self, monkeypatch):
+        from src.milvus_manager import _build_contents_schema
+
+        monkeypatch.setattr(settings, "bm25_fold_diacritics", True)
+        field = next(f for f in _build_contents_schema().fields if f.name == "bm25_text")
+        assert "asciifolding" in str(field.params)
+
+
+class TestFulltextQueries:
+    """Test fulltext queries get the ingest normalisation"""
+
+    def test_scene_fulltext_query_segmented(self, monkeypatch):
+        from src.milvus_queries import search_scene_fulltext
+
+        class Client:
+            def search(self, **kwargs):
+                self.kwargs = kwargs
+                return [[]]
+
+        monkeypatch.setattr(settings, "bm25_word_segmenter", "pyvi")
+        monkeypatch.setattr(text_analysis, "_segmenter", fake_segmenter)
+        client = Client()
+        search_scene_fulltext(client, "học sinh", k=5)
+        assert client.kwargs["data"] == ["học_sinh"]
@@ -0,0 +1,124 @@
+"""
+Test the query embedding cache, startup warmup and /ready
+"""
+import json
+
+import pytest
+
+from benchmarks.stand_ins import InMemoryMilvusClient
+from src import milvus_client, warmup
+from src.config import settings
+from src.milvus_queries import _encode_queries, query_embedding_cache, warm_query_cache
+
+
+class CountingEmbeddingFn:
+    def __init__(self):
+        self.encoded: list[list[str]] = []
+
+    def encode_queries(self, texts):
+        self.encoded.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def encode_documents(self, texts):
+        return self.encode_queries(texts)
+
+
+class TestQueryEmbeddingCache:
+    """Test caching in _encode_queries"""
+
+    def test_only_misses_are_encoded(self):
+        """Test that cached texts skip the model and order is kept"""
+        fn = CountingEmbeddingFn()
+        _encode_queries(fn, ["a", "bb"])
+        dense, sparse = _encode_queries(fn, ["bb", "ccc", "a", "ccc"])
+
+        assert fn.encoded == [["a", "bb"], ["ccc"]]
+        assert [v[0] for v in dense] == [2.0, 3.0, 1.0, 3.0]
+        assert sparse is None
+
+    def test_lru_eviction(self, monkeypatch):
+        """Test that the least recently used text is evicted"""
+        monkeypatch.setattr(settings, "query_embedding_cache_size", 2)
+        fn = CountingEmbeddingFn()
+        _encode_queries(fn, ["a", "b"])
+        _encode_queries(fn, ["a"])  # b is now least recently used
+        _encode_queries(fn, ["c"])
+        _encode_queries(fn, ["a", "b"])
+
+        assert fn.encoded[-1] == ["b"]
+        assert len(query_embedding_cache(fn)) == 2
+
+    def test_disabled(self, monkeypatch):
+        """Test that a cache size of 0 always calls the model"""
+        monkeypatch.setattr(settings, "query_embedding_cache_size", 0)
+        fn = CountingEmbeddingFn()
+        _encode_queries(fn, ["a"])
+        _encode_queries(fn, ["a"])
+
+        assert fn.encoded == [["a"], ["a"]]
+        assert warm_query_cache(fn, ["a"]) == 0
+
+
+@pytest.fixture
+def milvus_stand_in(monkeypatch, tmp_path):
+    """In-memory Milvus, a counting model and a query log with popular queries."""
+    fn = CountingEmbeddingFn()
+    log = tmp_path / "query_log.jsonl"
+    log.write_text("\n".join(json.dumps({"query_text": q}) for q in ["bão", "lũ", "bão", "bão", "lũ", "mưa"]),
+                   encoding="utf-8")
+    monkeypatch.setattr(settings, "backend", "milvus")
+    monkeypatch.setattr(settings, "query_log_path", str(log))
+    monkeypatch.setattr(milvus_client, "_client", InMemoryMilvusClient())
+    monkeypatch.setattr(milvus_client, "_embedding_fn", fn)
+    monkeypatch.setattr(warmup, "state", warmup.WarmupState())
+    return fn
+
+
+class TestWarmup:
+    """Test run_warmup"""
+
+    def test_popular_queries(self, milvus_stand_in):
+        """Test that query log texts are ranked by frequency"""
+        assert warmup.popular_queries(2) == ["bão", "lũ"]
+
+    def test_run_warmup(self, milvus_stand_in):
+        """Test that the model is exercised and popular queries are cached"""
+        assert warmup.run_warmup()
+
+        state = warmup.state.to_dict()
+        assert state["status"] == "done"
+        assert state["queries_cached"] == 3
+        assert set(state["steps_ms"]) == {"load_model", "dummy_batch", "queries", "searches"}
+        assert len(query_embedding_cache(milvus_stand_in)) == 3
+
+    def test_failure_is_reported(self, milvus_stand_in, monkeypatch):
+        """Test that a backend error leaves warmup failed with the error"""
+        class BrokenClient(InMemoryMilvusClient):
+            def search(self, **kwargs):
+                raise ConnectionError("milvus down")
+
+        monkeypatch.setattr(milvus_client, "_client", BrokenClient())
+
+        assert not warmup.run_warmup()
+        assert warmup.state.status == "failed"
+        assert "milvus down" in warmup.state.error
+
+
+class TestReady:
+    """Test GET /ready"""
+
+    def test_not_ready_until_warm(self, client, monkeypatch):
+        """Test 503 while warming up and 200 afterwards"""
+        from src import health
+
+        monkeypatch.setattr(health, "backend_health", lambda include_counts=False: {"ok": True})
+        monkeypatch.setattr(health, "embedding_health", lambda: None)
+        monkeypatch.setattr(warmup, "state", warmup.WarmupState())
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming_up"
+
+        warmup.state.status = "done"
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"